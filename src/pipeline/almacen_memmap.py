@@ -0,0 +1,269 @@
+"""Almacén binario de series de precios leído mediante ``np.memmap``.
+
+El almacén guarda todas las series en dos arreglos planos ordenados por
+símbolo y fecha:
+
+* ``fechas.int64`` – días desde 1970-01-01 (``int64``).
+* ``cierres.float64`` – precio de cierre (``float64``).
+
+y un índice ``indice.json`` con ``símbolo -> (offset, largo)``. Una consulta
+por rango de fechas se resuelve con ``np.searchsorted`` sobre la vista del
+símbolo, sin parsear ni copiar datos, y todos los procesos que abren el
+almacén comparten el mismo page cache del sistema operativo.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.pipeline.almacenamiento import (
+    dividir_csv_por_simbolo,
+    leer_catalogo,
+    ruta_particion,
+)
+from src.pipeline.config import RUTA_DATOS, RUTA_MEMMAP
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_FECHAS = "fechas.int64"
+ARCHIVO_CIERRES = "cierres.float64"
+ARCHIVO_INDICE = "indice.json"
+
+
+def existe_almacen(directorio: str = RUTA_MEMMAP) -> bool:
+    """Indica si el directorio contiene un almacén binario."""
+    return os.path.exists(os.path.join(directorio, ARCHIVO_INDICE))
+
+
+def _dia_epoca(fecha: str) -> int:
+    """Convierte una fecha a días desde 1970-01-01."""
+    return int(np.datetime64(pd.Timestamp(fecha).date(), "D").astype(np.int64))
+
+
+def construir_almacen_memmap(
+    ruta_csv: str = RUTA_DATOS,
+    directorio: str = RUTA_MEMMAP,
+    dataset: Optional[str] = None,
+) -> int:
+    """Construye el almacén binario a partir de los precios de acciones.
+
+    Las series se recorren símbolo a símbolo desde el dataset particionado
+    (ver ``dividir_csv_por_simbolo``), por lo que nunca se carga el archivo
+    completo en memoria.
+
+    Parameters
+    ----------
+    ruta_csv : str, optional
+        CSV de origen, por defecto RUTA_DATOS. Solo se usa si ``dataset`` es
+        ``None``, generando un dataset temporal.
+    directorio : str, optional
+        Directorio destino, por defecto RUTA_MEMMAP.
+    dataset : str, optional
+        Dataset Parquet particionado ya generado.
+
+    Returns
+    -------
+    int
+        Número de símbolos escritos.
+    """
+    if dataset is None:
+        with tempfile.TemporaryDirectory() as carpeta:
+            dataset = os.path.join(carpeta, "dataset")
+            dividir_csv_por_simbolo(ruta_csv, dataset)
+            return construir_almacen_memmap(ruta_csv, directorio, dataset)
+
+    logger.info(f"Construyendo almacén binario desde {dataset}")
+    indice: Dict[str, List[int]] = {}
+    filas = 0
+
+    # Escribir en un directorio temporal para no dejar el almacén a medias
+    temporal = f"{directorio}.tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    with open(os.path.join(temporal, ARCHIVO_FECHAS), "wb") as archivo_fechas, open(
+        os.path.join(temporal, ARCHIVO_CIERRES), "wb"
+    ) as archivo_cierres:
+        for tick in sorted(leer_catalogo(dataset)):
+            tabla = pq.read_table(ruta_particion(tick, dataset))
+            tabla = tabla.filter(pc.is_valid(tabla["Close"]))
+            fechas = tabla["Date"].to_numpy().astype("datetime64[D]")
+            archivo_fechas.write(fechas.astype(np.int64).tobytes())
+            archivo_cierres.write(
+                tabla["Close"].to_numpy().astype(np.float64).tobytes()
+            )
+            indice[tick] = [filas, len(tabla)]
+            filas += len(tabla)
+    with open(os.path.join(temporal, ARCHIVO_INDICE), "w") as f:
+        json.dump({"filas": filas, "simbolos": indice}, f)
+    shutil.rmtree(directorio, ignore_errors=True)
+    os.rename(temporal, directorio)
+
+    logger.info(f"Almacén creado en {directorio}: {len(indice)} símbolos")
+    return len(indice)
+
+
+class AlmacenMemmap:
+    """Acceso de solo lectura a un almacén binario de series.
+
+    Parameters
+    ----------
+    directorio : str, optional
+        Directorio del almacén, por defecto RUTA_MEMMAP.
+    """
+
+    def __init__(self, directorio: str = RUTA_MEMMAP):
+        with open(os.path.join(directorio, ARCHIVO_INDICE)) as f:
+            contenido = json.load(f)
+        filas = contenido["filas"]
+        self.indice: Dict[str, Tuple[int, int]] = {
+            simbolo: (offset, largo)
+            for simbolo, (offset, largo) in contenido["simbolos"].items()
+        }
+        if filas:
+            self.fechas = np.memmap(
+                os.path.join(directorio, ARCHIVO_FECHAS),
+                dtype=np.int64,
+                mode="r",
+                shape=(filas,),
+            )
+            self.cierres = np.memmap(
+                os.path.join(directorio, ARCHIVO_CIERRES),
+                dtype=np.float64,
+                mode="r",
+                shape=(filas,),
+            )
+        else:
+            self.fechas = np.empty(0, dtype=np.int64)
+            self.cierres = np.empty(0, dtype=np.float64)
+
+    def __contains__(self, tick: str) -> bool:
+        """Indica si el símbolo está en el almacén."""
+        return tick in self.indice
+
+    def simbolos(self) -> List[str]:
+        """Devuelve los símbolos del almacén."""
+        return list(self.indice)
+
+    def serie(
+        self,
+        tick: str,
+        fecha_inicio: Optional[str] = None,
+        fecha_corte: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Devuelve las vistas de fechas y cierres de un símbolo.
+
+        Parameters
+        ----------
+        tick : str
+            Símbolo de la acción.
+        fecha_inicio : str, optional
+            Fecha mínima (inclusive) en formato 'YYYY-MM-DD'.
+        fecha_corte : str, optional
+            Fecha máxima (inclusive) en formato 'YYYY-MM-DD'.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Días desde 1970-01-01 y precios de cierre. Ambos son vistas sobre
+            el archivo mapeado, no copias.
+
+        Raises
+        ------
+        ValueError
+            Si el símbolo no existe en el almacén.
+        """
+        if tick not in self.indice:
+            raise ValueError(f"El símbolo {tick} no existe en el archivo de datos")
+        offset, largo = self.indice[tick]
+        fechas = self.fechas[offset : offset + largo]
+
+        inicio = 0
+        fin = largo
+        if fecha_inicio is not None:
+            inicio = int(np.searchsorted(fechas, _dia_epoca(fecha_inicio), "left"))
+        if fecha_corte is not None:
+            fin = int(np.searchsorted(fechas, _dia_epoca(fecha_corte), "right"))
+        fin = max(inicio, fin)
+        return fechas[inicio:fin], self.cierres[offset + inicio : offset + fin]
+
+
+# Almacenes abiertos en el proceso junto con el mtime de su índice
+_ALMACENES: Dict[str, Tuple[int, AlmacenMemmap]] = {}
+
+
+def abrir_almacen(directorio: str = RUTA_MEMMAP) -> AlmacenMemmap:
+    """Abre un almacén reutilizando el mapeo si el índice no cambió."""
+    directorio = os.path.abspath(directorio)
+    mtime = os.stat(os.path.join(directorio, ARCHIVO_INDICE)).st_mtime_ns
+    abierto = _ALMACENES.get(directorio)
+    if abierto is None or abierto[0] != mtime:
+        abierto = (mtime, AlmacenMemmap(directorio))
+        _ALMACENES[directorio] = abierto
+    return abierto[1]
+
+
+def leer_acciones_memmap(
+    tick: str,
+    fecha_inicio: Optional[str] = None,
+    fecha_corte: Optional[str] = None,
+    directorio: str = RUTA_MEMMAP,
+) -> pd.DataFrame:
+    """Lee un símbolo del almacén binario en un rango de fechas.
+
+    Parameters
+    ----------
+    tick : str
+        Símbolo de la acción.
+    fecha_inicio : str, optional
+        Fecha mínima (inclusive) en formato 'YYYY-MM-DD'.
+    fecha_corte : str, optional
+        Fecha máxima (inclusive) en formato 'YYYY-MM-DD'.
+    directorio : str, optional
+        Directorio del almacén, por defecto RUTA_MEMMAP.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame con las columnas ``Date`` y ``Close`` ordenado por fecha.
+    """
+    fechas, cierres = abrir_almacen(directorio).serie(tick, fecha_inicio, fecha_corte)
+    return pd.DataFrame(
+        {
+            "Date": fechas.view("datetime64[D]").astype("datetime64[ns]"),
+            "Close": np.asarray(cierres),
+        }
+    )
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Construir el almacén binario de precios de acciones."
+    )
+    parser.add_argument(
+        "--ruta_csv", type=str, default=RUTA_DATOS, help="CSV de origen"
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MEMMAP, help="Directorio destino"
+    )
+    parser.add_argument(
+        "--dataset",
+        type=str,
+        default=None,
+        help="Dataset Parquet particionado ya generado (opcional)",
+    )
+    args = parser.parse_args()
+
+    construir_almacen_memmap(args.ruta_csv, args.directorio, args.dataset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""Almacenamiento columnar particionado para los precios de acciones."""
+import argparse
+import json
+import logging
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.pipeline.config import RUTA_DATASET, RUTA_DATOS
+
+logger = logging.getLogger(__name__)
+
+# Columnas del CSV que necesita el pipeline
+COLUMNAS_ACCIONES = ["Date", "Symbol", "Close"]
+TIPOS_ACCIONES = {"Date": pa.date32(), "Symbol": pa.string(), "Close": pa.float64()}
+
+# ~1 año de días hábiles por row group: los filtros por fecha descartan
+# grupos completos usando las estadísticas min/max del archivo
+FILAS_POR_GRUPO = 252
+
+# Bytes del CSV leídos por bloque en las lecturas en streaming
+TAMANO_BLOQUE = 64 * 1024 * 1024
+
+ARCHIVO_CATALOGO = "catalogo.json"
+
+
+def ruta_particion(tick: str, directorio: str = RUTA_DATASET) -> str:
+    """Devuelve la ruta del archivo Parquet de un símbolo."""
+    return os.path.join(directorio, f"Symbol={tick}", "part-0.parquet")
+
+
+def escribir_particion(
+    tabla: pa.Table, tick: str, directorio: str, filas_por_grupo: int
+) -> None:
+    """Escribe la partición de un símbolo ordenada por fecha.
+
+    Parameters
+    ----------
+    tabla : pa.Table
+        Tabla con las columnas ``Date`` y ``Close`` de un solo símbolo.
+    tick : str
+        Símbolo de la acción.
+    directorio : str
+        Raíz del dataset.
+    filas_por_grupo : int
+        Número de filas por row group.
+    """
+    ruta = ruta_particion(tick, directorio)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tabla = tabla.sort_by([("Date", "ascending")])
+    pq.write_table(tabla, ruta, row_group_size=filas_por_grupo, write_statistics=True)
+
+
+def _extremo(funcion, actual, nuevo):
+    """Aplica ``min``/``max`` ignorando valores nulos."""
+    valores = [valor for valor in (actual, nuevo) if valor is not None]
+    return funcion(valores) if valores else None
+
+
+def _compactar_particion(tick: str, directorio: str, filas_por_grupo: int) -> None:
+    """Une los fragmentos de un símbolo en una partición ordenada por fecha."""
+    carpeta = os.path.dirname(ruta_particion(tick, directorio))
+    fragmentos = sorted(
+        os.path.join(carpeta, nombre)
+        for nombre in os.listdir(carpeta)
+        if nombre.startswith("fragmento-")
+    )
+    tabla = pa.concat_tables([pq.read_table(ruta) for ruta in fragmentos])
+    escribir_particion(tabla, tick, directorio, filas_por_grupo)
+    for ruta in fragmentos:
+        os.remove(ruta)
+
+
+def dividir_csv_por_simbolo(
+    ruta_csv: str = RUTA_DATOS,
+    directorio: str = RUTA_DATASET,
+    tamano_bloque: int = TAMANO_BLOQUE,
+    filas_por_grupo: int = FILAS_POR_GRUPO,
+) -> Dict[str, Dict[str, Any]]:
+    """Divide el CSV de acciones en particiones por símbolo en una sola pasada.
+
+    El CSV se lee en streaming por bloques de ``tamano_bloque`` bytes; las
+    filas de cada bloque se agregan a fragmentos por símbolo y al final cada
+    símbolo se compacta en su partición ordenada por fecha. La memoria usada
+    queda acotada por el tamaño del bloque y del símbolo más grande, no por
+    el tamaño del archivo.
+
+    Además se escribe ``catalogo.json`` con el número de filas y la primera y
+    última fecha de cada símbolo.
+
+    Parameters
+    ----------
+    ruta_csv : str, optional
+        CSV de origen, por defecto RUTA_DATOS.
+    directorio : str, optional
+        Directorio destino del dataset, por defecto RUTA_DATASET.
+    tamano_bloque : int, optional
+        Bytes leídos del CSV por bloque, por defecto TAMANO_BLOQUE.
+    filas_por_grupo : int, optional
+        Filas por row group, por defecto FILAS_POR_GRUPO.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Catálogo de símbolos.
+    """
+    logger.info(f"Dividiendo {ruta_csv} por símbolo en bloques de {tamano_bloque}")
+    lector = pv.open_csv(
+        ruta_csv,
+        read_options=pv.ReadOptions(block_size=tamano_bloque),
+        convert_options=pv.ConvertOptions(
+            include_columns=COLUMNAS_ACCIONES, column_types=TIPOS_ACCIONES
+        ),
+    )
+
+    # Escribir en un directorio temporal para no dejar el dataset a medias
+    temporal = f"{directorio}.tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    catalogo: Dict[str, Dict[str, Any]] = {}
+    for numero, lote in enumerate(lector):
+        tabla = pa.Table.from_batches([lote])
+        tabla = tabla.sort_by([("Symbol", "ascending")])
+
+        # Al estar ordenado por símbolo, cada símbolo es un bloque contiguo
+        simbolos = tabla["Symbol"].to_numpy(zero_copy_only=False)
+        inicios = np.flatnonzero(np.r_[True, simbolos[1:] != simbolos[:-1]])
+        fines = np.r_[inicios[1:], len(simbolos)]
+        datos = tabla.drop(["Symbol"])
+        for inicio, fin in zip(inicios, fines):
+            tick = str(simbolos[inicio])
+            fragmento = datos.slice(inicio, fin - inicio)
+            carpeta = os.path.dirname(ruta_particion(tick, temporal))
+            os.makedirs(carpeta, exist_ok=True)
+            pq.write_table(
+                fragmento, os.path.join(carpeta, f"fragmento-{numero:05d}.parquet")
+            )
+
+            extremos = pc.min_max(fragmento["Date"])
+            entrada = catalogo.setdefault(
+                tick, {"filas": 0, "fecha_min": None, "fecha_max": None}
+            )
+            entrada["filas"] += len(fragmento)
+            entrada["fecha_min"] = _extremo(
+                min, entrada["fecha_min"], extremos["min"].as_py()
+            )
+            entrada["fecha_max"] = _extremo(
+                max, entrada["fecha_max"], extremos["max"].as_py()
+            )
+
+    for tick in catalogo:
+        _compactar_particion(tick, temporal, filas_por_grupo)
+
+    catalogo = {
+        tick: {
+            "filas": entrada["filas"],
+            "fecha_min": str(entrada["fecha_min"]),
+            "fecha_max": str(entrada["fecha_max"]),
+        }
+        for tick, entrada in sorted(catalogo.items())
+    }
+    os.makedirs(temporal, exist_ok=True)
+    with open(os.path.join(temporal, ARCHIVO_CATALOGO), "w") as f:
+        json.dump(catalogo, f, indent=2)
+    shutil.rmtree(directorio, ignore_errors=True)
+    os.rename(temporal, directorio)
+
+    logger.info(f"Dataset creado en {directorio}: {len(catalogo)} símbolos")
+    return catalogo
+
+
+def crear_dataset_parquet(
+    ruta_csv: str = RUTA_DATOS,
+    directorio: str = RUTA_DATASET,
+    filas_por_grupo: int = FILAS_POR_GRUPO,
+) -> int:
+    """Convierte el CSV de acciones en un dataset Parquet particionado.
+
+    Cada símbolo se guarda en ``Symbol=<tick>/part-0.parquet`` (particionado
+    estilo Hive), con las filas ordenadas por fecha y row groups con
+    estadísticas min/max, de modo que una lectura por símbolo y rango de
+    fechas solo abre un archivo y solo decodifica los grupos necesarios.
+    La conversión se hace en streaming con ``dividir_csv_por_simbolo``.
+
+    Parameters
+    ----------
+    ruta_csv : str, optional
+        CSV de origen, por defecto RUTA_DATOS.
+    directorio : str, optional
+        Directorio destino del dataset, por defecto RUTA_DATASET.
+    filas_por_grupo : int, optional
+        Filas por row group, por defecto FILAS_POR_GRUPO.
+
+    Returns
+    -------
+    int
+        Número de símbolos escritos.
+    """
+    catalogo = dividir_csv_por_simbolo(
+        ruta_csv, directorio, filas_por_grupo=filas_por_grupo
+    )
+    return len(catalogo)
+
+
+def leer_catalogo(directorio: str = RUTA_DATASET) -> Dict[str, Dict[str, Any]]:
+    """Lee el catálogo de símbolos del dataset.
+
+    Parameters
+    ----------
+    directorio : str, optional
+        Raíz del dataset, por defecto RUTA_DATASET.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Filas, primera y última fecha (``'YYYY-MM-DD'``) de cada símbolo.
+    """
+    with open(os.path.join(directorio, ARCHIVO_CATALOGO)) as f:
+        return json.load(f)
+
+
+def listar_simbolos(
+    ruta_csv: str = RUTA_DATOS, directorio: str = RUTA_DATASET
+) -> List[str]:
+    """Devuelve los símbolos disponibles sin cargar el CSV completo en memoria.
+
+    Se usa el catálogo del dataset si existe; si no, se recorre en streaming
+    solo la columna ``Symbol`` del CSV.
+
+    Parameters
+    ----------
+    ruta_csv : str, optional
+        CSV de origen, por defecto RUTA_DATOS.
+    directorio : str, optional
+        Raíz del dataset, por defecto RUTA_DATASET.
+
+    Returns
+    -------
+    List[str]
+        Símbolos en el orden en que aparecen.
+    """
+    if os.path.exists(os.path.join(directorio, ARCHIVO_CATALOGO)):
+        return list(leer_catalogo(directorio))
+
+    lector = pv.open_csv(
+        ruta_csv,
+        read_options=pv.ReadOptions(block_size=TAMANO_BLOQUE),
+        convert_options=pv.ConvertOptions(include_columns=["Symbol"]),
+    )
+    simbolos: Dict[str, None] = {}
+    for lote in lector:
+        for tick in pc.unique(lote.column(0)).to_pylist():
+            simbolos.setdefault(tick)
+    return list(simbolos)
+
+
+def leer_acciones_parquet(
+    tick: str,
+    fecha_inicio: Optional[str] = None,
+    fecha_corte: Optional[str] = None,
+    directorio: str = RUTA_DATASET,
+) -> pd.DataFrame:
+    """Lee la partición de un símbolo filtrando por rango de fechas.
+
+    Solo se abre el archivo del símbolo pedido y el filtro de fechas se
+    evalúa contra las estadísticas de cada row group antes de decodificarlo.
+
+    Parameters
+    ----------
+    tick : str
+        Símbolo de la acción.
+    fecha_inicio : str, optional
+        Fecha mínima (inclusive) en formato 'YYYY-MM-DD'.
+    fecha_corte : str, optional
+        Fecha máxima (inclusive) en formato 'YYYY-MM-DD'.
+    directorio : str, optional
+        Raíz del dataset, por defecto RUTA_DATASET.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame con las columnas ``Date`` y ``Close`` ordenado por fecha.
+
+    Raises
+    ------
+    ValueError
+        Si el símbolo no existe en el dataset.
+    """
+    ruta = ruta_particion(tick, directorio)
+    if not os.path.exists(ruta):
+        raise ValueError(f"El símbolo {tick} no existe en el archivo de datos")
+
+    filtros = []
+    if fecha_inicio is not None:
+        filtros.append(("Date", ">=", pd.Timestamp(fecha_inicio).date()))
+    if fecha_corte is not None:
+        filtros.append(("Date", "<=", pd.Timestamp(fecha_corte).date()))
+
+    tabla = pq.read_table(ruta, columns=["Date", "Close"], filters=filtros or None)
+    df = tabla.to_pandas(date_as_object=False)
+    df["Date"] = df["Date"].astype("datetime64[ns]")
+    return df
+
+
+def leer_varias_acciones_parquet(
+    ticks: List[str],
+    fecha_inicio: Optional[str] = None,
+    fecha_corte: Optional[str] = None,
+    directorio: str = RUTA_DATASET,
+) -> pd.DataFrame:
+    """Lee varios símbolos en un solo escaneo del dataset.
+
+    Solo se abren las particiones de los símbolos pedidos y el filtro de
+    fechas se empuja a las estadísticas de los row groups.
+
+    Parameters
+    ----------
+    ticks : List[str]
+        Símbolos de las acciones.
+    fecha_inicio : str, optional
+        Fecha mínima (inclusive) en formato 'YYYY-MM-DD'.
+    fecha_corte : str, optional
+        Fecha máxima (inclusive) en formato 'YYYY-MM-DD'.
+    directorio : str, optional
+        Raíz del dataset, por defecto RUTA_DATASET.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame con las columnas ``Date``, ``Close`` y ``Symbol`` ordenado
+        por símbolo y fecha.
+
+    Raises
+    ------
+    ValueError
+        Si algún símbolo no existe en el dataset.
+    """
+    rutas = [ruta_particion(tick, directorio) for tick in ticks]
+    faltantes = [tick for tick, ruta in zip(ticks, rutas) if not os.path.exists(ruta)]
+    if faltantes:
+        raise ValueError(f"Los símbolos {faltantes} no existen en el archivo de datos")
+
+    dataset = ds.dataset(
+        rutas,
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([("Symbol", pa.string())]), flavor="hive"
+        ),
+        partition_base_dir=directorio,
+    )
+    filtro = None
+    if fecha_inicio is not None:
+        filtro = ds.field("Date") >= pd.Timestamp(fecha_inicio).date()
+    if fecha_corte is not None:
+        condicion = ds.field("Date") <= pd.Timestamp(fecha_corte).date()
+        filtro = condicion if filtro is None else filtro & condicion
+
+    tabla = dataset.to_table(columns=["Date", "Close", "Symbol"], filter=filtro)
+    tabla = tabla.sort_by([("Symbol", "ascending"), ("Date", "ascending")])
+    df = tabla.to_pandas(date_as_object=False)
+    df["Date"] = df["Date"].astype("datetime64[ns]")
+    return df
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Convertir el CSV de acciones en un dataset Parquet."
+    )
+    parser.add_argument(
+        "--ruta_csv", type=str, default=RUTA_DATOS, help="CSV de origen"
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_DATASET, help="Directorio destino"
+    )
+    parser.add_argument(
+        "--filas_por_grupo",
+        type=int,
+        default=FILAS_POR_GRUPO,
+        help="Filas por row group",
+    )
+    parser.add_argument(
+        "--tamano_bloque",
+        type=int,
+        default=TAMANO_BLOQUE,
+        help="Bytes del CSV leídos por bloque",
+    )
+    args = parser.parse_args()
+
+    dividir_csv_por_simbolo(
+        args.ruta_csv, args.directorio, args.tamano_bloque, args.filas_por_grupo
+    )
+
+
+if __name__ == "__main__":
+    main()
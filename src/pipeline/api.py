@@ -9,7 +9,12 @@ import uvicorn
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 
+from src.pipeline.cache import CACHE_FUENTES
+from src.pipeline.compresion import opciones_parquet
+from src.pipeline.config import CODEC_PREDICCION, NIVEL_PREDICCION
 from src.pipeline.inference import cargar_modelo, realizar_prediccion
+from src.pipeline.instrumentacion import contexto_ticker, medir_fase
+from src.pipeline.pronosticos import materializar_pronostico
 from src.pipeline.train import cargar_datos, entrenar_prophet, guardar_modelo
 
 # Crear directorio de logs si no existe
@@ -37,6 +42,9 @@ class TrainRequest(BaseModel):
     tick: str = Field(..., description="Símbolo de la acción")
     fecha_inicio: str = Field(..., description="Fecha de inicio (YYYY-MM-DD)")
     fecha_corte: str = Field(..., description="Fecha de corte (YYYY-MM-DD)")
+    materializar: bool = Field(
+        False, description="Si es True, guarda la tabla de pronósticos del modelo"
+    )
 
 
 class PredictRequest(BaseModel):
@@ -102,17 +110,21 @@ async def train_model(request: TrainRequest) -> TrainResponse:
                 detail="La fecha de inicio debe ser anterior a la fecha de corte",
             )
 
-        # Cargar datos
-        logger.info(f"Cargando datos para {request.tick}")
-        df = cargar_datos(request.tick, request.fecha_inicio, request.fecha_corte)
+        with contexto_ticker(request.tick), medir_fase("total", origen="api"):
+            # Cargar datos
+            logger.info(f"Cargando datos para {request.tick}")
+            df = cargar_datos(request.tick, request.fecha_inicio, request.fecha_corte)
 
-        # Entrenar modelo
-        logger.info("Entrenando modelo")
-        modelo, metricas = entrenar_prophet(df)
+            # Entrenar modelo
+            logger.info("Entrenando modelo")
+            modelo, metricas = entrenar_prophet(df)
 
-        # Guardar modelo
-        logger.info("Guardando modelo")
-        guardar_modelo(modelo, request.tick, metricas)
+            # Guardar modelo
+            logger.info("Guardando modelo")
+            guardar_modelo(modelo, request.tick, metricas)
+            if request.materializar:
+                with medir_fase("materializar"):
+                    materializar_pronostico(modelo, request.tick)
 
         return TrainResponse(
             tick=request.tick,
@@ -168,7 +180,7 @@ async def predict(request: PredictRequest) -> PredictResponse:
         # Realizar predicción
         logger.info("Realizando predicción")
         predicciones = realizar_prediccion(
-            modelo, request.fecha_inicio, request.fecha_fin
+            modelo, request.fecha_inicio, request.fecha_fin, request.tick
         )
 
         # Preparar respuesta según el modo batch
@@ -182,7 +194,10 @@ async def predict(request: PredictRequest) -> PredictResponse:
                 f"{request.fecha_fin}_{fecha_actual}.parquet"
             )
             # Guardar en formato parquet
-            predicciones.to_parquet(os.path.join(request.ruta, file_name))
+            predicciones.to_parquet(
+                os.path.join(request.ruta, file_name),
+                **opciones_parquet(CODEC_PREDICCION, NIVEL_PREDICCION),
+            )
             logger.info(f"Predicciones guardadas en: {request.ruta}")
 
             return PredictResponse(
@@ -218,6 +233,18 @@ async def predict(request: PredictRequest) -> PredictResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/cache", response_model=Dict[str, int])
+async def cache_stats() -> Dict[str, int]:
+    """Endpoint con los contadores de la caché de fuentes de datos.
+
+    Returns
+    -------
+    Dict[str, int]
+        Aciertos, fallos, invalidaciones, desalojos y memoria usada.
+    """
+    return CACHE_FUENTES.estadisticas()
+
+
 if __name__ == "__main__":
     # Iniciar servidor
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,399 @@
+"""Modelos de referencia (baseline) ajustados para todos los tickers a la vez.
+
+Los métodos se ajustan con operaciones de NumPy sobre un panel
+fechas × tickers (ver ``cargar_datos_multi(..., formato="ancho")``), sin un
+bucle por ticker:
+
+* ``naive`` – el último valor observado.
+* ``drift`` – el último valor más la pendiente media entre la primera y la
+  última observación.
+* ``estacional`` – el valor de la misma posición en la última temporada
+  (por defecto 5 días hábiles).
+* ``lineal`` – tendencia lineal por mínimos cuadrados.
+
+El horizonte, la temporada y los residuos se miden en días hábiles, no en
+filas del panel, de modo que los feriados (días hábiles sin fila) no
+desplazan la temporada ni los intervalos. Cada ticker se expone como un
+``ModeloBaseline`` con ``make_future_dataframe`` y ``predict`` al estilo de
+Prophet, de modo que sirve directamente en ``realizar_prediccion``.
+"""
+import argparse
+import logging
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline.config import MAX_DATE, MIN_DATE, RUTA_MODELOS
+
+logger = logging.getLogger(__name__)
+
+METODOS_BASELINE = ("naive", "drift", "estacional", "lineal")
+
+# Cuantil normal del intervalo de predicción del 95 %
+Z_INTERVALO = 1.96
+
+
+def _ultimos_validos(valores: np.ndarray) -> np.ndarray:
+    """Posición de la última observación válida de cada columna (-1 si no hay)."""
+    validos = ~np.isnan(valores)
+    ultimo = valores.shape[0] - 1 - np.argmax(validos[::-1], axis=0)
+    return np.where(validos.any(axis=0), ultimo, -1)
+
+
+def _rellenar_adelante(valores: np.ndarray) -> np.ndarray:
+    """Propaga hacia adelante el último valor válido de cada columna."""
+    filas = np.where(~np.isnan(valores), np.arange(valores.shape[0])[:, None], 0)
+    np.maximum.accumulate(filas, axis=0, out=filas)
+    return valores[filas, np.arange(valores.shape[1])]
+
+
+class BaselinePanel:
+    """Modelo de referencia ajustado para varios tickers.
+
+    Parameters
+    ----------
+    metodo : str
+        Uno de METODOS_BASELINE.
+    simbolos : List[str]
+        Tickers ajustados.
+    ultima_fecha : np.ndarray
+        Última fecha observada de cada ticker (``datetime64[D]``).
+    nivel : np.ndarray
+        Valor ajustado en la última fecha de cada ticker.
+    pendiente : np.ndarray
+        Variación por día hábil de cada ticker.
+    estacionales : np.ndarray
+        Valores de cada ticker en sus últimos ``temporada`` días hábiles
+        (tickers × temporada).
+    sigma : np.ndarray
+        Desviación estándar de los residuos a un día hábil de cada ticker.
+    """
+
+    def __init__(
+        self,
+        metodo: str,
+        simbolos: List[str],
+        ultima_fecha: np.ndarray,
+        nivel: np.ndarray,
+        pendiente: np.ndarray,
+        estacionales: np.ndarray,
+        sigma: np.ndarray,
+    ):
+        self.metodo = metodo
+        self.simbolos = list(simbolos)
+        self.ultima_fecha = ultima_fecha.astype("datetime64[D]")
+        self.nivel = nivel
+        self.pendiente = pendiente
+        self.estacionales = estacionales
+        self.sigma = sigma
+        self._posiciones = {simbolo: i for i, simbolo in enumerate(self.simbolos)}
+
+    def _predecir(self, columnas: np.ndarray, fechas: np.ndarray) -> tuple:
+        """Predicción e incertidumbre de ``columnas`` en ``fechas`` (matrices)."""
+        pasos = np.busday_count(
+            self.ultima_fecha[columnas][None, :],
+            fechas.astype("datetime64[D]")[:, None],
+        ).astype(np.float64)
+        if self.metodo == "estacional":
+            temporada = self.estacionales.shape[1]
+            indice = (np.maximum(pasos, 1).astype(np.int64) - 1) % temporada
+            yhat = self.estacionales[columnas[None, :], indice]
+            escala = np.sqrt(np.ceil(np.maximum(pasos, 1) / temporada))
+        else:
+            yhat = self.nivel[columnas] + self.pendiente[columnas] * pasos
+            if self.metodo == "lineal":
+                escala = np.ones_like(pasos)
+            else:
+                escala = np.sqrt(np.maximum(pasos, 1))
+        return yhat, Z_INTERVALO * self.sigma[columnas] * escala
+
+    def predecir(self, fechas) -> pd.DataFrame:
+        """Predice todos los tickers en las fechas indicadas.
+
+        Parameters
+        ----------
+        fechas : array-like
+            Fechas a predecir.
+
+        Returns
+        -------
+        pd.DataFrame
+            Panel fechas × tickers con ``yhat``.
+        """
+        fechas = pd.DatetimeIndex(fechas)
+        yhat, _ = self._predecir(
+            np.arange(len(self.simbolos)), fechas.values.astype("datetime64[D]")
+        )
+        return pd.DataFrame(yhat, index=fechas, columns=self.simbolos)
+
+    def modelo(self, tick: str) -> "ModeloBaseline":
+        """Devuelve la vista de un ticker con la interfaz de Prophet.
+
+        Raises
+        ------
+        ValueError
+            Si el ticker no se ajustó.
+        """
+        if tick not in self._posiciones:
+            raise ValueError(f"El símbolo {tick} no está en el baseline")
+        return ModeloBaseline(self, self._posiciones[tick])
+
+
+class ModeloBaseline:
+    """Modelo de referencia de un ticker con la interfaz de Prophet.
+
+    Parameters
+    ----------
+    panel : BaselinePanel
+        Panel ajustado.
+    columna : int
+        Posición del ticker en el panel.
+    """
+
+    def __init__(self, panel: BaselinePanel, columna: int):
+        self.panel = panel
+        self.columna = columna
+
+    def make_future_dataframe(
+        self, periods: int, freq: str = "D", include_history: bool = True
+    ) -> pd.DataFrame:
+        """Genera las fechas futuras como ``Prophet.make_future_dataframe``.
+
+        Raises
+        ------
+        ValueError
+            Si se pide la historia, que el baseline no guarda.
+        """
+        if include_history:
+            raise ValueError("El baseline no guarda la historia")
+        ultima = pd.Timestamp(self.panel.ultima_fecha[self.columna])
+        fechas = pd.date_range(start=ultima, periods=periods + 1, freq=freq)
+        return pd.DataFrame({"ds": fechas[fechas > ultima][:periods]})
+
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Predice las fechas de ``df`` con las columnas de Prophet.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columnas ``ds``, ``yhat``, ``yhat_lower`` y ``yhat_upper``.
+        """
+        fechas = pd.to_datetime(df["ds"]).values.astype("datetime64[D]")
+        yhat, margen = self.panel._predecir(np.array([self.columna]), fechas)
+        return pd.DataFrame(
+            {
+                "ds": pd.to_datetime(df["ds"]).to_numpy(),
+                "yhat": yhat[:, 0],
+                "yhat_lower": (yhat - margen)[:, 0],
+                "yhat_upper": (yhat + margen)[:, 0],
+            }
+        )
+
+
+def ajustar_baseline(
+    panel: pd.DataFrame, metodo: str = "drift", temporada: int = 5
+) -> BaselinePanel:
+    """Ajusta un método de referencia para todos los tickers del panel.
+
+    Parameters
+    ----------
+    panel : pd.DataFrame
+        Panel fechas × tickers (índice de fechas ordenado, NaN donde falta).
+    metodo : str, optional
+        Uno de METODOS_BASELINE, por defecto ``'drift'``.
+    temporada : int, optional
+        Longitud de la temporada del método estacional, por defecto 5.
+
+    Returns
+    -------
+    BaselinePanel
+        Modelo ajustado.
+
+    Raises
+    ------
+    ValueError
+        Si el método no es válido o algún ticker no tiene datos.
+    """
+    if metodo not in METODOS_BASELINE:
+        raise ValueError(f"Método inválido: {metodo}. Use uno de {METODOS_BASELINE}")
+    valores = panel.to_numpy(dtype=np.float64)
+    ultimo = _ultimos_validos(valores)
+    if (ultimo < 0).any():
+        vacios = list(panel.columns[ultimo < 0])
+        raise ValueError(f"Sin datos para los símbolos: {vacios}")
+
+    columnas = np.arange(valores.shape[1])
+    fechas = panel.index.values.astype("datetime64[D]")
+    ultima_fecha = fechas[ultimo]
+    # Posición de cada fila en días hábiles desde la primera fecha del panel
+    t = np.busday_count(fechas[0], fechas).astype(np.float64)[:, None]
+    validos = ~np.isnan(valores)
+    ultimo_valor = valores[ultimo, columnas]
+    relleno = _rellenar_adelante(valores)
+    diferencias = np.diff(relleno, axis=0)
+    diferencias[~validos[1:] | ~validos[:-1]] = np.nan
+    # Días hábiles entre filas consecutivas (más de uno si hubo feriado)
+    saltos = np.diff(t, axis=0)
+    saltos[saltos <= 0] = np.nan
+
+    pendiente = np.zeros(valores.shape[1])
+    nivel = ultimo_valor
+    estacionales = np.empty((valores.shape[1], 0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if metodo == "drift":
+            primero = np.argmax(validos, axis=0)
+            pasos = t[ultimo, 0] - t[primero, 0]
+            pendiente = np.where(
+                pasos > 0, (ultimo_valor - valores[primero, columnas]) / pasos, 0.0
+            )
+            # Residuo por día hábil: un salto de k días acumula k pasos
+            residuos = (diferencias - pendiente * saltos) / np.sqrt(saltos)
+        elif metodo == "lineal":
+            n = validos.sum(axis=0)
+            tv = np.where(validos, t, 0.0)
+            yv = np.where(validos, valores, 0.0)
+            t_medio = tv.sum(axis=0) / n
+            y_medio = yv.sum(axis=0) / n
+            stt = (np.where(validos, (t - t_medio) ** 2, 0.0)).sum(axis=0)
+            sty = (np.where(validos, (t - t_medio) * (valores - y_medio), 0.0)).sum(
+                axis=0
+            )
+            pendiente = np.where(stt > 0, sty / stt, 0.0)
+            nivel = y_medio + pendiente * (t[ultimo, 0] - t_medio)
+            residuos = valores - (y_medio + pendiente * (t - t_medio))
+        elif metodo == "estacional":
+            # Fila vigente en cada uno de los últimos ``temporada`` días hábiles
+            dias = t[ultimo, 0][None, :] - temporada + 1 + np.arange(temporada)[:, None]
+            filas = np.searchsorted(t[:, 0], dias, side="right") - 1
+            estacionales = relleno[np.maximum(filas, 0), columnas].T
+            # Cada fila contra la vigente ``temporada`` días hábiles antes
+            previas = np.searchsorted(t[:, 0], t[:, 0] - temporada, side="right") - 1
+            residuos = np.where(
+                (previas >= 0)[:, None],
+                valores - relleno[np.maximum(previas, 0)],
+                np.nan,
+            )
+        else:
+            residuos = diferencias / np.sqrt(saltos)
+        sigma = np.nan_to_num(np.nanstd(residuos, axis=0))
+
+    return BaselinePanel(
+        metodo,
+        list(panel.columns),
+        ultima_fecha,
+        nivel,
+        pendiente,
+        estacionales,
+        sigma,
+    )
+
+
+def guardar_baseline(modelo: BaselinePanel, directorio: Optional[str] = None) -> str:
+    """Guarda un baseline ajustado en ``baseline_{metodo}.npz``.
+
+    Parameters
+    ----------
+    modelo : BaselinePanel
+        Modelo ajustado.
+    directorio : str, optional
+        Carpeta destino, por defecto RUTA_MODELOS.
+
+    Returns
+    -------
+    str
+        Ruta del archivo guardado.
+    """
+    directorio = directorio or RUTA_MODELOS
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f"baseline_{modelo.metodo}.npz")
+    np.savez(
+        ruta,
+        metodo=np.array(modelo.metodo),
+        simbolos=np.array(modelo.simbolos, dtype=str),
+        ultima_fecha=modelo.ultima_fecha,
+        nivel=modelo.nivel,
+        pendiente=modelo.pendiente,
+        estacionales=modelo.estacionales,
+        sigma=modelo.sigma,
+    )
+    return ruta
+
+
+def cargar_baseline(
+    metodo: str = "drift", directorio: Optional[str] = None
+) -> BaselinePanel:
+    """Carga un baseline guardado con ``guardar_baseline``.
+
+    Raises
+    ------
+    FileNotFoundError
+        Si no existe el archivo del método.
+    """
+    directorio = directorio or RUTA_MODELOS
+    ruta = os.path.join(directorio, f"baseline_{metodo}.npz")
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No se encontró el baseline {metodo} en {ruta}")
+    with np.load(ruta, allow_pickle=False) as datos:
+        return BaselinePanel(
+            str(datos["metodo"]),
+            datos["simbolos"].tolist(),
+            datos["ultima_fecha"],
+            datos["nivel"],
+            datos["pendiente"],
+            datos["estacionales"],
+            datos["sigma"],
+        )
+
+
+def cargar_modelo_baseline(
+    tick: str, metodo: str = "drift", directorio: Optional[str] = None
+) -> ModeloBaseline:
+    """Carga el baseline de un ticker, análogo a ``cargar_modelo``."""
+    return cargar_baseline(metodo, directorio).modelo(tick)
+
+
+def main():
+    """Función principal del script."""
+    from src.pipeline.almacenamiento import listar_simbolos
+    from src.pipeline.train import cargar_datos_multi
+
+    parser = argparse.ArgumentParser(
+        description="Ajustar los modelos de referencia de todos los tickers."
+    )
+    parser.add_argument(
+        "--metodo",
+        type=str,
+        default="drift",
+        choices=METODOS_BASELINE,
+        help="Método de referencia",
+    )
+    parser.add_argument(
+        "--fecha_inicio", type=str, default=MIN_DATE, help="Fecha de inicio"
+    )
+    parser.add_argument(
+        "--fecha_corte", type=str, default=MAX_DATE, help="Fecha de corte"
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Carpeta de modelos"
+    )
+    args = parser.parse_args()
+
+    panel = cargar_datos_multi(
+        listar_simbolos(), args.fecha_inicio, args.fecha_corte, formato="ancho"
+    )
+    panel = panel.loc[:, panel.notna().any()]
+    inicio = time.perf_counter()
+    modelo = ajustar_baseline(panel, args.metodo)
+    segundos = time.perf_counter() - inicio
+    ruta = guardar_baseline(modelo, args.directorio)
+    print(
+        f"Baseline {args.metodo}: {panel.shape[1]} tickers ajustados en "
+        f"{segundos:.3f}s ({ruta})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""Búsqueda de hiperparámetros de ``entrenar_prophet`` por ticker.
+
+Los candidatos (grilla completa o muestra aleatoria del espacio) se evalúan
+con validación de origen móvil (*rolling origin*): para cada corte se entrena
+con la historia hasta el corte y se mide el RMSE de los ``horizonte`` puntos
+siguientes.
+
+La evaluación se hace en dos etapas para podar candidatos malos temprano:
+
+1. Todos los candidatos se evalúan en los primeros ``pliegues_poda`` cortes.
+2. Solo la mejor fracción (``fraccion_supervivientes``) se evalúa en el resto.
+
+Los candidatos corren en paralelo en un ``ProcessPoolExecutor``; la serie y
+los cortes se envían una sola vez a cada worker en su inicializador. Cada
+corte se ajusta con ``Prophet(...).fit`` directamente, sin las métricas de
+entrenamiento ni la instrumentación de ``entrenar_prophet``, que la
+validación no usa.
+"""
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+
+from src.pipeline.config import RUTA_MODELOS
+from src.pipeline.manifiesto import huella_datos
+from src.pipeline.train import (
+    cargar_datos,
+    entrenar_prophet,
+    guardar_modelo,
+    parametros_prophet,
+    predecir_puntual,
+)
+
+logger = logging.getLogger(__name__)
+
+MODOS_BUSQUEDA = ("grilla", "aleatorio")
+
+# Listas: valores discretos. Tuplas (mínimo, máximo): rango log-uniforme,
+# solo en modo aleatorio.
+ESPACIO_BUSQUEDA: Dict[str, Any] = {
+    "cambio_punto": [0.001, 0.01, 0.05, 0.1, 0.5],
+    "estacionalidad_anual": [True, False],
+    "estacionalidad_semanal": [True, False],
+    "estacionalidad_diaria": [False],
+}
+
+Pliegue = Tuple[int, int]
+
+
+# Estado de cada worker, fijado por _inicializar_worker
+_SERIE: Optional[pd.DataFrame] = None
+_CORTES: List[Pliegue] = []
+
+
+def generar_candidatos(
+    espacio: Optional[Dict[str, Any]] = None,
+    modo: str = "grilla",
+    n_candidatos: int = 20,
+    semilla: int = 42,
+) -> List[Dict[str, Any]]:
+    """Genera las combinaciones de hiperparámetros a evaluar.
+
+    Parameters
+    ----------
+    espacio : Dict[str, Any], optional
+        Parámetro → lista de valores o tupla ``(mínimo, máximo)``. Por
+        defecto ESPACIO_BUSQUEDA.
+    modo : str, optional
+        ``'grilla'`` (todas las combinaciones) o ``'aleatorio'``.
+    n_candidatos : int, optional
+        Candidatos a muestrear en modo aleatorio, por defecto 20.
+    semilla : int, optional
+        Semilla del muestreo aleatorio, por defecto 42.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Candidatos sin repetir.
+
+    Raises
+    ------
+    ValueError
+        Si el modo no es válido o se pide un rango continuo en modo grilla.
+    """
+    espacio = espacio or ESPACIO_BUSQUEDA
+    if modo not in MODOS_BUSQUEDA:
+        raise ValueError(f"Modo inválido: {modo}. Use uno de {MODOS_BUSQUEDA}")
+
+    nombres = list(espacio)
+    if modo == "grilla":
+        if any(isinstance(v, tuple) for v in espacio.values()):
+            raise ValueError("Los rangos continuos solo se admiten en modo aleatorio")
+        return [
+            dict(zip(nombres, valores))
+            for valores in itertools.product(*espacio.values())
+        ]
+
+    rng = random.Random(semilla)
+    candidatos: List[Dict[str, Any]] = []
+    vistos = set()
+    for _ in range(n_candidatos * 20):
+        if len(candidatos) == n_candidatos:
+            break
+        candidato = {}
+        for nombre, valores in espacio.items():
+            if isinstance(valores, tuple):
+                minimo, maximo = valores
+                candidato[nombre] = math.exp(
+                    rng.uniform(math.log(minimo), math.log(maximo))
+                )
+            else:
+                candidato[nombre] = rng.choice(valores)
+        clave = tuple(sorted(candidato.items()))
+        if clave not in vistos:
+            vistos.add(clave)
+            candidatos.append(candidato)
+    return candidatos
+
+
+def cortes_rolling_origin(
+    df: pd.DataFrame,
+    n_cortes: int = 3,
+    horizonte: int = 30,
+    min_entrenamiento: int = 252,
+) -> List[Pliegue]:
+    """Calcula los cortes de la validación de origen móvil.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Serie con las columnas ``ds`` y ``y`` ordenada por fecha.
+    n_cortes : int, optional
+        Número de cortes, por defecto 3.
+    horizonte : int, optional
+        Puntos a predecir en cada corte, por defecto 30.
+    min_entrenamiento : int, optional
+        Puntos mínimos de entrenamiento en el primer corte, por defecto 252.
+
+    Returns
+    -------
+    List[Pliegue]
+        Pares ``(fin_entrenamiento, fin_validacion)`` de posiciones: se
+        entrena con ``df.iloc[:fin_entrenamiento]`` y se valida con
+        ``df.iloc[fin_entrenamiento:fin_validacion]``.
+
+    Raises
+    ------
+    ValueError
+        Si la serie es demasiado corta para los cortes pedidos.
+    """
+    n = len(df)
+    primero = n - n_cortes * horizonte
+    if primero < min_entrenamiento:
+        raise ValueError(
+            f"Serie muy corta ({n} puntos) para {n_cortes} cortes de "
+            f"{horizonte} con {min_entrenamiento} puntos de entrenamiento"
+        )
+    return [
+        (primero + i * horizonte, primero + (i + 1) * horizonte)
+        for i in range(n_cortes)
+    ]
+
+
+def _inicializar_worker(
+    df: pd.DataFrame, cortes: List[Pliegue], silenciar: bool = True
+) -> None:
+    """Fija la serie y los cortes del worker y silencia los logs de ajuste."""
+    global _SERIE, _CORTES
+    _SERIE = df
+    _CORTES = cortes
+    if silenciar:
+        for nombre in ["prophet", "cmdstanpy"]:
+            logging.getLogger(nombre).setLevel(logging.WARNING)
+
+
+def _evaluar(
+    candidato: Dict[str, Any], indices: Sequence[int]
+) -> Tuple[List[float], Optional[str]]:
+    """Evalúa un candidato en los cortes ``indices`` de la serie del worker.
+
+    Returns
+    -------
+    Tuple[List[float], Optional[str]]
+        RMSE de cada corte y el error si el ajuste falló.
+    """
+    errores = []
+    for i in indices:
+        fin_entrenamiento, fin_validacion = _CORTES[i]
+        entrenamiento = _SERIE.iloc[:fin_entrenamiento]
+        validacion = _SERIE.iloc[fin_entrenamiento:fin_validacion]
+        try:
+            modelo = Prophet(**parametros_prophet(**candidato))
+            modelo.fit(entrenamiento)
+            yhat = predecir_puntual(modelo, validacion[["ds"]])
+        except Exception as exc:
+            return errores, f"{type(exc).__name__}: {exc}"
+        real = validacion["y"].to_numpy()
+        errores.append(float(np.sqrt(np.mean((real - yhat) ** 2))))
+    return errores, None
+
+
+def _evaluar_todos(
+    pool: Optional[ProcessPoolExecutor],
+    candidatos: List[Dict[str, Any]],
+    indices: Sequence[int],
+) -> List[Tuple[List[float], Optional[str]]]:
+    """Evalúa varios candidatos en el pool (o en el proceso actual)."""
+    if pool is None:
+        return [_evaluar(candidato, indices) for candidato in candidatos]
+    return list(pool.map(_evaluar, candidatos, [indices] * len(candidatos)))
+
+
+def buscar_hiperparametros(
+    df: pd.DataFrame,
+    espacio: Optional[Dict[str, Any]] = None,
+    modo: str = "grilla",
+    n_candidatos: int = 20,
+    n_cortes: int = 3,
+    horizonte: int = 30,
+    workers: int = 1,
+    pliegues_poda: int = 1,
+    fraccion_supervivientes: float = 0.5,
+    semilla: int = 42,
+) -> Dict[str, Any]:
+    """Busca los hiperparámetros de ``entrenar_prophet`` con menor RMSE.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Serie con las columnas ``ds`` y ``y`` ordenada por fecha.
+    espacio : Dict[str, Any], optional
+        Espacio de búsqueda, por defecto ESPACIO_BUSQUEDA.
+    modo : str, optional
+        ``'grilla'`` o ``'aleatorio'``, por defecto ``'grilla'``.
+    n_candidatos : int, optional
+        Candidatos en modo aleatorio, por defecto 20.
+    n_cortes : int, optional
+        Cortes de origen móvil, por defecto 3.
+    horizonte : int, optional
+        Puntos validados por corte, por defecto 30.
+    workers : int, optional
+        Procesos en paralelo, por defecto 1 (en el proceso actual).
+    pliegues_poda : int, optional
+        Cortes que evalúan todos los candidatos antes de podar, por defecto 1.
+    fraccion_supervivientes : float, optional
+        Fracción de candidatos que pasa a los cortes restantes, por
+        defecto 0.5.
+    semilla : int, optional
+        Semilla del modo aleatorio, por defecto 42.
+
+    Returns
+    -------
+    Dict[str, Any]
+        ``mejores`` (hiperparámetros ganadores), ``rmse`` (su RMSE medio) y
+        ``resultados`` (un registro por candidato, ordenados por RMSE).
+
+    Raises
+    ------
+    RuntimeError
+        Si ningún candidato pudo evaluarse.
+    """
+    candidatos = generar_candidatos(espacio, modo, n_candidatos, semilla)
+    df = df.reset_index(drop=True)
+    cortes = cortes_rolling_origin(df, n_cortes, horizonte)
+    pliegues_poda = min(pliegues_poda, n_cortes)
+    primeros = list(range(pliegues_poda))
+    restantes = list(range(pliegues_poda, n_cortes))
+    logger.info(
+        f"Evaluando {len(candidatos)} candidatos en {n_cortes} cortes "
+        f"con {workers} workers"
+    )
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_inicializar_worker,
+            initargs=(df, cortes),
+        )
+    else:
+        _inicializar_worker(df, cortes, silenciar=False)
+    try:
+        resultados = [
+            {
+                "hiperparametros": candidato,
+                "errores": errores,
+                "error": error,
+                "podado": False,
+            }
+            for candidato, (errores, error) in zip(
+                candidatos, _evaluar_todos(pool, candidatos, primeros)
+            )
+        ]
+
+        validos = [r for r in resultados if r["error"] is None]
+        validos.sort(key=lambda r: np.mean(r["errores"]))
+        n_supervivientes = max(1, math.ceil(len(validos) * fraccion_supervivientes))
+        for resultado in validos[n_supervivientes:]:
+            resultado["podado"] = bool(restantes)
+        supervivientes = validos[:n_supervivientes]
+        if restantes and supervivientes:
+            logger.info(f"{len(supervivientes)} candidatos pasan la poda")
+            evaluaciones = _evaluar_todos(
+                pool, [r["hiperparametros"] for r in supervivientes], restantes
+            )
+            for resultado, (errores, error) in zip(supervivientes, evaluaciones):
+                resultado["errores"] += errores
+                resultado["error"] = error
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    for resultado in resultados:
+        completo = resultado["error"] is None and not resultado["podado"]
+        resultado["rmse"] = (
+            float(np.mean(resultado["errores"])) if completo else float("inf")
+        )
+    resultados.sort(key=lambda r: r["rmse"])
+    if not math.isfinite(resultados[0]["rmse"]):
+        raise RuntimeError("Ningún candidato pudo evaluarse")
+
+    mejor = resultados[0]
+    logger.info(f"Mejores hiperparámetros: {mejor['hiperparametros']}")
+    return {
+        "mejores": mejor["hiperparametros"],
+        "rmse": mejor["rmse"],
+        "resultados": resultados,
+    }
+
+
+def entrenar_con_busqueda(
+    tick: str,
+    fecha_inicio: str,
+    fecha_corte: str,
+    directorio: Optional[str] = None,
+    **opciones: Any,
+) -> Dict[str, Any]:
+    """Busca los hiperparámetros de un ticker, entrena y guarda el modelo.
+
+    Los hiperparámetros ganadores se guardan junto al modelo en
+    ``hiperparametros_{tick}.json`` (ver ``guardar_modelo``).
+
+    Parameters
+    ----------
+    tick : str
+        Símbolo de la acción.
+    fecha_inicio : str
+        Fecha de inicio en formato 'YYYY-MM-DD'.
+    fecha_corte : str
+        Fecha de corte en formato 'YYYY-MM-DD'.
+    directorio : str, optional
+        Carpeta de los modelos, por defecto RUTA_MODELOS.
+    **opciones
+        Argumentos de ``buscar_hiperparametros``.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Resultado de ``buscar_hiperparametros``.
+    """
+    df = cargar_datos(tick, fecha_inicio, fecha_corte).dropna()
+    busqueda = buscar_hiperparametros(df, **opciones)
+    modelo, metricas = entrenar_prophet(df, **busqueda["mejores"])
+    guardar_modelo(
+        modelo,
+        tick,
+        metricas,
+        directorio,
+        hiperparametros={**busqueda["mejores"], "rmse_validacion": busqueda["rmse"]},
+        huella=huella_datos(df),
+    )
+    return busqueda
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Buscar hiperparámetros de Prophet para un ticker."
+    )
+    parser.add_argument("--tick", type=str, required=True, help="Símbolo")
+    parser.add_argument(
+        "--fecha_inicio", type=str, required=True, help="Fecha de inicio (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--fecha_corte", type=str, required=True, help="Fecha de corte (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--modo", type=str, default="grilla", choices=MODOS_BUSQUEDA, help="Modo"
+    )
+    parser.add_argument(
+        "--n_candidatos", type=int, default=20, help="Candidatos (modo aleatorio)"
+    )
+    parser.add_argument("--n_cortes", type=int, default=3, help="Cortes")
+    parser.add_argument(
+        "--horizonte", type=int, default=30, help="Puntos validados por corte"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Procesos"
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Carpeta de modelos"
+    )
+    args = parser.parse_args()
+
+    busqueda = entrenar_con_busqueda(
+        args.tick,
+        args.fecha_inicio,
+        args.fecha_corte,
+        args.directorio,
+        modo=args.modo,
+        n_candidatos=args.n_candidatos,
+        n_cortes=args.n_cortes,
+        horizonte=args.horizonte,
+        workers=args.workers,
+    )
+    print(json.dumps({k: busqueda[k] for k in ["mejores", "rmse"]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
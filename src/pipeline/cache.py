@@ -0,0 +1,131 @@
+"""Caché en memoria de las fuentes de datos leídas por el pipeline."""
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from src.pipeline.config import CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+def _tamano(valor: Any) -> int:
+    """Estima la memoria ocupada por un valor de la caché."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return int(valor.memory_usage(deep=True).sum())
+    return sys.getsizeof(valor)
+
+
+class CacheFuentes:
+    """Caché LRU de fuentes ya leídas y limpiadas, indexada por archivo.
+
+    Cada entrada guarda la firma ``(mtime, tamaño)`` del archivo de origen; si
+    el archivo cambia en disco la entrada se descarta y se vuelve a leer. Las
+    entradas menos usadas se desalojan cuando se supera ``max_bytes``.
+
+    Los valores devueltos se comparten entre llamadas, por lo que no deben
+    modificarse in-place.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Presupuesto de memoria de la caché, por defecto CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entradas: "OrderedDict[Tuple[str, Hashable], Tuple[Any, ...]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        self.desalojos = 0
+
+    def obtener(
+        self, ruta: str, cargar: Callable[[], Any], variante: Optional[Hashable] = None
+    ) -> Any:
+        """Devuelve la fuente cacheada o la carga con ``cargar``.
+
+        Parameters
+        ----------
+        ruta : str
+            Archivo de origen; su mtime y tamaño validan la entrada.
+        cargar : Callable[[], Any]
+            Función que lee y limpia la fuente cuando no está en caché.
+        variante : Hashable, optional
+            Distingue lecturas distintas de un mismo archivo.
+
+        Returns
+        -------
+        Any
+            Valor devuelto por ``cargar``.
+        """
+        clave = (os.path.abspath(ruta), variante)
+        estado = os.stat(ruta)
+        firma = (estado.st_mtime_ns, estado.st_size)
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                if entrada[0] == firma:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return entrada[1]
+                self._eliminar(clave)
+                self.invalidaciones += 1
+            self.fallos += 1
+
+        valor = cargar()
+        tamano = _tamano(valor)
+
+        with self._lock:
+            if tamano > self.max_bytes:
+                logger.debug(f"Fuente {ruta} excede el presupuesto de la caché")
+                return valor
+            if clave in self._entradas:
+                self._eliminar(clave)
+            self._entradas[clave] = (firma, valor, tamano)
+            self._bytes += tamano
+            while self._bytes > self.max_bytes:
+                clave_lru = next(iter(self._entradas))
+                self._eliminar(clave_lru)
+                self.desalojos += 1
+        return valor
+
+    def _eliminar(self, clave: Tuple[str, Hashable]) -> None:
+        _, _, tamano = self._entradas.pop(clave)
+        self._bytes -= tamano
+
+    def limpiar(self) -> None:
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+            self.aciertos = 0
+            self.fallos = 0
+            self.invalidaciones = 0
+            self.desalojos = 0
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Devuelve los contadores de uso de la caché."""
+        with self._lock:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "invalidaciones": self.invalidaciones,
+                "desalojos": self.desalojos,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Caché compartida por todas las lecturas del proceso
+CACHE_FUENTES = CacheFuentes()
@@ -0,0 +1,306 @@
+"""Caché en disco de los precios de cierre descargados de yfinance.
+
+Cada ticker se guarda en su propio Parquet y un archivo de cobertura registra
+qué rangos de fechas ya se pidieron a yfinance::
+
+    RUTA_CACHE_YFINANCE/
+    ├── cobertura.json      # {"AAPL": [["2020-01-01", "2025-03-07"]], ...}
+    ├── AAPL.parquet        # columnas Date, Close
+    └── MSFT.parquet
+
+Los rangos son semiabiertos ``[inicio, fin)``, igual que ``start``/``end`` de
+``yf.download``. Una consulta solo descarga los huecos que faltan; los tickers
+con el mismo hueco se piden juntos en lotes de tamaño acotado.
+"""
+import argparse
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from .config import MIN_DATE, RUTA_CACHE_YFINANCE, TAMANO_LOTE_YFINANCE
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_COBERTURA = "cobertura.json"
+
+Intervalo = Tuple[pd.Timestamp, pd.Timestamp]
+Descargador = Callable[[List[str], str, str], pd.DataFrame]
+
+
+def _descargar_cierres(ticks: List[str], inicio: str, fin: str) -> pd.DataFrame:
+    """Descarga los cierres de varios tickers con una sola llamada a yfinance.
+
+    Returns
+    -------
+    pd.DataFrame
+        Precios de cierre con las fechas como índice y un ticker por columna.
+    """
+    df = yf.download(ticks, start=inicio, end=fin, progress=False)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=ticks)
+    cierres = df["Close"]
+    if isinstance(cierres, pd.Series):
+        cierres = cierres.to_frame(ticks[0])
+    return cierres
+
+
+def leer_cobertura(directorio: str = RUTA_CACHE_YFINANCE) -> Dict[str, List[Intervalo]]:
+    """Lee los rangos de fechas ya descargados de cada ticker.
+
+    Parameters
+    ----------
+    directorio : str, optional
+        Directorio de la caché, por defecto RUTA_CACHE_YFINANCE.
+
+    Returns
+    -------
+    Dict[str, List[Intervalo]]
+        Ticker → intervalos ``[inicio, fin)`` ordenados y sin solaparse.
+    """
+    ruta = os.path.join(directorio, ARCHIVO_COBERTURA)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta) as f:
+        contenido = json.load(f)
+    return {
+        tick: [(pd.Timestamp(i), pd.Timestamp(f)) for i, f in intervalos]
+        for tick, intervalos in contenido.items()
+    }
+
+
+def _guardar_cobertura(cobertura: Dict[str, List[Intervalo]], directorio: str) -> None:
+    """Escribe la cobertura de forma atómica."""
+    contenido = {
+        tick: [[i.strftime("%Y-%m-%d"), f.strftime("%Y-%m-%d")] for i, f in rangos]
+        for tick, rangos in sorted(cobertura.items())
+    }
+    ruta = os.path.join(directorio, ARCHIVO_COBERTURA)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w") as f:
+        json.dump(contenido, f, indent=2)
+    os.replace(temporal, ruta)
+
+
+def _fusionar_intervalos(intervalos: List[Intervalo]) -> List[Intervalo]:
+    """Une los intervalos que se solapan o son contiguos."""
+    fusionados: List[Intervalo] = []
+    for inicio, fin in sorted(intervalos):
+        if fusionados and inicio <= fusionados[-1][1]:
+            fusionados[-1] = (fusionados[-1][0], max(fusionados[-1][1], fin))
+        else:
+            fusionados.append((inicio, fin))
+    return fusionados
+
+
+def _huecos(
+    cubiertos: List[Intervalo], inicio: pd.Timestamp, fin: pd.Timestamp
+) -> List[Intervalo]:
+    """Devuelve las partes de ``[inicio, fin)`` que no están cubiertas."""
+    huecos = []
+    cursor = inicio
+    for desde, hasta in cubiertos:
+        if hasta <= cursor:
+            continue
+        if desde >= fin:
+            break
+        if desde > cursor:
+            huecos.append((cursor, desde))
+        cursor = max(cursor, hasta)
+    if cursor < fin:
+        huecos.append((cursor, fin))
+    return huecos
+
+
+def _ruta_ticker(tick: str, directorio: str) -> str:
+    """Ruta del Parquet de un ticker."""
+    return os.path.join(directorio, f"{tick}.parquet")
+
+
+def _leer_ticker(tick: str, directorio: str) -> pd.DataFrame:
+    """Lee los cierres guardados de un ticker (vacío si no hay)."""
+    ruta = _ruta_ticker(tick, directorio)
+    if not os.path.exists(ruta):
+        return pd.DataFrame(
+            {"Date": pd.Series(dtype="datetime64[ns]"), "Close": pd.Series(dtype=float)}
+        )
+    return pd.read_parquet(ruta)
+
+
+def _anexar_cierres(tick: str, nuevos: pd.Series, directorio: str) -> None:
+    """Fusiona cierres nuevos con los guardados y reescribe el Parquet."""
+    nuevos = nuevos.dropna()
+    if nuevos.empty:
+        return
+    df = pd.concat(
+        [
+            _leer_ticker(tick, directorio),
+            pd.DataFrame(
+                {"Date": pd.to_datetime(nuevos.index), "Close": nuevos.values}
+            ),
+        ],
+        ignore_index=True,
+    )
+    df = df.drop_duplicates("Date", keep="last").sort_values("Date")
+    ruta = _ruta_ticker(tick, directorio)
+    temporal = f"{ruta}.tmp"
+    df.to_parquet(temporal, index=False)
+    os.replace(temporal, ruta)
+
+
+def actualizar_cache_yfinance(
+    ticks: List[str],
+    fecha_inicio: str,
+    fecha_fin: str,
+    directorio: str = RUTA_CACHE_YFINANCE,
+    tamano_lote: int = TAMANO_LOTE_YFINANCE,
+    descargador: Optional[Descargador] = None,
+) -> int:
+    """Descarga solo los rangos que faltan en la caché para cada ticker.
+
+    Los tickers se agrupan por hueco (en la actualización diaria todos
+    comparten el mismo) y cada grupo se pide en lotes de ``tamano_lote``
+    tickers. La cobertura se guarda después de cada lote, por lo que una
+    actualización interrumpida se retoma donde quedó.
+
+    ``yf.download`` no falla si falla un ticker del lote: lo devuelve vacío.
+    Por eso cada hueco se marca como cubierto solo hasta el último cierre
+    recibido del ticker; los tickers sin datos quedan sin cubrir y se
+    vuelven a pedir en la siguiente actualización.
+
+    Parameters
+    ----------
+    ticks : List[str]
+        Tickers de yfinance.
+    fecha_inicio : str
+        Primera fecha (inclusive) en formato 'YYYY-MM-DD'.
+    fecha_fin : str
+        Última fecha (exclusive) en formato 'YYYY-MM-DD'.
+    directorio : str, optional
+        Directorio de la caché, por defecto RUTA_CACHE_YFINANCE.
+    tamano_lote : int, optional
+        Tickers por llamada a yfinance, por defecto TAMANO_LOTE_YFINANCE.
+    descargador : Descargador, optional
+        Función ``(ticks, inicio, fin) -> DataFrame`` de cierres con un ticker
+        por columna. Por defecto usa ``yf.download``.
+
+    Returns
+    -------
+    int
+        Número de llamadas de descarga realizadas.
+    """
+    descargador = descargador or _descargar_cierres
+    os.makedirs(directorio, exist_ok=True)
+    inicio = pd.Timestamp(fecha_inicio)
+    # No se puede cubrir el futuro: el día de hoy aún puede cambiar
+    fin = min(pd.Timestamp(fecha_fin), pd.Timestamp(date.today()))
+    cobertura = leer_cobertura(directorio)
+
+    pendientes: Dict[Intervalo, List[str]] = defaultdict(list)
+    for tick in dict.fromkeys(ticks):
+        for hueco in _huecos(cobertura.get(tick, []), inicio, fin):
+            pendientes[hueco].append(tick)
+
+    llamadas = 0
+    for (desde, hasta), grupo in sorted(pendientes.items()):
+        for i in range(0, len(grupo), tamano_lote):
+            lote = grupo[i : i + tamano_lote]
+            logger.info(
+                f"Descargando {len(lote)} tickers de {desde.date()} a {hasta.date()}"
+            )
+            cierres = descargador(
+                lote, desde.strftime("%Y-%m-%d"), hasta.strftime("%Y-%m-%d")
+            )
+            llamadas += 1
+            for tick in lote:
+                recibidos = cierres[tick].dropna() if tick in cierres else pd.Series()
+                if recibidos.empty:
+                    logger.warning(f"Sin cierres de {tick} de {desde.date()}")
+                    continue
+                _anexar_cierres(tick, recibidos, directorio)
+                ultimo = pd.Timestamp(recibidos.index.max()).normalize()
+                cubierto = min(hasta, ultimo + pd.Timedelta(days=1))
+                cobertura[tick] = _fusionar_intervalos(
+                    cobertura.get(tick, []) + [(desde, cubierto)]
+                )
+            _guardar_cobertura(cobertura, directorio)
+    return llamadas
+
+
+def leer_cache_yfinance(
+    ticks: List[str],
+    fecha_inicio: str,
+    fecha_fin: str,
+    directorio: str = RUTA_CACHE_YFINANCE,
+) -> pd.DataFrame:
+    """Lee de la caché los cierres de varios tickers en ``[inicio, fin)``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Precios de cierre con índice ``Date`` y un ticker por columna, con la
+        misma forma que ``obtener_datos_yfinance``.
+    """
+    inicio = pd.Timestamp(fecha_inicio)
+    fin = pd.Timestamp(fecha_fin)
+    columnas = {}
+    for tick in dict.fromkeys(ticks):
+        df = _leer_ticker(tick, directorio)
+        df = df[(df["Date"] >= inicio) & (df["Date"] < fin)]
+        columnas[tick] = df.set_index("Date")["Close"]
+    resultado = pd.DataFrame(columnas, columns=list(dict.fromkeys(ticks)))
+    resultado.index.name = "Date"
+    resultado.columns.name = "Ticker"
+    return resultado.sort_index()
+
+
+def main():
+    """Función principal del script."""
+    from src.pipeline.almacenamiento import listar_simbolos
+
+    parser = argparse.ArgumentParser(
+        description="Actualizar la caché de precios de yfinance."
+    )
+    parser.add_argument(
+        "--tickers",
+        nargs="*",
+        default=None,
+        help="Tickers a actualizar (por defecto, todos los del S&P 500)",
+    )
+    parser.add_argument(
+        "--fecha_inicio", type=str, default=MIN_DATE, help="Fecha de inicio"
+    )
+    parser.add_argument(
+        "--fecha_fin",
+        type=str,
+        default=date.today().strftime("%Y-%m-%d"),
+        help="Fecha fin (exclusive)",
+    )
+    parser.add_argument(
+        "--directorio",
+        type=str,
+        default=RUTA_CACHE_YFINANCE,
+        help="Directorio de la caché",
+    )
+    parser.add_argument(
+        "--tamano_lote",
+        type=int,
+        default=TAMANO_LOTE_YFINANCE,
+        help="Tickers por llamada a yfinance",
+    )
+    args = parser.parse_args()
+
+    ticks = args.tickers or listar_simbolos()
+    llamadas = actualizar_cache_yfinance(
+        ticks, args.fecha_inicio, args.fecha_fin, args.directorio, args.tamano_lote
+    )
+    print(f"{len(ticks)} tickers actualizados con {llamadas} descargas")
+
+
+if __name__ == "__main__":
+    main()
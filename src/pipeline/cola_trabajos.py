@@ -0,0 +1,516 @@
+"""Cola de trabajos de entrenamiento respaldada por un archivo SQLite.
+
+Permite repartir un reentrenamiento masivo entre varios procesos (o varias
+máquinas que comparten el sistema de archivos) sin un broker externo::
+
+    python -m src.pipeline.cola_trabajos encolar --fecha_fin 2024-12-31
+    python -m src.pipeline.cola_trabajos trabajar --workers 4
+    python -m src.pipeline.cola_trabajos estado
+
+Cada ticker es un trabajo. Un worker lo toma con un *lease* de duración
+limitada dentro de una transacción ``BEGIN IMMEDIATE``, de modo que dos
+workers nunca toman el mismo trabajo. Mientras entrena, un hilo renueva el
+lease cada tercio de su duración, así un ajuste largo no se entrega a otro
+worker; si el worker muere, el lease deja de renovarse, vence y otro worker
+reintenta el trabajo, hasta ``max_intentos`` veces.
+
+Cada trabajo se entrena con ``train.entrenar_ticker``, igual que en
+``train_models``: mismos hiperparámetros, mismo manifiesto (los tickers sin
+cambios no se reentrenan), warm start y materialización.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.pipeline.config import (
+    DURACION_LEASE_COLA,
+    MAX_DATE,
+    MAX_INTENTOS_COLA,
+    MIN_DATE,
+    RUTA_COLA,
+    RUTA_MODELOS,
+)
+from src.pipeline.instrumentacion import activar_instrumentacion
+from src.pipeline.manifiesto import leer_manifiesto, registrar_entrenamiento
+from src.pipeline.train import HIPERPARAMETROS, SERIES_ESPECIALES, entrenar_ticker
+
+logger = logging.getLogger(__name__)
+
+ESTADOS = ("pendiente", "en_curso", "ok", "sin_cambios", "sin_datos", "error")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    ticker TEXT PRIMARY KEY,
+    fecha_inicio TEXT NOT NULL,
+    fecha_fin TEXT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_hasta REAL,
+    segundos REAL,
+    metricas TEXT,
+    error TEXT,
+    actualizado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON trabajos (estado, lease_hasta);
+"""
+
+
+def conectar(ruta: str = RUTA_COLA, wal: bool = True) -> sqlite3.Connection:
+    """Abre la base de la cola y crea el esquema si no existe.
+
+    Parameters
+    ----------
+    ruta : str, optional
+        Archivo SQLite, por defecto RUTA_COLA.
+    wal : bool, optional
+        Usar el journal WAL, por defecto True. WAL necesita memoria
+        compartida entre procesos, por lo que solo sirve en una misma
+        máquina; con workers en varias máquinas sobre un sistema de archivos
+        compartido debe usarse ``False`` (journal clásico con bloqueos).
+
+    Returns
+    -------
+    sqlite3.Connection
+        Conexión en modo *autocommit*; las transacciones son explícitas.
+    """
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    con = sqlite3.connect(ruta, timeout=60, isolation_level=None)
+    con.row_factory = sqlite3.Row
+    con.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(_ESQUEMA)
+    return con
+
+
+def encolar(
+    con: sqlite3.Connection,
+    tickers: List[str],
+    fecha_inicio: str = MIN_DATE,
+    fecha_fin: str = MAX_DATE,
+    reencolar: bool = False,
+) -> int:
+    """Agrega un trabajo por ticker.
+
+    Parameters
+    ----------
+    con : sqlite3.Connection
+        Conexión devuelta por ``conectar``.
+    tickers : List[str]
+        Tickers a entrenar.
+    fecha_inicio, fecha_fin : str, optional
+        Rango de datos de entrenamiento.
+    reencolar : bool, optional
+        Si es True, los tickers ya presentes vuelven a ``'pendiente'`` con el
+        nuevo rango y sin intentos; si es False se ignoran. Por defecto False.
+
+    Returns
+    -------
+    int
+        Trabajos agregados o reiniciados.
+    """
+    ahora = time.time()
+    conflicto = (
+        """ON CONFLICT (ticker) DO UPDATE SET
+            fecha_inicio = excluded.fecha_inicio, fecha_fin = excluded.fecha_fin,
+            estado = 'pendiente', intentos = 0, worker = NULL, lease_hasta = NULL,
+            error = NULL, actualizado = excluded.actualizado"""
+        if reencolar
+        else "ON CONFLICT (ticker) DO NOTHING"
+    )
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        antes = con.total_changes
+        con.executemany(
+            "INSERT INTO trabajos (ticker, fecha_inicio, fecha_fin, actualizado) "
+            f"VALUES (?, ?, ?, ?) {conflicto}",
+            [(t, fecha_inicio, fecha_fin, ahora) for t in dict.fromkeys(tickers)],
+        )
+        agregados = con.total_changes - antes
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    return agregados
+
+
+def tomar_trabajo(
+    con: sqlite3.Connection,
+    worker: str,
+    duracion_lease: float = DURACION_LEASE_COLA,
+    max_intentos: int = MAX_INTENTOS_COLA,
+) -> Optional[Dict[str, Any]]:
+    """Toma el siguiente trabajo disponible con un lease exclusivo.
+
+    Son elegibles los trabajos pendientes y los ``'en_curso'`` cuyo lease
+    venció (el worker murió). Los de lease vencido que ya agotaron
+    ``max_intentos`` se marcan como ``'error'``.
+
+    Returns
+    -------
+    Dict[str, Any] or None
+        ``ticker``, ``fecha_inicio``, ``fecha_fin`` e ``intentos`` del
+        trabajo tomado, o ``None`` si no queda ninguno disponible.
+    """
+    ahora = time.time()
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        con.execute(
+            "UPDATE trabajos SET estado = 'error', worker = NULL, "
+            "lease_hasta = NULL, actualizado = ?, "
+            "error = 'Lease vencido tras agotar los intentos' "
+            "WHERE estado = 'en_curso' AND lease_hasta < ? AND intentos >= ?",
+            (ahora, ahora, max_intentos),
+        )
+        fila = con.execute(
+            "SELECT ticker, fecha_inicio, fecha_fin, intentos FROM trabajos "
+            "WHERE estado = 'pendiente' "
+            "OR (estado = 'en_curso' AND lease_hasta < ?) "
+            "ORDER BY intentos, rowid LIMIT 1",
+            (ahora,),
+        ).fetchone()
+        if fila is not None:
+            con.execute(
+                "UPDATE trabajos SET estado = 'en_curso', worker = ?, "
+                "lease_hasta = ?, intentos = intentos + 1, actualizado = ? "
+                "WHERE ticker = ?",
+                (worker, ahora + duracion_lease, ahora, fila["ticker"]),
+            )
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    if fila is None:
+        return None
+    return {**dict(fila), "intentos": fila["intentos"] + 1}
+
+
+def completar_trabajo(
+    con: sqlite3.Connection,
+    ticker: str,
+    worker: str,
+    resultado: Dict[str, Any],
+    max_intentos: int = MAX_INTENTOS_COLA,
+) -> bool:
+    """Registra el resultado de un trabajo si el worker aún tiene el lease.
+
+    Un error con intentos restantes devuelve el trabajo a ``'pendiente'``.
+
+    Parameters
+    ----------
+    resultado : Dict[str, Any]
+        ``estado`` (``'ok'``, ``'sin_cambios'``, ``'sin_datos'`` o
+        ``'error'``), ``segundos`` y, opcionalmente, ``metricas`` y
+        ``error``.
+
+    Returns
+    -------
+    bool
+        False si el lease venció y otro worker tomó el trabajo; en ese caso
+        el resultado se descarta.
+    """
+    estado = resultado["estado"]
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        if estado == "error":
+            # Reintentar mientras queden intentos
+            estado_sql = "CASE WHEN intentos < ? THEN 'pendiente' ELSE 'error' END"
+            parametros: tuple = (max_intentos,)
+        else:
+            estado_sql, parametros = "?", (estado,)
+        cursor = con.execute(
+            f"UPDATE trabajos SET estado = {estado_sql}, worker = NULL, "
+            "lease_hasta = NULL, segundos = ?, metricas = ?, error = ?, "
+            "actualizado = ? "
+            "WHERE ticker = ? AND worker = ? AND estado = 'en_curso'",
+            (
+                *parametros,
+                resultado.get("segundos"),
+                json.dumps(resultado["metricas"]) if "metricas" in resultado else None,
+                resultado.get("error"),
+                time.time(),
+                ticker,
+                worker,
+            ),
+        )
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    return cursor.rowcount == 1
+
+
+def renovar_lease(
+    con: sqlite3.Connection,
+    ticker: str,
+    worker: str,
+    duracion_lease: float = DURACION_LEASE_COLA,
+) -> bool:
+    """Extiende el lease de un trabajo en curso del worker.
+
+    Returns
+    -------
+    bool
+        False si el worker ya no tiene el lease.
+    """
+    ahora = time.time()
+    cursor = con.execute(
+        "UPDATE trabajos SET lease_hasta = ?, actualizado = ? "
+        "WHERE ticker = ? AND worker = ? AND estado = 'en_curso'",
+        (ahora + duracion_lease, ahora, ticker, worker),
+    )
+    return cursor.rowcount == 1
+
+
+@contextmanager
+def _renovando_lease(
+    ruta: str, wal: bool, ticker: str, worker: str, duracion_lease: float
+) -> Iterator[None]:
+    """Renueva el lease en un hilo mientras dura el bloque."""
+    parar = threading.Event()
+
+    def _latido() -> None:
+        # Conexión propia: las conexiones SQLite no se comparten entre hilos
+        con = conectar(ruta, wal)
+        try:
+            while not parar.wait(duracion_lease / 3):
+                if not renovar_lease(con, ticker, worker, duracion_lease):
+                    logger.warning(f"{worker} perdió el lease de {ticker}")
+                    return
+        except sqlite3.Error as exc:
+            logger.warning(f"No se pudo renovar el lease de {ticker}: {exc}")
+        finally:
+            con.close()
+
+    hilo = threading.Thread(target=_latido, name=f"lease-{ticker}", daemon=True)
+    hilo.start()
+    try:
+        yield
+    finally:
+        parar.set()
+        hilo.join()
+
+
+def estado_cola(con: sqlite3.Connection) -> Dict[str, int]:
+    """Cuenta los trabajos por estado."""
+    conteos = dict.fromkeys(ESTADOS, 0)
+    for estado, n in con.execute(
+        "SELECT estado, COUNT(*) FROM trabajos GROUP BY estado"
+    ):
+        conteos[estado] = n
+    return conteos
+
+
+def _ejecutar(
+    trabajo: Dict[str, Any],
+    directorio: str,
+    warm_start: bool = False,
+    materializar: bool = False,
+    wal: bool = True,
+) -> Dict[str, Any]:
+    """Entrena un trabajo como ``train_models`` sin propagar errores."""
+    resultado = entrenar_ticker(
+        trabajo["ticker"],
+        trabajo["fecha_inicio"],
+        trabajo["fecha_fin"],
+        directorio,
+        leer_manifiesto(directorio).get(trabajo["ticker"]),
+        warm_start,
+        materializar,
+        origen="cola",
+        wal=wal,
+    )
+    if "traza" in resultado:
+        logger.debug(resultado["traza"])
+    return resultado
+
+
+def _registrar_manifiesto(
+    con: sqlite3.Connection, resultado: Dict[str, Any], directorio: str
+) -> None:
+    """Anota un modelo entrenado en el manifiesto de ``directorio``.
+
+    El manifiesto se reescribe entero; la transacción sobre la cola
+    serializa la lectura y la escritura entre workers.
+    """
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        registrar_entrenamiento(
+            resultado["ticker"],
+            resultado["huella"],
+            HIPERPARAMETROS,
+            resultado["ruta_modelo"],
+            directorio,
+        )
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+
+
+def trabajar(
+    ruta: str = RUTA_COLA,
+    directorio: str = RUTA_MODELOS,
+    worker: Optional[str] = None,
+    duracion_lease: float = DURACION_LEASE_COLA,
+    max_intentos: int = MAX_INTENTOS_COLA,
+    max_trabajos: Optional[int] = None,
+    wal: bool = True,
+    warm_start: bool = False,
+    materializar: bool = False,
+) -> int:
+    """Procesa trabajos de la cola hasta vaciarla.
+
+    Parameters
+    ----------
+    ruta : str, optional
+        Archivo SQLite de la cola, por defecto RUTA_COLA.
+    directorio : str, optional
+        Carpeta de los modelos, por defecto RUTA_MODELOS.
+    worker : str, optional
+        Identificador del worker, por defecto ``host:pid``.
+    duracion_lease : float, optional
+        Segundos de exclusividad sobre cada trabajo; se renueva cada tercio
+        mientras el trabajo corre. Por defecto DURACION_LEASE_COLA.
+    max_intentos : int, optional
+        Intentos por trabajo, por defecto MAX_INTENTOS_COLA.
+    max_trabajos : int, optional
+        Detenerse tras este número de trabajos, por defecto sin límite.
+    wal : bool, optional
+        Ver ``conectar``. También se aplica al registro de modelos que
+        escribe ``guardar_modelo``.
+    warm_start : bool, optional
+        Iniciar cada ajuste desde el modelo guardado del ticker, por defecto
+        False.
+    materializar : bool, optional
+        Guardar la tabla de pronósticos de cada modelo, por defecto False.
+
+    Returns
+    -------
+    int
+        Trabajos procesados por este worker.
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    con = conectar(ruta, wal)
+    procesados = 0
+    try:
+        while max_trabajos is None or procesados < max_trabajos:
+            trabajo = tomar_trabajo(con, worker, duracion_lease, max_intentos)
+            if trabajo is None:
+                break
+            with _renovando_lease(ruta, wal, trabajo["ticker"], worker, duracion_lease):
+                resultado = _ejecutar(
+                    trabajo, directorio, warm_start, materializar, wal
+                )
+            vigente = completar_trabajo(
+                con, trabajo["ticker"], worker, resultado, max_intentos
+            )
+            if vigente and resultado["estado"] == "ok":
+                _registrar_manifiesto(con, resultado, directorio)
+            procesados += 1
+            mensaje = (
+                f"{worker} {trabajo['ticker']} (intento {trabajo['intentos']}): "
+                f"{resultado['estado']} ({resultado['segundos']:.1f}s)"
+            )
+            if not vigente:
+                logger.warning(f"{mensaje} descartado: el lease venció")
+            elif resultado["estado"] == "error":
+                logger.error(f"{mensaje} {resultado['error']}")
+            else:
+                logger.info(mensaje)
+    finally:
+        con.close()
+    return procesados
+
+
+def main():
+    """Función principal del script."""
+    from src.pipeline.almacenamiento import listar_simbolos
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(
+        description="Cola SQLite de trabajos de entrenamiento."
+    )
+    parser.add_argument("--ruta", type=str, default=RUTA_COLA, help="Archivo SQLite")
+    parser.add_argument(
+        "--sin_wal",
+        action="store_true",
+        help="No usar WAL (workers en varias máquinas)",
+    )
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_encolar = sub.add_parser("encolar", help="Encolar tickers")
+    p_encolar.add_argument("--tickers", nargs="+", help="Por defecto, todos")
+    p_encolar.add_argument("--fecha_inicio", type=str, default=MIN_DATE)
+    p_encolar.add_argument("--fecha_fin", type=str, default=MAX_DATE)
+    p_encolar.add_argument(
+        "--reencolar", action="store_true", help="Reiniciar trabajos existentes"
+    )
+
+    p_trabajar = sub.add_parser("trabajar", help="Procesar trabajos")
+    p_trabajar.add_argument("--workers", type=int, default=1, help="Procesos")
+    p_trabajar.add_argument("--directorio", type=str, default=RUTA_MODELOS)
+    p_trabajar.add_argument("--duracion_lease", type=float, default=DURACION_LEASE_COLA)
+    p_trabajar.add_argument("--max_intentos", type=int, default=MAX_INTENTOS_COLA)
+    p_trabajar.add_argument(
+        "--warm_start",
+        action="store_true",
+        help="Iniciar cada ajuste desde el modelo guardado del ticker",
+    )
+    p_trabajar.add_argument(
+        "--materializar",
+        action="store_true",
+        help="Guardar la tabla de pronósticos de cada modelo",
+    )
+
+    sub.add_parser("estado", help="Conteo de trabajos por estado")
+    args = parser.parse_args()
+    activar_instrumentacion()
+    wal = not args.sin_wal
+
+    if args.comando == "encolar":
+        with closing(conectar(args.ruta, wal)) as con:
+            agregados = encolar(
+                con,
+                args.tickers or listar_simbolos() + SERIES_ESPECIALES,
+                args.fecha_inicio,
+                args.fecha_fin,
+                args.reencolar,
+            )
+        print(f"{agregados} trabajos encolados en {args.ruta}")
+    elif args.comando == "trabajar":
+        parametros = dict(
+            ruta=args.ruta,
+            directorio=args.directorio,
+            duracion_lease=args.duracion_lease,
+            max_intentos=args.max_intentos,
+            wal=wal,
+            warm_start=args.warm_start,
+            materializar=args.materializar,
+        )
+        if args.workers <= 1:
+            procesados = trabajar(**parametros)
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                futuros = [
+                    pool.submit(trabajar, **parametros) for _ in range(args.workers)
+                ]
+                procesados = sum(f.result() for f in futuros)
+        print(f"{procesados} trabajos procesados")
+    with closing(conectar(args.ruta, wal)) as con:
+        print(json.dumps(estado_cola(con), indent=2))
+
+
+if __name__ == "__main__":
+    main()
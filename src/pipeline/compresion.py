@@ -0,0 +1,118 @@
+"""Códecs de compresión de los artefactos de modelos y predicciones.
+
+Los códecs disponibles son ``zstd``, ``lz4``, ``gzip`` y ``none``. zstd y
+lz4 se toman de ``pyarrow`` (dependencia del proyecto), de modo que no hace
+falta instalar ``zstandard`` ni ``lz4``; si la compilación de pyarrow no los
+incluye, ``validar_codec`` lo indica con un ValueError.
+
+Los bytes comprimidos llevan el códec en una cabecera para que la carga
+elija el descompresor sin depender de la extensión del archivo::
+
+    cabecera   <4s8sQ>  b"PRCZ", códec, tamaño sin comprimir
+    datos      bytes comprimidos
+
+gzip es la excepción: se escribe como un miembro gzip estándar (que ya se
+identifica por sus bytes mágicos), así los modelos compactos anteriores,
+que son gzip, se siguen leyendo sin cambios.
+
+En Parquet el códec de cada columna queda en los metadatos del archivo y
+``pd.read_parquet`` lo usa al leer; ``opciones_parquet`` solo traduce el
+códec y el nivel a los argumentos de ``to_parquet``/``write_table``.
+"""
+import gzip
+import struct
+from typing import Any, Dict, Optional
+
+import pyarrow as pa
+
+CODECS = ("zstd", "lz4", "gzip", "none")
+# Parquet admite además snappy, el códec por defecto de pyarrow
+CODECS_PARQUET = CODECS + ("snappy",)
+
+MAGIA = b"PRCZ"
+CABECERA = struct.Struct("<4s8sQ")
+MAGIA_GZIP = b"\x1f\x8b"
+NIVEL_GZIP = 6
+
+
+def validar_codec(codec: str, codecs: tuple = CODECS) -> str:
+    """Normaliza el nombre de un códec y comprueba que esté disponible.
+
+    Raises
+    ------
+    ValueError
+        Si el códec no se conoce o pyarrow no lo incluye.
+    """
+    codec = codec.lower()
+    if codec not in codecs:
+        raise ValueError(f"Códec {codec} no soportado. Opciones: {codecs}")
+    if codec != "none" and not pa.Codec.is_available(codec):
+        raise ValueError(f"pyarrow no incluye el códec {codec}")
+    return codec
+
+
+def comprimir(datos: bytes, codec: str = "gzip", nivel: Optional[int] = None) -> bytes:
+    """Comprime ``datos`` y anota el códec para ``descomprimir``.
+
+    Parameters
+    ----------
+    datos : bytes
+        Bytes a comprimir.
+    codec : str, optional
+        ``'zstd'``, ``'lz4'``, ``'gzip'`` o ``'none'``, por defecto gzip.
+    nivel : int, optional
+        Nivel de compresión; por defecto, el del códec.
+
+    Returns
+    -------
+    bytes
+        Datos comprimidos con la cabecera del códec (o un miembro gzip).
+    """
+    codec = validar_codec(codec)
+    if codec == "gzip":
+        return gzip.compress(
+            datos, compresslevel=NIVEL_GZIP if nivel is None else nivel
+        )
+    if codec == "none":
+        cuerpo = bytes(datos)
+    else:
+        cuerpo = pa.Codec(codec, nivel).compress(datos, asbytes=True)
+    return CABECERA.pack(MAGIA, codec.encode(), len(datos)) + cuerpo
+
+
+def codec_de(datos: bytes) -> Optional[str]:
+    """Códec con que se comprimieron ``datos``, o ``None`` si no tienen cabecera."""
+    if datos[:2] == MAGIA_GZIP:
+        return "gzip"
+    if datos[:4] == MAGIA and len(datos) >= CABECERA.size:
+        return CABECERA.unpack_from(datos)[1].rstrip(b"\0").decode()
+    return None
+
+
+def descomprimir(datos: bytes) -> bytes:
+    """Descomprime datos de ``comprimir`` con el códec de su cabecera.
+
+    Raises
+    ------
+    ValueError
+        Si los datos no tienen cabecera de compresión o el códec no está
+        disponible.
+    """
+    codec = codec_de(datos)
+    if codec is None:
+        raise ValueError("Los datos no tienen cabecera de compresión")
+    if codec == "gzip":
+        return gzip.decompress(datos)
+    _, _, tamano = CABECERA.unpack_from(datos)
+    cuerpo = memoryview(datos)[CABECERA.size :]
+    if validar_codec(codec) == "none":
+        return bytes(cuerpo)
+    return pa.Codec(codec).decompress(cuerpo, decompressed_size=tamano, asbytes=True)
+
+
+def opciones_parquet(codec: str, nivel: Optional[int] = None) -> Dict[str, Any]:
+    """Argumentos de compresión para ``to_parquet`` o ``pq.write_table``."""
+    return {
+        "compression": validar_codec(codec, CODECS_PARQUET),
+        "compression_level": nivel,
+    }
@@ -13,6 +13,10 @@ URL_BCRP = "https://estadisticas.bcrp.gob.pe/estadisticas/series/api/"
 SERIE_AFP = "PN01178MM/json"
 SERIE_TC = "PD04639PD/json"
 SERIE_ORO = "PN01654XM/json"
+# Descargas del BCRP: timeout por petición (s), reintentos y conexiones
+TIMEOUT_BCRP = 30
+REINTENTOS_BCRP = 3
+MAX_CONEXIONES_BCRP = 8
 # Diccionario de equivalencias de meses (en mayúsculas)
 EQUIVALENCIAS_MESES = {
     "ENE": "Jan",
@@ -34,14 +38,57 @@ RUTA_AFP = str(DATA_DIR / "afp.csv")
 RUTA_TC = str(DATA_DIR / "tc.csv")
 RUTA_ORO = str(DATA_DIR / "oro.csv")
 
+# Almacén incremental de series del BCRP (particiones Parquet + marcas)
+RUTA_BCRP = str(ROOT_DIR / "src" / "data" / "interim" / "bcrp")
+
+# Caché en disco de los cierres descargados de yfinance
+RUTA_CACHE_YFINANCE = str(ROOT_DIR / "src" / "data" / "interim" / "yfinance")
+TAMANO_LOTE_YFINANCE = 50
+
 RUTA_MODELOS = str(ROOT_DIR / "src/models")
+# Tablas de pronósticos materializadas al entrenar (días hábiles de horizonte)
+RUTA_PRONOSTICOS = str(ROOT_DIR / "src/models/pronosticos")
+HORIZONTE_PRONOSTICO = 504
+# Paquete único con todos los modelos (ver paquete_modelos)
+RUTA_PAQUETE_MODELOS = os.environ.get(
+    "RUTA_PAQUETE_MODELOS", str(ROOT_DIR / "src/models/modelos.paquete")
+)
+# Formato de guardar_modelo: "joblib" (objeto completo) o "compacto" (JSON+gzip)
+FORMATO_MODELO = os.environ.get("FORMATO_MODELO", "joblib")
+# Compresión de los artefactos (zstd, lz4, gzip o none, ver compresion). Si
+# no se indica códec de modelo, gzip para "compacto" y joblib sin comprimir;
+# las predicciones en Parquet usan snappy, el códec por defecto de pyarrow.
+# Sin nivel, se usa el del códec.
+CODEC_MODELO = os.environ.get("CODEC_MODELO") or None
+NIVEL_MODELO = int(os.environ["NIVEL_MODELO"]) if "NIVEL_MODELO" in os.environ else None
+CODEC_PREDICCION = os.environ.get("CODEC_PREDICCION", "snappy")
+NIVEL_PREDICCION = (
+    int(os.environ["NIVEL_PREDICCION"]) if "NIVEL_PREDICCION" in os.environ else None
+)
 RUTA_DATOS = str(ROOT_DIR / "src/data/processed/sp500_stocks.csv")
+# Dataset Parquet particionado por símbolo generado a partir de RUTA_DATOS
+RUTA_DATASET = str(ROOT_DIR / "src/data/processed/sp500_stocks_parquet")
+# Almacén binario (np.memmap) generado a partir de RUTA_DATOS
+RUTA_MEMMAP = str(ROOT_DIR / "src/data/processed/sp500_stocks_memmap")
 RUTA_SP500 = str(ROOT_DIR / "src/data/processed/sp500_index.csv")
 RUTA_AFP_INTEGRA = str(ROOT_DIR / "src/data/raw/Mensuales-20250520-184228.csv")
 RUTA_AFP_PRIMA = str(ROOT_DIR / "src/data/raw/Mensuales-20250520-184341.csv")
 RUTA_AFP_HABITAT = str(ROOT_DIR / "src/data/raw/Mensuales-20250520-184349.csv")
 RUTA_AFP_PROFUTURO = str(ROOT_DIR / "src/data/raw/Mensuales-20250520-184401.csv")
 
+# Memoria máxima (bytes) de la caché de fuentes de datos en cada proceso
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# Cola SQLite de trabajos de entrenamiento: lease (s) e intentos por ticker
+RUTA_COLA = str(ROOT_DIR / "src" / "data" / "interim" / "cola_entrenamiento.sqlite")
+DURACION_LEASE_COLA = 900
+MAX_INTENTOS_COLA = 3
+
+# Registro JSONL de tiempos y recursos por fase del entrenamiento. Apagado
+# por defecto; los scripts de entrenamiento lo activan salvo INSTRUMENTACION=0
+INSTRUMENTACION = os.environ.get("INSTRUMENTACION") == "1"
+RUTA_FASES = os.environ.get("RUTA_FASES", str(ROOT_DIR / "logs" / "fases.jsonl"))
+
 # Configuración de S3
 BUCKET_NAME = os.environ.get("MODELS_BUCKET_NAME", "your-models-bucket")
 MODELS_PREFIX = "models/"
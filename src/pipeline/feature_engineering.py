@@ -1,8 +1,12 @@
 """Feature engineering module for time series data."""
+from typing import Optional
+
 import pandas as pd
 
 
-def get_lags(df: pd.DataFrame, col: str, date_col: str, n: int) -> pd.DataFrame:
+def get_lags(
+    df: pd.DataFrame, col: str, date_col: str, n: int, group_col: Optional[str] = None
+) -> pd.DataFrame:
     """Get the lagged values of a DataFrame.
 
     Parameters
@@ -15,12 +19,21 @@ def get_lags(df: pd.DataFrame, col: str, date_col: str, n: int) -> pd.DataFrame:
         The date column used to order the lags.
     n : int
         The number of lags to create.
+    group_col : str, optional
+        Column identifying independent series (e.g. the symbol). If given,
+        the lags never cross from one series into another.
 
     Returns
     -------
     pd.DataFrame
         A DataFrame with the lagged values.
     """
+    if group_col is not None:
+        df = df.sort_values([group_col, date_col]).reset_index(drop=True)
+        grupos = df.groupby(group_col, sort=False)[col]
+        lags = {f"lag_{col}_{i}": grupos.shift(i) for i in range(1, n + 1)}
+        return pd.concat([df, pd.DataFrame(lags, index=df.index)], axis=1)
+
     df = df.copy()
     df.set_index(date_col, inplace=True)
     df.sort_index(inplace=True)
@@ -30,7 +43,11 @@ def get_lags(df: pd.DataFrame, col: str, date_col: str, n: int) -> pd.DataFrame:
 
 
 def get_rolling_mean(
-    df: pd.DataFrame, col: str, date_col: str, window: int
+    df: pd.DataFrame,
+    col: str,
+    date_col: str,
+    window: int,
+    group_col: Optional[str] = None,
 ) -> pd.DataFrame:
     """Get the rolling mean of a DataFrame.
 
@@ -44,12 +61,25 @@ def get_rolling_mean(
         The date column.
     window : int
         The window size.
+    group_col : str, optional
+        Column identifying independent series (e.g. the symbol). If given,
+        each window only covers rows of the same series.
 
     Returns
     -------
     pd.DataFrame
         A DataFrame with the rolling mean.
     """
+    if group_col is not None:
+        df = df.sort_values([group_col, date_col]).reset_index(drop=True)
+        medias = (
+            df.groupby(group_col, sort=False)[col]
+            .rolling(window=window)
+            .mean()
+            .reset_index(level=0, drop=True)
+        )
+        return df.assign(**{f"rolling_mean_{col}": medias})
+
     df = df.copy()
     df.set_index(date_col, inplace=True)
     df.sort_index(inplace=True)
@@ -1,29 +1,56 @@
 """Script de inferencia para el modelo Prophet."""
 import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
-import joblib
 import matplotlib.pyplot as plt
 import pandas as pd
 from prophet import Prophet
 
-from src.pipeline.config import RUTA_MODELOS
+from src.pipeline.compresion import opciones_parquet
+from src.pipeline.config import (
+    CODEC_PREDICCION,
+    NIVEL_PREDICCION,
+    RUTA_MODELOS,
+    RUTA_PAQUETE_MODELOS,
+)
+from src.pipeline.paquete_modelos import abrir_paquete
+from src.pipeline.pronosticos import COLUMNAS_PRONOSTICO, consultar_pronostico
+from src.pipeline.registro_modelos import ruta_vigente
+from src.pipeline.serializacion import cargar_modelo_archivo
+
+# Cada proceso de realizar_prediccion_lote recibe los modelos serializados;
+# con menos modelos por proceso que este mínimo se predice en serie
+MIN_MODELOS_POR_WORKER = 16
 
 
 def cargar_modelo(tick: str) -> Prophet:
-    """Carga un modelo Prophet guardado."""
-    ruta_modelo = os.path.join(RUTA_MODELOS, f"prophet_{tick}.joblib")
-    if not os.path.exists(ruta_modelo):
-        raise FileNotFoundError(
-            f"No se encontró el modelo para {tick} en {ruta_modelo}"
-        )
+    """Carga la última versión registrada del modelo Prophet de un ticker.
 
-    return joblib.load(ruta_modelo)
+    Si existe el paquete de modelos (RUTA_PAQUETE_MODELOS) y contiene el
+    ticker, el modelo se lee del paquete salvo que el archivo individual sea
+    más reciente.
+    """
+    try:
+        ruta = ruta_vigente(tick, RUTA_MODELOS)
+    except FileNotFoundError:
+        ruta = None
+    paquete = abrir_paquete(RUTA_PAQUETE_MODELOS)
+    if (
+        paquete is not None
+        and tick in paquete
+        and (ruta is None or os.path.getmtime(ruta) <= paquete.mtime)
+    ):
+        return paquete.cargar(tick)
+    if ruta is None:
+        raise FileNotFoundError(f"No se encontró el modelo para {tick}")
+    return cargar_modelo_archivo(ruta)
 
 
 def realizar_prediccion(
-    modelo: Prophet, fecha_inicio: str, fecha_fin: str
+    modelo: Prophet, fecha_inicio: str, fecha_fin: str, tick: Optional[str] = None
 ) -> pd.DataFrame:
     """Realiza la predicción para el período especificado.
 
@@ -31,18 +58,28 @@ def realizar_prediccion(
     ----------
     modelo : Prophet
         Modelo Prophet cargado.
-    df_historico : pd.DataFrame
-        DataFrame con datos históricos.
     fecha_inicio : str
         Fecha de inicio de la predicción.
     fecha_fin : str
         Fecha de fin de la predicción.
+    tick : str, optional
+        Ticker del modelo. Si se indica y su tabla de pronósticos
+        materializada corresponde al modelo y cubre el rango, la predicción
+        se lee de la tabla en lugar de ejecutar ``modelo.predict``. En ambos
+        casos se devuelven solo ``ds``, ``yhat``, ``yhat_lower`` y
+        ``yhat_upper``, de modo que las columnas no dependen de si había
+        tabla.
 
     Returns
     -------
     pd.DataFrame
         DataFrame con las predicciones.
     """
+    if tick is not None:
+        materializado = consultar_pronostico(tick, modelo, fecha_inicio, fecha_fin)
+        if materializado is not None:
+            return materializado
+
     # Calcular el número de días entre fecha_inicio y fecha_fin
     dias = (pd.Timestamp(fecha_fin) - pd.Timestamp(fecha_inicio)).days
 
@@ -63,9 +100,133 @@ def realizar_prediccion(
     # Realizar predicción
     predicciones = modelo.predict(df_futuro)
 
+    if tick is not None:
+        # Las mismas columnas que la tabla materializada
+        predicciones = predicciones.reindex(columns=COLUMNAS_PRONOSTICO)
     return predicciones
 
 
+def fechas_prediccion(
+    ultima_fecha: pd.Timestamp, fecha_inicio: str, fecha_fin: str
+) -> pd.DatetimeIndex:
+    """Días hábiles que ``realizar_prediccion`` predice para un rango.
+
+    Son los de ``make_future_dataframe`` para un modelo cuya historia
+    termina en ``ultima_fecha``, filtrados al rango pedido.
+    """
+    inicio, fin = pd.Timestamp(fecha_inicio), pd.Timestamp(fecha_fin)
+    dias = (fin - inicio).days
+    fechas = pd.date_range(start=ultima_fecha, periods=max(dias, 0) + 1, freq="B")
+    fechas = fechas[fechas > ultima_fecha][:dias]
+    return fechas[(fechas >= inicio) & (fechas <= fin)]
+
+
+def _predecir_grupo(
+    modelos: List[Tuple[str, Prophet]], futuros: Dict[pd.Timestamp, pd.DataFrame]
+) -> Dict[str, pd.DataFrame]:
+    """Predice un grupo de modelos con los futuros ya construidos."""
+    predicciones = {}
+    for tick, modelo in modelos:
+        futuro = futuros[modelo.history_dates.max()]
+        if len(futuro):
+            # Sin muestras de incertidumbre no hay yhat_lower ni yhat_upper
+            predicciones[tick] = modelo.predict(futuro).reindex(
+                columns=COLUMNAS_PRONOSTICO
+            )
+    return predicciones
+
+
+def realizar_prediccion_lote(
+    modelos: Dict[str, Prophet],
+    fecha_inicio: str,
+    fecha_fin: str,
+    formato: str = "largo",
+    workers: int = 1,
+    columna: str = "yhat",
+) -> pd.DataFrame:
+    """Predice el mismo período con muchos modelos.
+
+    Cada modelo da las mismas fechas que ``realizar_prediccion``, pero el
+    DataFrame de fechas futuras se construye una sola vez por última fecha
+    de entrenamiento (normalmente una para todo el universo) y los modelos
+    se reparten entre ``workers`` procesos. Enviar un modelo a otro proceso
+    cuesta serializarlo, así que cada proceso recibe al menos
+    MIN_MODELOS_POR_WORKER modelos y con menos se predice en serie. Los
+    modelos con tabla de pronósticos materializada vigente se responden
+    desde la tabla.
+
+    Parameters
+    ----------
+    modelos : Dict[str, Prophet]
+        Ticker → modelo Prophet cargado.
+    fecha_inicio : str
+        Fecha de inicio de la predicción.
+    fecha_fin : str
+        Fecha de fin de la predicción.
+    formato : str, optional
+        ``'largo'`` (por defecto): columnas ``tick``, ``ds``, ``yhat``,
+        ``yhat_lower`` y ``yhat_upper``, en el orden de ``modelos``.
+        ``'ancho'``: una columna por ticker indexada por ``ds``.
+    workers : int, optional
+        Procesos en paralelo como máximo, por defecto 1 (en el proceso
+        actual).
+    columna : str, optional
+        Valor de las columnas del formato ancho, por defecto ``'yhat'``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Predicciones de todos los modelos.
+
+    Raises
+    ------
+    ValueError
+        Si el formato no es ``'largo'`` ni ``'ancho'``.
+    """
+    if formato not in ("largo", "ancho"):
+        raise ValueError(f"Formato {formato} no soportado. Opciones: largo, ancho")
+
+    predicciones: Dict[str, pd.DataFrame] = {}
+    pendientes = []
+    for tick, modelo in modelos.items():
+        materializado = consultar_pronostico(tick, modelo, fecha_inicio, fecha_fin)
+        if materializado is not None:
+            predicciones[tick] = materializado
+        else:
+            pendientes.append((tick, modelo))
+
+    futuros = {}
+    for _, modelo in pendientes:
+        ultima = modelo.history_dates.max()
+        if ultima not in futuros:
+            futuros[ultima] = pd.DataFrame(
+                {"ds": fechas_prediccion(ultima, fecha_inicio, fecha_fin)}
+            )
+
+    workers = min(workers, len(pendientes) // MIN_MODELOS_POR_WORKER)
+    if workers > 1:
+        # Reparto intercalado: cada proceso recibe un grupo de modelos
+        grupos = [pendientes[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for parcial in pool.map(_predecir_grupo, grupos, [futuros] * workers):
+                predicciones.update(parcial)
+    else:
+        predicciones.update(_predecir_grupo(pendientes, futuros))
+
+    partes = [
+        predicciones[tick].assign(tick=tick) for tick in modelos if tick in predicciones
+    ]
+    largo = (
+        pd.concat(partes, ignore_index=True)
+        if partes
+        else pd.DataFrame(columns=["tick", *COLUMNAS_PRONOSTICO])
+    )[["tick", *COLUMNAS_PRONOSTICO]]
+    if formato == "largo":
+        return largo
+    ancho = largo.pivot(index="ds", columns="tick", values=columna)
+    return ancho[[tick for tick in modelos if tick in ancho.columns]]
+
+
 def visualizar_prediccion(predicciones, tick, fecha_inicio, fecha_fin, directorio=None):
     """
     Guarda la visualización de la predicción en el directorio especificado.
@@ -102,9 +263,17 @@ def visualizar_prediccion(predicciones, tick, fecha_inicio, fecha_fin, directori
     plt.close()
 
 
-def guardar_prediccion(predicciones, tick, fecha_inicio, fecha_fin, directorio=None):
+def guardar_prediccion(
+    predicciones,
+    tick,
+    fecha_inicio,
+    fecha_fin,
+    directorio=None,
+    codec=None,
+    nivel=None,
+):
     """
-    Guarda las predicciones en un archivo CSV en el directorio especificado.
+    Guarda las predicciones en un archivo Parquet en el directorio especificado.
 
     Args
     ----
@@ -113,13 +282,23 @@ def guardar_prediccion(predicciones, tick, fecha_inicio, fecha_fin, directorio=N
         fecha_inicio: Fecha de inicio (str).
         fecha_fin: Fecha de fin (str).
         directorio: Carpeta del archivo. Si es None, directorio actual.
+        codec: Códec de compresión de Parquet (``"zstd"``, ``"lz4"``,
+            ``"gzip"``, ``"snappy"`` o ``"none"``). Si es None, usa
+            CODEC_PREDICCION. Queda en los metadatos del archivo, de modo que
+            ``pd.read_parquet`` no necesita conocerlo.
+        nivel: Nivel de compresión. Si es None, usa NIVEL_PREDICCION.
     """
     if directorio is None:
         directorio = os.getcwd()
     os.makedirs(directorio, exist_ok=True)
     nombre_archivo = f"prediccion_{tick}_{fecha_inicio}_{fecha_fin}.parquet"
     ruta = os.path.join(directorio, nombre_archivo)
-    predicciones.to_parquet(ruta)
+    predicciones.to_parquet(
+        ruta,
+        **opciones_parquet(
+            codec or CODEC_PREDICCION, NIVEL_PREDICCION if nivel is None else nivel
+        ),
+    )
 
 
 def main():
@@ -161,7 +340,9 @@ def main():
 
     # Realizar predicción
     print("Realizando predicción...")
-    predicciones = realizar_prediccion(modelo, args.fecha_inicio, args.fecha_fin)
+    predicciones = realizar_prediccion(
+        modelo, args.fecha_inicio, args.fecha_fin, args.tick
+    )
 
     # Visualizar predicción
     print("Generando visualización...")
@@ -0,0 +1,226 @@
+"""Medición de tiempos y recursos por fase del pipeline de entrenamiento.
+
+Cada fase instrumentada (``cargar_datos``, ``fit``, ``metricas``, ``guardar``
+y el ``total`` por ticker) escribe un registro JSON por línea en
+``RUTA_FASES``::
+
+    {"fecha": "...", "pid": 123, "ticker": "AAPL", "fase": "fit",
+     "segundos": 1.82, "cpu_segundos": 1.79, "rss_pico_proceso_mb": 412.5,
+     "rss_pico_delta_mb": 35.1, "ok": true}
+
+``rss_pico_proceso_mb`` es el pico de memoria del proceso desde que inició
+(``ru_maxrss``), no el de la fase; ``rss_pico_delta_mb`` es cuánto creció ese
+pico durante la fase, es decir, la memoria que la fase pidió por encima de
+todo lo anterior.
+
+La medición está apagada por defecto (ver ``INSTRUMENTACION``) para que la
+API no escriba en cada solicitud; los scripts de entrenamiento la encienden
+con ``activar_instrumentacion``. El ticker se toma del contexto
+(``contexto_ticker``), de modo que las funciones internas no necesitan
+recibirlo. El reporte se obtiene con::
+
+    python -m src.pipeline.instrumentacion --top 10
+"""
+import argparse
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+import pandas as pd
+
+from src.pipeline.config import INSTRUMENTACION, RUTA_FASES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_ACTIVA = INSTRUMENTACION
+
+_TICKER: contextvars.ContextVar = contextvars.ContextVar("ticker", default=None)
+
+PERCENTILES = [0.5, 0.9, 0.99]
+
+
+def _rss_pico_mb() -> float:
+    """Pico de memoria residente del proceso en MiB (0 si no disponible)."""
+    if resource is None:
+        return 0.0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KiB y macOS bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def activar_instrumentacion() -> None:
+    """Activa la medición en este proceso y en los procesos que cree.
+
+    No hace nada si se desactivó explícitamente con ``INSTRUMENTACION=0``.
+    """
+    global _ACTIVA
+    if os.environ.get("INSTRUMENTACION") == "0":
+        return
+    _ACTIVA = True
+    # Los workers creados con spawn leen la configuración del entorno
+    os.environ["INSTRUMENTACION"] = "1"
+
+
+@contextmanager
+def contexto_ticker(ticker: str) -> Iterator[None]:
+    """Asocia las fases medidas dentro del bloque a ``ticker``."""
+    token = _TICKER.set(ticker)
+    try:
+        yield
+    finally:
+        _TICKER.reset(token)
+
+
+def _escribir(registro: Dict[str, Any], ruta: str) -> None:
+    """Anexa un registro al archivo JSONL.
+
+    Un error de escritura solo se registra en el log: la medición no debe
+    hacer fallar la fase ni ocultar su excepción.
+    """
+    try:
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        # Una sola escritura por línea en modo append: las líneas de procesos
+        # distintos no se mezclan
+        with open(ruta, "a") as f:
+            f.write(json.dumps(registro, default=str) + "\n")
+    except (OSError, TypeError, ValueError) as exc:
+        logger.warning(f"No se pudo registrar la fase en {ruta}: {exc}")
+
+
+@contextmanager
+def medir_fase(fase: str, ticker: Optional[str] = None, **extra: Any) -> Iterator[None]:
+    """Mide tiempo de pared, tiempo de CPU y crecimiento del pico de RSS.
+
+    Parameters
+    ----------
+    fase : str
+        Nombre de la fase (por ejemplo, ``'fit'``).
+    ticker : str, optional
+        Ticker de la fase; por defecto el de ``contexto_ticker``.
+    **extra
+        Campos adicionales del registro (por ejemplo, ``filas``).
+    """
+    if not _ACTIVA:
+        yield
+        return
+    rss_inicio = _rss_pico_mb()
+    pared = time.perf_counter()
+    cpu = time.process_time()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        rss_fin = _rss_pico_mb()
+        _escribir(
+            {
+                "fecha": datetime.now().isoformat(timespec="milliseconds"),
+                "pid": os.getpid(),
+                "ticker": ticker or _TICKER.get(),
+                "fase": fase,
+                "segundos": round(time.perf_counter() - pared, 6),
+                "cpu_segundos": round(time.process_time() - cpu, 6),
+                "rss_pico_proceso_mb": round(rss_fin, 1),
+                "rss_pico_delta_mb": round(rss_fin - rss_inicio, 1),
+                "ok": ok,
+                **extra,
+            },
+            RUTA_FASES,
+        )
+
+
+def leer_registros(ruta: str = RUTA_FASES) -> pd.DataFrame:
+    """Lee los registros de fases como DataFrame.
+
+    Raises
+    ------
+    FileNotFoundError
+        Si no hay registros en ``ruta``.
+    """
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No hay registros de fases en {ruta}")
+    return pd.read_json(ruta, lines=True)
+
+
+def reporte_fases(ruta: str = RUTA_FASES, top: int = 10) -> Dict[str, pd.DataFrame]:
+    """Agrega los registros en percentiles por fase y tickers más lentos.
+
+    Parameters
+    ----------
+    ruta : str, optional
+        Archivo JSONL de registros, por defecto RUTA_FASES.
+    top : int, optional
+        Tickers más lentos a listar, por defecto 10.
+
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        ``fases``: conteo, total y percentiles de segundos, CPU y RSS por
+        fase; ``lentos``: tickers con más segundos sumando sus fases
+        ``total`` (o todas las fases si no se midió ``total``), con la fase
+        que más tiempo les tomó.
+    """
+    df = leer_registros(ruta)
+    por_fase = df.groupby("fase")
+    fases = pd.concat(
+        {
+            "n": por_fase.size(),
+            "errores": por_fase["ok"].apply(lambda s: int((~s.astype(bool)).sum())),
+            "segundos_total": por_fase["segundos"].sum(),
+            **{
+                f"segundos_p{int(p * 100)}": por_fase["segundos"].quantile(p)
+                for p in PERCENTILES
+            },
+            "segundos_max": por_fase["segundos"].max(),
+            "cpu_p50": por_fase["cpu_segundos"].quantile(0.5),
+            "rss_pico_proceso_mb_max": por_fase["rss_pico_proceso_mb"].max(),
+            "rss_pico_delta_mb_max": por_fase["rss_pico_delta_mb"].max(),
+        },
+        axis=1,
+    ).sort_values("segundos_total", ascending=False)
+
+    con_ticker = df.dropna(subset=["ticker"])
+    totales = con_ticker[con_ticker["fase"] == "total"]
+    if totales.empty:
+        totales = con_ticker
+    parciales = con_ticker[con_ticker["fase"] != "total"]
+    lentos = totales.groupby("ticker")["segundos"].sum().rename("segundos").to_frame()
+    if not parciales.empty:
+        por_ticker_fase = parciales.groupby(["ticker", "fase"])["segundos"].sum()
+        lentos["fase_mas_lenta"] = por_ticker_fase.groupby("ticker").idxmax().str[1]
+    lentos = lentos.sort_values("segundos", ascending=False).head(top)
+    return {"fases": fases, "lentos": lentos}
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Reporte de tiempos y recursos por fase del entrenamiento."
+    )
+    parser.add_argument(
+        "--ruta", type=str, default=RUTA_FASES, help="Archivo JSONL de registros"
+    )
+    parser.add_argument("--top", type=int, default=10, help="Tickers más lentos")
+    args = parser.parse_args()
+
+    reporte = reporte_fases(args.ruta, args.top)
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print("Fases:")
+        print(reporte["fases"].round(3).to_string())
+        print(f"\nTickers más lentos (top {args.top}):")
+        print(reporte["lentos"].round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Manifiesto de entrenamiento para reentrenar solo los modelos desactualizados.
+
+El manifiesto vive junto a los modelos (``RUTA_MODELOS``) y guarda, por
+ticker, la huella de los datos con que se entrenó, los hiperparámetros y la
+ruta del modelo::
+
+    {
+      "AAPL": {
+        "huella": "9f2c...",
+        "hiperparametros": {"cambio_punto": 0.05, ...},
+        "ruta_modelo": ".../prophet_AAPL.joblib",
+        "fecha": "2025-03-07T10:15:00"
+      }
+    }
+
+Se reescribe de forma atómica después de cada ticker, por lo que una corrida
+interrumpida se retoma sin repetir los modelos ya entrenados.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from src.pipeline.config import RUTA_MODELOS
+
+ARCHIVO_MANIFIESTO = "manifiesto_entrenamiento.json"
+
+
+def huella_datos(df: pd.DataFrame) -> str:
+    """Calcula un hash del contenido de la serie de entrenamiento.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame con las columnas ``ds`` y ``y``.
+
+    Returns
+    -------
+    str
+        SHA-256 en hexadecimal; no depende del índice del DataFrame.
+    """
+    hashes = pd.util.hash_pandas_object(df[["ds", "y"]], index=False)
+    return hashlib.sha256(hashes.to_numpy().tobytes()).hexdigest()
+
+
+def leer_manifiesto(directorio: str = RUTA_MODELOS) -> Dict[str, Dict[str, Any]]:
+    """Lee el manifiesto de entrenamiento (vacío si no existe).
+
+    Parameters
+    ----------
+    directorio : str, optional
+        Carpeta de los modelos, por defecto RUTA_MODELOS.
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Ticker → entrada del manifiesto.
+    """
+    ruta = os.path.join(directorio, ARCHIVO_MANIFIESTO)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta) as f:
+        return json.load(f)
+
+
+def registrar_entrenamiento(
+    tick: str,
+    huella: str,
+    hiperparametros: Dict[str, Any],
+    ruta_modelo: str,
+    directorio: str = RUTA_MODELOS,
+) -> None:
+    """Registra un modelo entrenado en el manifiesto de forma atómica.
+
+    Parameters
+    ----------
+    tick : str
+        Símbolo del modelo.
+    huella : str
+        Huella de los datos de entrenamiento (ver ``huella_datos``).
+    hiperparametros : Dict[str, Any]
+        Hiperparámetros usados en el ajuste.
+    ruta_modelo : str
+        Ruta del modelo guardado.
+    directorio : str, optional
+        Carpeta de los modelos, por defecto RUTA_MODELOS.
+    """
+    manifiesto = leer_manifiesto(directorio)
+    manifiesto[tick] = {
+        "huella": huella,
+        "hiperparametros": hiperparametros,
+        "ruta_modelo": ruta_modelo,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+    }
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, ARCHIVO_MANIFIESTO)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w") as f:
+        json.dump(manifiesto, f, indent=2, sort_keys=True)
+    os.replace(temporal, ruta)
+
+
+def esta_actualizado(
+    entrada: Optional[Dict[str, Any]], huella: str, hiperparametros: Dict[str, Any]
+) -> bool:
+    """Indica si un modelo ya entrenado sigue siendo válido.
+
+    Parameters
+    ----------
+    entrada : Dict[str, Any], optional
+        Entrada del manifiesto para el ticker, o ``None`` si no existe.
+    huella : str
+        Huella de los datos actuales.
+    hiperparametros : Dict[str, Any]
+        Hiperparámetros con los que se entrenaría ahora.
+
+    Returns
+    -------
+    bool
+        `True` si los datos y los hiperparámetros no cambiaron y el modelo
+        sigue en disco.
+    """
+    return (
+        entrada is not None
+        and entrada["huella"] == huella
+        and entrada["hiperparametros"] == hiperparametros
+        and os.path.exists(entrada["ruta_modelo"])
+    )
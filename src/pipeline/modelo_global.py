@@ -0,0 +1,337 @@
+"""Modelo global de LightGBM entrenado una sola vez con todos los tickers.
+
+En lugar de un Prophet por ticker se entrena un único modelo de gradient
+boosting sobre las observaciones de todos los símbolos. Cada serie se
+escala por su media para que los precios de distinta magnitud compartan
+patrones, y las características son:
+
+* ``lag_y_esc_1`` … ``lag_y_esc_n`` – rezagos de la serie escalada.
+* ``rolling_mean_lag_y_esc_1`` – media móvil de los rezagos.
+* ``dia_semana`` – día de la semana de la fecha a predecir.
+* ``simbolo`` – código del ticker (característica categórica).
+
+El objetivo es la variación escalada respecto del día anterior. La
+predicción es recursiva: en cada paso se predicen todos los tickers con una
+sola llamada a ``Booster.predict`` y el resultado alimenta los rezagos del
+paso siguiente.
+"""
+import argparse
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from src.pipeline.config import MAX_DATE, MIN_DATE, RUTA_MODELOS
+from src.pipeline.feature_engineering import get_lags, get_rolling_mean
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_BOOSTER = "global_lgbm.txt"
+ARCHIVO_ESTADO = "global_lgbm.npz"
+
+PARAMETROS_LGBM: Dict[str, Any] = {
+    "objective": "regression",
+    "learning_rate": 0.05,
+    "num_leaves": 31,
+    "min_data_in_leaf": 50,
+    "verbose": -1,
+}
+
+
+def _columnas(n_lags: int) -> List[str]:
+    """Nombres de las características en el orden del modelo."""
+    return [f"lag_y_esc_{i}" for i in range(1, n_lags + 1)] + [
+        "rolling_mean_lag_y_esc_1",
+        "dia_semana",
+        "simbolo",
+    ]
+
+
+class ModeloGlobal:
+    """Modelo global entrenado y estado necesario para predecir.
+
+    Parameters
+    ----------
+    booster : lgb.Booster
+        Modelo de LightGBM entrenado.
+    simbolos : List[str]
+        Tickers del modelo; su posición es el código de ``simbolo``.
+    escalas : np.ndarray
+        Media de cada ticker usada para escalar.
+    ultimos : np.ndarray
+        Últimos ``n_lags`` valores escalados de cada ticker (tickers × lags),
+        del más antiguo al más reciente.
+    ultima_fecha : np.ndarray
+        Última fecha observada de cada ticker (``datetime64[D]``).
+    ventana : int
+        Ventana de la media móvil.
+    """
+
+    def __init__(
+        self,
+        booster: lgb.Booster,
+        simbolos: List[str],
+        escalas: np.ndarray,
+        ultimos: np.ndarray,
+        ultima_fecha: np.ndarray,
+        ventana: int,
+    ):
+        self.booster = booster
+        self.simbolos = list(simbolos)
+        self.escalas = escalas
+        self.ultimos = ultimos
+        self.ultima_fecha = ultima_fecha.astype("datetime64[D]")
+        self.ventana = ventana
+
+    @property
+    def n_lags(self) -> int:
+        """Número de rezagos del modelo."""
+        return self.ultimos.shape[1]
+
+    def predecir(self, horizonte: int, formato: str = "largo") -> pd.DataFrame:
+        """Predice ``horizonte`` días hábiles para todos los tickers.
+
+        Parameters
+        ----------
+        horizonte : int
+            Días hábiles a predecir después de la última fecha de cada ticker.
+        formato : str, optional
+            ``'largo'`` (columnas ``tick``, ``ds``, ``yhat``) o ``'ancho'``
+            (panel fechas × tickers), por defecto ``'largo'``.
+
+        Returns
+        -------
+        pd.DataFrame
+            Predicciones en la escala original.
+
+        Raises
+        ------
+        ValueError
+            Si el formato no es válido.
+        """
+        if formato not in ("largo", "ancho"):
+            raise ValueError(f"Formato inválido: {formato}. Use 'largo' o 'ancho'")
+        n = len(self.simbolos)
+        estado = self.ultimos.copy()
+        codigos = np.arange(n, dtype=np.float64)
+        predicciones = np.empty((horizonte, n))
+        fechas = np.empty((horizonte, n), dtype="datetime64[D]")
+
+        for paso in range(horizonte):
+            fechas[paso] = np.busday_offset(
+                self.ultima_fecha, paso + 1, roll="backward"
+            )
+            dia_semana = (fechas[paso].astype(np.int64) + 3) % 7
+            X = np.column_stack(
+                [
+                    estado[:, ::-1],
+                    estado[:, -self.ventana :].mean(axis=1),
+                    dia_semana,
+                    codigos,
+                ]
+            )
+            siguiente = estado[:, -1] + self.booster.predict(X)
+            predicciones[paso] = siguiente
+            estado = np.column_stack([estado[:, 1:], siguiente])
+
+        largo = pd.DataFrame(
+            {
+                "tick": np.tile(self.simbolos, horizonte),
+                "ds": fechas.ravel().astype("datetime64[ns]"),
+                "yhat": (predicciones * self.escalas).ravel(),
+            }
+        )
+        if formato == "largo":
+            return largo.sort_values(["tick", "ds"], ignore_index=True)
+        panel = largo.pivot(index="ds", columns="tick", values="yhat")
+        return panel.reindex(columns=self.simbolos)
+
+
+def entrenar_modelo_global(
+    largo: pd.DataFrame,
+    n_lags: int = 10,
+    ventana: int = 5,
+    num_rondas: int = 300,
+    parametros: Optional[Dict[str, Any]] = None,
+) -> ModeloGlobal:
+    """Entrena un único modelo de LightGBM con todos los tickers.
+
+    Parameters
+    ----------
+    largo : pd.DataFrame
+        Datos en formato largo con las columnas ``tick``, ``ds`` y ``y`` (ver
+        ``cargar_datos_multi``).
+    n_lags : int, optional
+        Rezagos de la serie, por defecto 10.
+    ventana : int, optional
+        Ventana de la media móvil (no mayor que ``n_lags``), por defecto 5.
+    num_rondas : int, optional
+        Rondas de boosting, por defecto 300.
+    parametros : Dict[str, Any], optional
+        Parámetros de LightGBM, por defecto PARAMETROS_LGBM.
+
+    Returns
+    -------
+    ModeloGlobal
+        Modelo entrenado.
+
+    Raises
+    ------
+    ValueError
+        Si ``ventana`` es mayor que ``n_lags`` o ningún ticker tiene datos
+        suficientes.
+    """
+    if ventana > n_lags:
+        raise ValueError("La ventana no puede ser mayor que el número de rezagos")
+    largo = largo.dropna(subset=["y"])
+    conteos = largo.groupby("tick")["y"].size()
+    simbolos = sorted(conteos.index[conteos > n_lags + 1])
+    descartados = sorted(set(conteos.index) - set(simbolos))
+    if descartados:
+        logger.warning(f"Tickers con datos insuficientes: {descartados}")
+    if not simbolos:
+        raise ValueError("Ningún ticker tiene datos suficientes")
+    largo = largo[largo["tick"].isin(simbolos)]
+
+    escalas = largo.groupby("tick")["y"].mean().reindex(simbolos).to_numpy()
+    escalas = np.where(escalas != 0, np.abs(escalas), 1.0)
+    df = largo[["tick", "ds"]].assign(
+        y_esc=largo["y"].to_numpy()
+        / escalas[pd.Categorical(largo["tick"], categories=simbolos).codes]
+    )
+    df = get_lags(df, "y_esc", "ds", n_lags, group_col="tick")
+    df = get_rolling_mean(df, "lag_y_esc_1", "ds", ventana, group_col="tick")
+    df["dia_semana"] = df["ds"].dt.dayofweek
+    df["simbolo"] = pd.Categorical(df["tick"], categories=simbolos).codes
+
+    # El estado para predecir son los últimos n_lags valores de cada ticker
+    ultimos = (
+        df.groupby("tick", sort=True)["y_esc"]
+        .apply(lambda s: s.to_numpy()[-n_lags:])
+        .reindex(simbolos)
+    )
+    ultima_fecha = df.groupby("tick", sort=True)["ds"].max().reindex(simbolos)
+
+    columnas = _columnas(n_lags)
+    df = df.dropna(subset=columnas)
+    objetivo = df["y_esc"] - df["lag_y_esc_1"]
+    logger.info(
+        f"Entrenando modelo global con {len(df)} filas de {len(simbolos)} tickers"
+    )
+    datos = lgb.Dataset(
+        df[columnas].to_numpy(dtype=np.float64),
+        label=objetivo.to_numpy(),
+        feature_name=columnas,
+        categorical_feature=[len(columnas) - 1],
+        free_raw_data=True,
+    )
+    booster = lgb.train(
+        parametros or PARAMETROS_LGBM, datos, num_boost_round=num_rondas
+    )
+
+    return ModeloGlobal(
+        booster,
+        simbolos,
+        escalas,
+        np.vstack(ultimos.to_numpy()),
+        ultima_fecha.to_numpy().astype("datetime64[D]"),
+        ventana,
+    )
+
+
+def guardar_modelo_global(
+    modelo: ModeloGlobal, directorio: Optional[str] = None
+) -> str:
+    """Guarda el modelo global y su estado.
+
+    Parameters
+    ----------
+    modelo : ModeloGlobal
+        Modelo entrenado.
+    directorio : str, optional
+        Carpeta destino, por defecto RUTA_MODELOS.
+
+    Returns
+    -------
+    str
+        Ruta del archivo del booster.
+    """
+    directorio = directorio or RUTA_MODELOS
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, ARCHIVO_BOOSTER)
+    modelo.booster.save_model(ruta)
+    np.savez(
+        os.path.join(directorio, ARCHIVO_ESTADO),
+        simbolos=np.array(modelo.simbolos, dtype=str),
+        escalas=modelo.escalas,
+        ultimos=modelo.ultimos,
+        ultima_fecha=modelo.ultima_fecha,
+        ventana=np.array(modelo.ventana),
+    )
+    return ruta
+
+
+def cargar_modelo_global(directorio: Optional[str] = None) -> ModeloGlobal:
+    """Carga un modelo guardado con ``guardar_modelo_global``.
+
+    Raises
+    ------
+    FileNotFoundError
+        Si no existe el modelo en el directorio.
+    """
+    directorio = directorio or RUTA_MODELOS
+    ruta = os.path.join(directorio, ARCHIVO_BOOSTER)
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No se encontró el modelo global en {ruta}")
+    with np.load(os.path.join(directorio, ARCHIVO_ESTADO), allow_pickle=False) as e:
+        return ModeloGlobal(
+            lgb.Booster(model_file=ruta),
+            e["simbolos"].tolist(),
+            e["escalas"],
+            e["ultimos"],
+            e["ultima_fecha"],
+            int(e["ventana"]),
+        )
+
+
+def main():
+    """Función principal del script."""
+    from src.pipeline.almacenamiento import listar_simbolos
+    from src.pipeline.train import cargar_datos_multi
+
+    parser = argparse.ArgumentParser(
+        description="Entrenar el modelo global de LightGBM con todos los tickers."
+    )
+    parser.add_argument(
+        "--fecha_inicio", type=str, default=MIN_DATE, help="Fecha de inicio"
+    )
+    parser.add_argument(
+        "--fecha_corte", type=str, default=MAX_DATE, help="Fecha de corte"
+    )
+    parser.add_argument("--n_lags", type=int, default=10, help="Rezagos")
+    parser.add_argument("--ventana", type=int, default=5, help="Ventana móvil")
+    parser.add_argument(
+        "--num_rondas", type=int, default=300, help="Rondas de boosting"
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Carpeta de modelos"
+    )
+    args = parser.parse_args()
+
+    largo = cargar_datos_multi(listar_simbolos(), args.fecha_inicio, args.fecha_corte)
+    inicio = time.perf_counter()
+    modelo = entrenar_modelo_global(largo, args.n_lags, args.ventana, args.num_rondas)
+    segundos = time.perf_counter() - inicio
+    ruta = guardar_modelo_global(modelo, args.directorio)
+    print(
+        f"Modelo global: {len(modelo.simbolos)} tickers entrenados en "
+        f"{segundos:.1f}s ({ruta})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Paquete único de modelos con carga perezosa mediante ``mmap``.
+
+Cientos de archivos pequeños en ``RUTA_MODELOS`` implican cientos de
+aperturas y se despliegan mal en Lambda o en contenedores. El paquete reúne
+todos los modelos (en el formato compacto de ``serializacion``) en un solo
+archivo::
+
+    cabecera   <4sHHQ>  b"PRPQ", versión, reservado, número de modelos
+    índice     n × <32sQQ>  ticker, desplazamiento, longitud (ordenado)
+    datos      modelos serializados, uno tras otro
+
+Abrir el paquete solo lee la cabecera: el archivo se proyecta con ``mmap``
+y cada búsqueda es binaria sobre el índice, por lo que el costo no depende
+del número de modelos y solo se tocan las páginas de los modelos usados.
+
+Uso::
+
+    python -m src.pipeline.paquete_modelos empaquetar
+    python -m src.pipeline.paquete_modelos listar
+"""
+import argparse
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+
+from prophet import Prophet
+
+from src.pipeline.config import RUTA_MODELOS, RUTA_PAQUETE_MODELOS
+from src.pipeline.registro_modelos import indexar_directorio, listar_modelos
+from src.pipeline.serializacion import (
+    EXTENSION_COMPACTO,
+    cargar_modelo_archivo,
+    deserializar_modelo,
+    serializar_modelo,
+)
+
+MAGIA = b"PRPQ"
+VERSION_PAQUETE = 1
+CABECERA = struct.Struct("<4sHHQ")
+ENTRADA = struct.Struct("<32sQQ")
+LARGO_TICKER = 32
+
+
+class PaqueteModelos:
+    """Paquete de modelos abierto en modo lectura.
+
+    Parameters
+    ----------
+    ruta : str
+        Archivo del paquete.
+
+    Raises
+    ------
+    ValueError
+        Si el archivo no es un paquete de modelos o su versión no se conoce.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        with open(ruta, "rb") as f:
+            self.mtime = os.fstat(f.fileno()).st_mtime
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < CABECERA.size:
+            self._mm.close()
+            raise ValueError(f"{ruta} no es un paquete de modelos")
+        magia, version, _, self._n = CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA or version != VERSION_PAQUETE:
+            self._mm.close()
+            raise ValueError(f"{ruta} no es un paquete de modelos v{VERSION_PAQUETE}")
+
+    def __enter__(self) -> "PaqueteModelos":
+        """Devuelve el paquete para usarlo en un bloque ``with``."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Cierra el paquete al salir del bloque ``with``."""
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """Libera la proyección del archivo."""
+        self._mm.close()
+
+    def __len__(self) -> int:
+        """Número de modelos del paquete."""
+        return self._n
+
+    def _entrada(self, i: int) -> Tuple[bytes, int, int]:
+        nombre, desplazamiento, largo = ENTRADA.unpack_from(
+            self._mm, CABECERA.size + i * ENTRADA.size
+        )
+        return nombre.rstrip(b"\0"), desplazamiento, largo
+
+    def _buscar(self, tick: str) -> Optional[Tuple[int, int]]:
+        """Búsqueda binaria del ticker en el índice."""
+        clave = tick.encode("utf-8")
+        bajo, alto = 0, self._n
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            nombre, desplazamiento, largo = self._entrada(medio)
+            if nombre == clave:
+                return desplazamiento, largo
+            if nombre < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return None
+
+    def __contains__(self, tick: str) -> bool:
+        """Indica si el ticker está en el paquete."""
+        return self._buscar(tick) is not None
+
+    def tickers(self) -> Iterator[str]:
+        """Tickers del paquete en orden."""
+        for i in range(self._n):
+            yield self._entrada(i)[0].decode("utf-8")
+
+    def bytes_modelo(self, tick: str) -> bytes:
+        """Modelo serializado de un ticker.
+
+        Raises
+        ------
+        KeyError
+            Si el ticker no está en el paquete.
+        """
+        posicion = self._buscar(tick)
+        if posicion is None:
+            raise KeyError(f"{tick} no está en el paquete {self.ruta}")
+        desplazamiento, largo = posicion
+        return self._mm[desplazamiento : desplazamiento + largo]
+
+    def cargar(self, tick: str) -> Prophet:
+        """Carga el modelo de un ticker (ver ``bytes_modelo``)."""
+        return deserializar_modelo(self.bytes_modelo(tick))
+
+
+def escribir_paquete(modelos: Dict[str, bytes], ruta: str) -> str:
+    """Escribe un paquete con modelos ya serializados.
+
+    Parameters
+    ----------
+    modelos : Dict[str, bytes]
+        Ticker → modelo serializado con ``serializar_modelo``.
+    ruta : str
+        Archivo destino; se reemplaza de forma atómica.
+
+    Returns
+    -------
+    str
+        Ruta del paquete.
+
+    Raises
+    ------
+    ValueError
+        Si algún ticker supera ``LARGO_TICKER`` bytes.
+    """
+    claves = sorted((tick.encode("utf-8"), tick) for tick in modelos)
+    for clave, tick in claves:
+        if len(clave) > LARGO_TICKER:
+            raise ValueError(f"Ticker demasiado largo para el índice: {tick}")
+
+    desplazamiento = CABECERA.size + len(claves) * ENTRADA.size
+    indice = []
+    for clave, tick in claves:
+        indice.append(ENTRADA.pack(clave, desplazamiento, len(modelos[tick])))
+        desplazamiento += len(modelos[tick])
+
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, VERSION_PAQUETE, 0, len(claves)))
+        f.writelines(indice)
+        for _, tick in claves:
+            f.write(modelos[tick])
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def empaquetar_modelos(
+    directorio: str = RUTA_MODELOS, ruta: str = RUTA_PAQUETE_MODELOS
+) -> str:
+    """Empaqueta la última versión registrada de cada modelo del directorio.
+
+    Los modelos que ya están en formato compacto se copian tal cual; los
+    demás se convierten.
+
+    Returns
+    -------
+    str
+        Ruta del paquete.
+    """
+    indexar_directorio(directorio)
+    modelos = {}
+    for tick, ruta_modelo in listar_modelos(directorio)[["ticker", "ruta"]].itertuples(
+        index=False
+    ):
+        if not os.path.exists(ruta_modelo):
+            continue
+        if ruta_modelo.endswith(EXTENSION_COMPACTO):
+            with open(ruta_modelo, "rb") as f:
+                modelos[tick] = f.read()
+        else:
+            modelos[tick] = serializar_modelo(cargar_modelo_archivo(ruta_modelo))
+    return escribir_paquete(modelos, ruta)
+
+
+_PAQUETES: Dict[str, PaqueteModelos] = {}
+
+
+def abrir_paquete(ruta: str = RUTA_PAQUETE_MODELOS) -> Optional[PaqueteModelos]:
+    """Paquete abierto del proceso, o ``None`` si no existe.
+
+    Se abre una vez por proceso y se reabre si el archivo fue reemplazado;
+    la proyección anterior se cierra para no retener el archivo viejo.
+    """
+    paquete = _PAQUETES.get(ruta)
+    if not os.path.exists(ruta):
+        if paquete is not None:
+            _PAQUETES.pop(ruta).cerrar()
+        return None
+    if paquete is None or paquete.mtime != os.path.getmtime(ruta):
+        if paquete is not None:
+            paquete.cerrar()
+        paquete = _PAQUETES[ruta] = PaqueteModelos(ruta)
+    return paquete
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(description="Paquete único de modelos.")
+    parser.add_argument(
+        "--ruta", type=str, default=RUTA_PAQUETE_MODELOS, help="Archivo del paquete"
+    )
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_empaquetar = sub.add_parser("empaquetar", help="Crear el paquete")
+    p_empaquetar.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Carpeta de modelos"
+    )
+    sub.add_parser("listar", help="Listar los modelos del paquete")
+    args = parser.parse_args()
+
+    if args.comando == "empaquetar":
+        ruta = empaquetar_modelos(args.directorio, args.ruta)
+        with PaqueteModelos(ruta) as paquete:
+            print(
+                f"{len(paquete)} modelos empaquetados en {ruta} "
+                f"({os.path.getsize(ruta) / 1024:.0f}KB)"
+            )
+    else:
+        with PaqueteModelos(args.ruta) as paquete:
+            for tick in paquete.tickers():
+                print(f"{tick}\t{len(paquete.bytes_modelo(tick))}")
+
+
+if __name__ == "__main__":
+    main()
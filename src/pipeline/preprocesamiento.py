@@ -1,15 +1,86 @@
 """Funciones de preprocesamiento."""
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
 
-from .config import EQUIVALENCIAS_MESES, URL_BCRP
+from .cache_yfinance import actualizar_cache_yfinance, leer_cache_yfinance
+from .config import (
+    EQUIVALENCIAS_MESES,
+    MAX_CONEXIONES_BCRP,
+    REINTENTOS_BCRP,
+    RUTA_CACHE_YFINANCE,
+    TIMEOUT_BCRP,
+    URL_BCRP,
+)
 
+logger = logging.getLogger(__name__)
 
-def obtener_datos_bcrp(serie: str) -> pd.DataFrame:
+# Códigos HTTP transitorios que vale la pena reintentar
+CODIGOS_REINTENTABLES = {429, 500, 502, 503, 504}
+
+
+def crear_sesion_bcrp(max_conexiones: int = MAX_CONEXIONES_BCRP) -> requests.Session:
+    """Crea una sesión HTTP con un pool de conexiones reutilizables.
+
+    Parameters
+    ----------
+    max_conexiones : int, optional
+        Conexiones abiertas por host, por defecto MAX_CONEXIONES_BCRP.
+
+    Returns
+    -------
+    requests.Session
+        Sesión lista para compartirse entre hilos.
+    """
+    sesion = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=max_conexiones)
+    sesion.mount("http://", adaptador)
+    sesion.mount("https://", adaptador)
+    return sesion
+
+
+def _get_con_reintentos(
+    cliente: Any, url: str, timeout: float, reintentos: int
+) -> requests.Response:
+    """Hace un GET reintentando errores transitorios con espera exponencial.
+
+    La espera antes del intento ``n`` es aleatoria entre 0 y ``0.5 * 2**n``
+    segundos (*full jitter*) para no sincronizar los reintentos de los hilos.
+    """
+    for intento in range(reintentos):
+        try:
+            response = cliente.get(url, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            logger.warning(f"Error de conexión en {url}: {exc}. Reintentando")
+        else:
+            if response.status_code not in CODIGOS_REINTENTABLES:
+                break
+            logger.warning(f"HTTP {response.status_code} en {url}. Reintentando")
+        time.sleep(random.uniform(0, 0.5 * 2**intento))
+    else:
+        response = cliente.get(url, timeout=timeout)
+    response.raise_for_status()  # <‑‑ lanza HTTPError si falla
+    return response
+
+
+def obtener_datos_bcrp(
+    serie: str,
+    periodo_inicio: Optional[str] = None,
+    periodo_fin: Optional[str] = None,
+    url_base: str = URL_BCRP,
+    sesion: Optional[requests.Session] = None,
+    timeout: float = TIMEOUT_BCRP,
+    reintentos: int = REINTENTOS_BCRP,
+) -> pd.DataFrame:
     """Descarga datos del BCRP.
 
     Convierte la respuesta de la API en un ``pandas.DataFrame`` con las
@@ -17,9 +88,23 @@ def obtener_datos_bcrp(serie: str) -> pd.DataFrame:
 
     Parameters
     ----------
-    url : str, optional
-        URL de la API que expone los rendimientos mensuales por período.
-        Se usa la url base URL_BCRP.
+    serie : str
+        Código de la serie y formato (por ejemplo, ``SERIE_AFP``).
+    periodo_inicio : str, optional
+        Primer período a descargar (``'2024-1'`` mensual o ``'2024-01-05'``
+        diario). Si se indica junto con ``periodo_fin`` se usa la forma con
+        rango de fechas de la URL; si no, se descarga toda la historia.
+    periodo_fin : str, optional
+        Último período a descargar.
+    url_base : str, optional
+        URL base de la API, por defecto URL_BCRP.
+    sesion : requests.Session, optional
+        Sesión con pool de conexiones (ver ``crear_sesion_bcrp``). Si es
+        ``None`` se usa ``requests.get``.
+    timeout : float, optional
+        Timeout de cada petición en segundos, por defecto TIMEOUT_BCRP.
+    reintentos : int, optional
+        Reintentos ante errores transitorios, por defecto REINTENTOS_BCRP.
 
     Returns
     -------
@@ -42,22 +127,86 @@ def obtener_datos_bcrp(serie: str) -> pd.DataFrame:
     0  ENE2024       0.0123
     """
     # Realizar la petición
-    url = URL_BCRP + serie
-    response = requests.get(url)
-    response.raise_for_status()  # <‑‑ lanza HTTPError si falla
+    url = url_base + serie
+    if periodo_inicio is not None and periodo_fin is not None:
+        url = f"{url}/{periodo_inicio}/{periodo_fin}"
+    response = _get_con_reintentos(sesion or requests, url, timeout, reintentos)
 
     # Convertir la respuesta JSON en diccionario de Python
     data = response.json()
 
-    # Extraer períodos y rendimientos
-    periodos = [period["name"] for period in data["periods"]]
-    valores = [period["values"][0] for period in data["periods"]]
+    # Extraer períodos y rendimientos (un rango sin datos no trae "periods")
+    periodos = [period["name"] for period in data.get("periods", [])]
+    valores = [period["values"][0] for period in data.get("periods", [])]
 
     # Crear DataFrame y devolver
     df_afp = pd.DataFrame({"periodo": periodos, "valor": valores})
     return df_afp
 
 
+def obtener_series_bcrp(
+    series: List[str],
+    max_concurrencia: int = MAX_CONEXIONES_BCRP,
+    url_base: str = URL_BCRP,
+    timeout: float = TIMEOUT_BCRP,
+    reintentos: int = REINTENTOS_BCRP,
+) -> Dict[str, pd.DataFrame]:
+    """Descarga varias series del BCRP en paralelo.
+
+    Las peticiones se reparten en un pool de hilos acotado que comparte una
+    sesión HTTP, de modo que las conexiones TCP/TLS se reutilizan. Cada
+    petición tiene timeout y reintentos con espera aleatoria.
+
+    Parameters
+    ----------
+    series : List[str]
+        Códigos de serie y formato (por ejemplo, ``[SERIE_AFP, SERIE_TC]``).
+    max_concurrencia : int, optional
+        Peticiones simultáneas, por defecto MAX_CONEXIONES_BCRP.
+    url_base : str, optional
+        URL base de la API, por defecto URL_BCRP.
+    timeout : float, optional
+        Timeout de cada petición en segundos, por defecto TIMEOUT_BCRP.
+    reintentos : int, optional
+        Reintentos ante errores transitorios, por defecto REINTENTOS_BCRP.
+
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        Serie → DataFrame con las columnas ``periodo`` y ``valor``.
+
+    Raises
+    ------
+    requests.RequestException
+        Si alguna serie falla tras agotar los reintentos.
+    """
+    resultados: Dict[str, pd.DataFrame] = {}
+    with crear_sesion_bcrp(max_concurrencia) as sesion, ThreadPoolExecutor(
+        max_workers=max_concurrencia
+    ) as pool:
+        futuros = {
+            pool.submit(
+                obtener_datos_bcrp,
+                serie,
+                url_base=url_base,
+                sesion=sesion,
+                timeout=timeout,
+                reintentos=reintentos,
+            ): serie
+            for serie in series
+        }
+        for futuro in as_completed(futuros):
+            serie = futuros[futuro]
+            try:
+                resultados[serie] = futuro.result()
+            except requests.RequestException as exc:
+                logger.error(f"Error descargando {serie}: {exc}")
+                for pendiente in futuros:
+                    pendiente.cancel()
+                raise
+    return {serie: resultados[serie] for serie in series}
+
+
 def _fecha_diaria(fecha_str: str) -> datetime:
     """Convierte «dd Mmm.aa» (p. ej. ``'05 Mar.25'``) a ``datetime``."""
     try:
@@ -87,6 +236,86 @@ def _fecha_mensual(fecha_str: str) -> datetime:
         raise ValueError(f"Formato de fecha mensual no válido: {fecha_str}") from exc
 
 
+# Número de mes de cada abreviatura en español («ENE» → 1)
+MESES_NUMERO = {
+    mes_es: datetime.strptime(mes_en, "%b").month
+    for mes_es, mes_en in EQUIVALENCIAS_MESES.items()
+}
+
+
+def _anio_completo(anio: pd.Series) -> pd.Series:
+    """Convierte años de 2 o 4 dígitos a número (``%y``: 69-99 → 19xx)."""
+    valido = anio.str.fullmatch(r"\d{2}|\d{4}").fillna(False).astype(bool)
+    numero = pd.to_numeric(anio.where(valido), errors="coerce")
+    siglo = np.where(numero < 69, 2000, 1900)
+    return numero.where(anio.str.len() == 4, numero + siglo)
+
+
+def _parsear_periodos(periodos: pd.Series, diaria: bool) -> pd.Series:
+    """Convierte los períodos del BCRP a ``datetime`` de forma vectorizada.
+
+    Solo se interpretan los períodos únicos (mapeando los meses con
+    ``EQUIVALENCIAS_MESES`` en bloque) y el resultado se propaga a cada fila
+    mediante sus códigos. Acepta «dd Mmm.aa» para series diarias y
+    «Mmm.aaaa» o «Mmm.aa» para series mensuales.
+
+    Parameters
+    ----------
+    periodos : pd.Series
+        Períodos tal como los devuelve el BCRP.
+    diaria : bool
+        `True` si los períodos son diarios.
+
+    Returns
+    -------
+    pd.Series
+        Fechas ``datetime64[ns]`` con el mismo índice que ``periodos``.
+
+    Raises
+    ------
+    ValueError
+        Si algún período no tiene un formato válido.
+    """
+    codigos, unicos = pd.factorize(periodos)
+    tipo = "diaria" if diaria else "mensual"
+    if (codigos < 0).any():
+        raise ValueError(f"Formato de fecha {tipo} no válido: {np.nan}")
+
+    texto = pd.Series(unicos, dtype="object").astype(str)
+    if diaria:
+        dia = texto.str[0:2]
+        dia = pd.to_numeric(
+            dia.where(dia.str.fullmatch(r"\d{2}").astype(bool)), errors="coerce"
+        )
+        mes = texto.str[3:6]
+        anio = texto.str[7:]
+    else:
+        dia = pd.Series(1, index=texto.index)
+        mes = texto.str[:3]
+        # «Mmm.aaaa» y «Mmm.aa»: se descarta el separador tras el mes
+        anio = texto.str[3:].str.replace(r"^\D", "", regex=True)
+
+    fechas = pd.to_datetime(
+        pd.DataFrame(
+            {
+                "year": _anio_completo(anio),
+                "month": mes.str.upper().map(MESES_NUMERO),
+                "day": dia,
+            }
+        ),
+        errors="coerce",
+    )
+    invalidos = fechas.isna()
+    if invalidos.any():
+        raise ValueError(
+            f"Formato de fecha {tipo} no válido: {texto[invalidos].iloc[0]}"
+        )
+
+    return pd.Series(
+        fechas.to_numpy()[codigos], index=periodos.index, dtype="datetime64[ns]"
+    )
+
+
 # función pública ──────────────────────────────────────────────────────────────
 def limpiar_datos_bcrp(
     df: pd.DataFrame,
@@ -134,9 +363,8 @@ def limpiar_datos_bcrp(
         raise ValueError(f"Se requieren las columnas {columnas_requeridas}")
 
     # Conversión de fechas
-    convertir = _fecha_diaria if diaria else _fecha_mensual
     df = df.copy()  # evita modificar el original
-    df["periodo_limpio"] = df["periodo"].apply(convertir)
+    df["periodo_limpio"] = _parsear_periodos(df["periodo"], diaria)
 
     # Limpieza de rendimiento
     rend = pd.to_numeric(df["valor"], errors="coerce")
@@ -150,7 +378,11 @@ def limpiar_datos_bcrp(
 
 
 def obtener_datos_yfinance(
-    ticker: list[str], fecha_inicio: str, fecha_fin: str
+    ticker: list[str],
+    fecha_inicio: str,
+    fecha_fin: str,
+    usar_cache: bool = False,
+    directorio: str = RUTA_CACHE_YFINANCE,
 ) -> pd.DataFrame:
     """Obtiene los datos de los tickers de yfinance.
 
@@ -158,12 +390,25 @@ def obtener_datos_yfinance(
     ----------
     ticker : list[str]
         Lista de tickers de yfinance.
+    fecha_inicio : str
+        Fecha de inicio (inclusive) en formato 'YYYY-MM-DD'.
+    fecha_fin : str
+        Fecha fin (exclusive) en formato 'YYYY-MM-DD'.
+    usar_cache : bool, optional
+        Si es `True` solo se descargan los rangos que faltan en la caché en
+        disco (ver ``actualizar_cache_yfinance``), por defecto False.
+    directorio : str, optional
+        Directorio de la caché, por defecto RUTA_CACHE_YFINANCE.
 
     Returns
     -------
     pd.DataFrame
         DataFrame con los datos de los tickers de yfinance.
     """
+    if usar_cache:
+        actualizar_cache_yfinance(ticker, fecha_inicio, fecha_fin, directorio)
+        return leer_cache_yfinance(ticker, fecha_inicio, fecha_fin, directorio)
+
     df = yf.download(ticker, start=fecha_inicio, end=fecha_fin)
 
     # Seleccionar solamente los precios al cierre del día
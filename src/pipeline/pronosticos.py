@@ -0,0 +1,214 @@
+"""Tablas de pronósticos materializadas al entrenar.
+
+La mayoría de las consultas a ``/predict`` piden rangos dentro del próximo
+año o dos, así que en lugar de ejecutar ``modelo.predict`` en cada llamada
+se puede guardar, al entrenar, el pronóstico diario (días hábiles) de cada
+modelo sobre un horizonte fijo::
+
+    RUTA_PRONOSTICOS/pronostico_{tick}.parquet   ds | yhat | yhat_lower | yhat_upper
+
+Los metadatos del archivo guardan la huella del modelo que lo generó. Una
+consulta se responde con un corte por búsqueda binaria sobre ``ds`` solo si
+la tabla corresponde al modelo actual y cubre el rango pedido; si no, se
+predice en vivo (ver ``realizar_prediccion``).
+"""
+import argparse
+import hashlib
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from prophet import Prophet
+
+from src.pipeline.cache import CACHE_FUENTES
+from src.pipeline.compresion import opciones_parquet
+from src.pipeline.config import (
+    CODEC_PREDICCION,
+    HORIZONTE_PRONOSTICO,
+    NIVEL_PREDICCION,
+    RUTA_MODELOS,
+    RUTA_PRONOSTICOS,
+)
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS_PRONOSTICO = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+CLAVE_HUELLA = b"huella_modelo"
+
+
+def huella_modelo(modelo: Prophet) -> str:
+    """Hash de los parámetros y la última fecha de entrenamiento del modelo.
+
+    Identifica el modelo con que se generó una tabla; cambia al reentrenar.
+    """
+    h = hashlib.sha256(str(modelo.history_dates.max()).encode())
+    for nombre in sorted(modelo.params):
+        if nombre != "trend":
+            h.update(nombre.encode())
+            h.update(np.ascontiguousarray(modelo.params[nombre], np.float64).tobytes())
+    return h.hexdigest()
+
+
+def directorio_pronosticos(directorio_modelos: str) -> str:
+    """Carpeta de las tablas de los modelos guardados en ``directorio_modelos``.
+
+    Para RUTA_MODELOS es RUTA_PRONOSTICOS.
+    """
+    return os.path.join(directorio_modelos, "pronosticos")
+
+
+def ruta_pronostico(tick: str, directorio: Optional[str] = None) -> str:
+    """Archivo de la tabla de pronósticos de un ticker.
+
+    ``directorio`` es por defecto RUTA_PRONOSTICOS, leído en cada llamada.
+    """
+    return os.path.join(directorio or RUTA_PRONOSTICOS, f"pronostico_{tick}.parquet")
+
+
+def materializar_pronostico(
+    modelo: Prophet,
+    tick: str,
+    horizonte: int = HORIZONTE_PRONOSTICO,
+    directorio: Optional[str] = None,
+    codec: Optional[str] = None,
+    nivel: Optional[int] = None,
+) -> str:
+    """Guarda el pronóstico diario del modelo para los próximos días hábiles.
+
+    Parameters
+    ----------
+    modelo : Prophet
+        Modelo entrenado.
+    tick : str
+        Símbolo de la acción.
+    horizonte : int, optional
+        Días hábiles después de la última fecha de entrenamiento, por
+        defecto HORIZONTE_PRONOSTICO.
+    directorio : str, optional
+        Carpeta de las tablas, por defecto RUTA_PRONOSTICOS.
+    codec : str, optional
+        Códec de compresión de Parquet, por defecto CODEC_PREDICCION.
+    nivel : int, optional
+        Nivel de compresión, por defecto NIVEL_PREDICCION.
+
+    Returns
+    -------
+    str
+        Ruta de la tabla.
+    """
+    futuro = modelo.make_future_dataframe(
+        periods=horizonte, freq="B", include_history=False
+    )
+    pronostico = modelo.predict(futuro)[COLUMNAS_PRONOSTICO]
+    tabla = pa.Table.from_pandas(pronostico, preserve_index=False)
+    tabla = tabla.replace_schema_metadata(
+        {**(tabla.schema.metadata or {}), CLAVE_HUELLA: huella_modelo(modelo).encode()}
+    )
+    ruta = ruta_pronostico(tick, directorio)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    # Escritura atómica: una consulta concurrente nunca ve un archivo a medias
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    pq.write_table(
+        tabla,
+        temporal,
+        **opciones_parquet(
+            codec or CODEC_PREDICCION, NIVEL_PREDICCION if nivel is None else nivel
+        ),
+    )
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def _leer_tabla(ruta: str) -> pd.DataFrame:
+    """Lee una tabla de pronósticos con la huella del modelo en ``attrs``."""
+    tabla = pq.read_table(ruta)
+    df = tabla.to_pandas()
+    df.attrs["huella_modelo"] = tabla.schema.metadata[CLAVE_HUELLA].decode()
+    return df
+
+
+def consultar_pronostico(
+    tick: str,
+    modelo: Prophet,
+    fecha_inicio: str,
+    fecha_fin: str,
+    directorio: Optional[str] = None,
+) -> Optional[pd.DataFrame]:
+    """Responde una predicción desde la tabla materializada, si es posible.
+
+    Devuelve las mismas fechas que ``realizar_prediccion`` en vivo: los días
+    hábiles entre ``fecha_inicio`` y ``fecha_fin`` dentro de los primeros
+    ``(fecha_fin - fecha_inicio).days`` días hábiles tras la última fecha de
+    entrenamiento.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        Columnas ``ds``, ``yhat``, ``yhat_lower`` y ``yhat_upper``, o
+        ``None`` si el modelo no es Prophet (p. ej. un ``ModeloBaseline``), no
+        hay tabla, es de otro modelo o no cubre el rango.
+    """
+    if not isinstance(modelo, Prophet):
+        return None
+    ruta = ruta_pronostico(tick, directorio)
+    dias = (pd.Timestamp(fecha_fin) - pd.Timestamp(fecha_inicio)).days
+    if dias <= 0 or not os.path.exists(ruta):
+        return None
+    tabla = CACHE_FUENTES.obtener(ruta, lambda: _leer_tabla(ruta), "pronostico")
+    if tabla.attrs["huella_modelo"] != huella_modelo(modelo):
+        logger.debug(f"Tabla de pronósticos de {tick} desactualizada")
+        return None
+
+    tope = min(
+        pd.Timestamp(fecha_fin),
+        modelo.history_dates.max() + pd.offsets.BDay(dias),
+    )
+    fechas = tabla["ds"].to_numpy()
+    if len(fechas) == 0 or tope > fechas[-1]:
+        return None
+    inicio = fechas.searchsorted(np.datetime64(pd.Timestamp(fecha_inicio)), "left")
+    fin = fechas.searchsorted(np.datetime64(tope), "right")
+    return tabla.iloc[inicio:fin].reset_index(drop=True)
+
+
+def main():
+    """Función principal del script."""
+    from src.pipeline.registro_modelos import listar_modelos
+    from src.pipeline.serializacion import cargar_modelo_archivo
+
+    parser = argparse.ArgumentParser(
+        description="Materializar las tablas de pronósticos de modelos guardados."
+    )
+    parser.add_argument("--tickers", nargs="+", help="Por defecto, todos")
+    parser.add_argument(
+        "--horizonte",
+        type=int,
+        default=HORIZONTE_PRONOSTICO,
+        help="Días hábiles a materializar",
+    )
+    parser.add_argument(
+        "--modelos", type=str, default=RUTA_MODELOS, help="Carpeta de modelos"
+    )
+    parser.add_argument(
+        "--directorio",
+        type=str,
+        default=None,
+        help="Carpeta destino (por defecto, 'pronosticos' dentro de --modelos)",
+    )
+    args = parser.parse_args()
+    directorio = args.directorio or directorio_pronosticos(args.modelos)
+
+    modelos = listar_modelos(args.modelos)
+    if args.tickers:
+        modelos = modelos[modelos["ticker"].isin(args.tickers)]
+    for tick, ruta in zip(modelos["ticker"], modelos["ruta"]):
+        modelo = cargar_modelo_archivo(ruta)
+        print(materializar_pronostico(modelo, tick, args.horizonte, directorio))
+
+
+if __name__ == "__main__":
+    main()
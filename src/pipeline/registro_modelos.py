@@ -0,0 +1,336 @@
+"""Registro SQLite de los modelos entrenados.
+
+Reemplaza el descubrimiento de modelos con ``glob`` y ``os.path.exists``.
+El registro vive junto a los modelos (``RUTA_MODELOS``) y guarda una fila
+por entrenamiento::
+
+    ticker | version | archivo | formato | bytes | huella | metricas | fecha
+
+``guardar_modelo`` registra cada modelo guardado como una nueva versión del
+ticker. El archivo se guarda relativo al directorio para que la carpeta de
+modelos pueda copiarse a otro lugar (por ejemplo, a una Lambda). Como el
+archivo de cada ticker se sobrescribe al reentrenar, solo la última versión
+tiene artefacto (``ruta``); las anteriores conservan la historia de métricas
+y huellas de datos, y por eso no se buscan por número de versión.
+
+Las consultas por ticker y por última versión usan el índice único
+``(ticker, version)``. Solo las escrituras crean el esquema y activan WAL;
+las consultas abren el registro en modo de solo lectura, de modo que la
+inferencia funciona sobre una carpeta de modelos de solo lectura (una imagen
+de contenedor o una Lambda). Para registrar modelos guardados antes de
+existir el registro::
+
+    python -m src.pipeline.registro_modelos indexar
+"""
+import argparse
+import glob
+import json
+import os
+import pathlib
+import re
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.pipeline.config import RUTA_MODELOS
+from src.pipeline.serializacion import ruta_modelo
+
+ARCHIVO_REGISTRO = "registro_modelos.sqlite"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS modelos (
+    ticker TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    archivo TEXT NOT NULL,
+    formato TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    huella TEXT,
+    metricas TEXT,
+    hiperparametros TEXT,
+    fecha TEXT NOT NULL,
+    PRIMARY KEY (ticker, version)
+) WITHOUT ROWID;
+"""
+
+_PATRON_ARCHIVO = re.compile(r"^prophet_(?P<ticker>.+?)\.(?P<ext>joblib|json\.gz)$")
+
+COLUMNAS = [
+    "ticker",
+    "version",
+    "archivo",
+    "formato",
+    "bytes",
+    "huella",
+    "metricas",
+    "hiperparametros",
+    "fecha",
+]
+
+
+def _conectar(directorio: str, wal: bool = True) -> sqlite3.Connection:
+    """Abre el registro del directorio para escribir y crea el esquema.
+
+    Con ``wal=False`` se usa el journal clásico, el único seguro cuando
+    escriben procesos de varias máquinas sobre un sistema de archivos
+    compartido (ver ``cola_trabajos.conectar``).
+    """
+    os.makedirs(directorio, exist_ok=True)
+    con = sqlite3.connect(
+        os.path.join(directorio, ARCHIVO_REGISTRO), timeout=60, isolation_level=None
+    )
+    con.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+    con.executescript(_ESQUEMA)
+    return con
+
+
+def _consultar(directorio: str, consulta: str, parametros: tuple = ()) -> List[tuple]:
+    """Ejecuta una consulta con el registro abierto en solo lectura.
+
+    Sin registro no hay filas. Si la carpeta no admite escritura y el
+    registro está en modo WAL sin su archivo ``-shm``, SQLite no puede
+    abrirlo en solo lectura normal; en ese caso se abre como inmutable.
+    """
+    ruta = os.path.join(directorio, ARCHIVO_REGISTRO)
+    if not os.path.exists(ruta):
+        return []
+    uri = f"{pathlib.Path(ruta).resolve().as_uri()}?mode=ro"
+    for sufijo in ("", "&immutable=1"):
+        try:
+            con = sqlite3.connect(uri + sufijo, uri=True, timeout=60)
+            try:
+                return con.execute(consulta, parametros).fetchall()
+            finally:
+                con.close()
+        except sqlite3.OperationalError as exc:
+            error = exc
+    raise error
+
+
+def _fila_a_dict(fila: tuple, directorio: str, vigente: bool = True) -> Dict[str, Any]:
+    entrada = dict(zip(COLUMNAS, fila))
+    for campo in ("metricas", "hiperparametros"):
+        if entrada[campo] is not None:
+            entrada[campo] = json.loads(entrada[campo])
+    # Solo la última versión conserva su artefacto
+    entrada["ruta"] = os.path.join(directorio, entrada["archivo"]) if vigente else None
+    return entrada
+
+
+def registrar_modelo(
+    tick: str,
+    ruta: str,
+    metricas: Optional[Dict[str, float]] = None,
+    huella: Optional[str] = None,
+    hiperparametros: Optional[Dict[str, Any]] = None,
+    directorio: str = RUTA_MODELOS,
+    fecha: Optional[str] = None,
+    wal: bool = True,
+) -> int:
+    """Registra un modelo guardado como nueva versión del ticker.
+
+    Parameters
+    ----------
+    tick : str
+        Símbolo de la acción.
+    ruta : str
+        Archivo del modelo (dentro de ``directorio``).
+    metricas : Dict[str, float], optional
+        Métricas del entrenamiento.
+    huella : str, optional
+        Huella de los datos de entrenamiento (ver ``huella_datos``).
+    hiperparametros : Dict[str, Any], optional
+        Hiperparámetros del entrenamiento.
+    directorio : str, optional
+        Carpeta de los modelos y del registro, por defecto RUTA_MODELOS.
+    fecha : str, optional
+        Fecha del entrenamiento en ISO 8601, por defecto ahora.
+    wal : bool, optional
+        Usar el journal WAL, por defecto True; ``False`` con escritores en
+        varias máquinas.
+
+    Returns
+    -------
+    int
+        Versión asignada (1 para el primer modelo del ticker).
+    """
+    archivo = os.path.relpath(ruta, directorio)
+    formato = "compacto" if archivo.endswith(".json.gz") else "joblib"
+    con = _conectar(directorio, wal)
+    try:
+        # BEGIN IMMEDIATE serializa la asignación de versiones entre procesos
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            (version,) = con.execute(
+                "SELECT COALESCE(MAX(version), 0) + 1 FROM modelos WHERE ticker = ?",
+                (tick,),
+            ).fetchone()
+            con.execute(
+                f"INSERT INTO modelos ({', '.join(COLUMNAS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNAS))})",
+                (
+                    tick,
+                    version,
+                    archivo,
+                    formato,
+                    os.path.getsize(ruta),
+                    huella,
+                    None if metricas is None else json.dumps(metricas),
+                    None if hiperparametros is None else json.dumps(hiperparametros),
+                    fecha or datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+    finally:
+        con.close()
+    return version
+
+
+def buscar_modelo(
+    tick: str, directorio: str = RUTA_MODELOS
+) -> Optional[Dict[str, Any]]:
+    """Entrada de la última versión registrada de un ticker.
+
+    Parameters
+    ----------
+    tick : str
+        Símbolo de la acción.
+    directorio : str, optional
+        Carpeta de los modelos, por defecto RUTA_MODELOS.
+
+    Returns
+    -------
+    Dict[str, Any] or None
+        Columnas del registro más ``ruta`` (absoluta), o ``None`` si el
+        ticker no está registrado.
+    """
+    filas = _consultar(
+        directorio,
+        f"SELECT {', '.join(COLUMNAS)} FROM modelos WHERE ticker = ? "
+        "ORDER BY version DESC LIMIT 1",
+        (tick,),
+    )
+    return _fila_a_dict(filas[0], directorio) if filas else None
+
+
+def ruta_vigente(tick: str, directorio: str = RUTA_MODELOS) -> str:
+    """Archivo del último modelo de un ticker.
+
+    Se consulta el registro y, si el ticker no está registrado o su archivo
+    ya no existe, se busca el archivo en el directorio.
+
+    Raises
+    ------
+    FileNotFoundError
+        Si no hay modelo para el ticker.
+    """
+    entrada = buscar_modelo(tick, directorio)
+    if entrada is not None and os.path.exists(entrada["ruta"]):
+        return entrada["ruta"]
+    return ruta_modelo(tick, directorio, existente=True)
+
+
+def listar_modelos(
+    directorio: str = RUTA_MODELOS, todas_las_versiones: bool = False
+) -> pd.DataFrame:
+    """Lista los modelos registrados.
+
+    Parameters
+    ----------
+    directorio : str, optional
+        Carpeta de los modelos, por defecto RUTA_MODELOS.
+    todas_las_versiones : bool, optional
+        Si es False (por defecto), solo la última versión de cada ticker.
+
+    Returns
+    -------
+    pd.DataFrame
+        Una fila por modelo ordenada por ticker y versión, con las métricas
+        como diccionarios. ``ruta`` es ``None`` en las versiones anteriores,
+        cuyo artefacto ya fue reemplazado.
+    """
+    consulta = (
+        f"SELECT {', '.join(COLUMNAS)}, version = "
+        "(SELECT MAX(version) FROM modelos WHERE ticker = m.ticker) FROM modelos m"
+    )
+    if not todas_las_versiones:
+        consulta += (
+            " WHERE version = "
+            "(SELECT MAX(version) FROM modelos WHERE ticker = m.ticker)"
+        )
+    filas = _consultar(directorio, consulta + " ORDER BY ticker, version")
+    return pd.DataFrame(
+        [_fila_a_dict(fila[:-1], directorio, bool(fila[-1])) for fila in filas],
+        columns=[*COLUMNAS, "ruta"],
+    )
+
+
+def indexar_directorio(directorio: str = RUTA_MODELOS) -> int:
+    """Registra los modelos del directorio que aún no están en el registro.
+
+    Las métricas se leen de ``metricas_{tick}.json`` y la fecha es la de
+    modificación del archivo.
+
+    Returns
+    -------
+    int
+        Modelos registrados.
+    """
+    registrados = set(listar_modelos(directorio)["archivo"])
+    nuevos = 0
+    for ruta in sorted(glob.glob(os.path.join(directorio, "prophet_*"))):
+        coincidencia = _PATRON_ARCHIVO.match(os.path.basename(ruta))
+        if coincidencia is None or os.path.basename(ruta) in registrados:
+            continue
+        tick = coincidencia["ticker"]
+        ruta_metricas = os.path.join(directorio, f"metricas_{tick}.json")
+        metricas = None
+        if os.path.exists(ruta_metricas):
+            with open(ruta_metricas) as f:
+                metricas = json.load(f)
+        fecha = datetime.fromtimestamp(os.path.getmtime(ruta))
+        registrar_modelo(
+            tick,
+            ruta,
+            metricas,
+            directorio=directorio,
+            fecha=fecha.isoformat(timespec="seconds"),
+        )
+        nuevos += 1
+    return nuevos
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(description="Registro de modelos entrenados.")
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Carpeta de modelos"
+    )
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("indexar", help="Registrar los modelos existentes")
+    p_listar = sub.add_parser("listar", help="Listar los modelos registrados")
+    p_listar.add_argument(
+        "--todas", action="store_true", help="Incluir versiones anteriores"
+    )
+    p_buscar = sub.add_parser("buscar", help="Mostrar el modelo de un ticker")
+    p_buscar.add_argument("tick", type=str, help="Símbolo de la acción")
+    args = parser.parse_args()
+
+    if args.comando == "indexar":
+        print(f"{indexar_directorio(args.directorio)} modelos registrados")
+    elif args.comando == "listar":
+        modelos = listar_modelos(args.directorio, args.todas)
+        print(modelos.drop(columns=["ruta", "hiperparametros"]).to_string(index=False))
+    else:
+        entrada = buscar_modelo(args.tick, args.directorio)
+        if entrada is None:
+            raise SystemExit(f"{args.tick} no está registrado")
+        print(json.dumps(entrada, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Formato compacto de modelos Prophet para inferencia.
+
+``joblib.dump`` guarda el objeto Prophet completo: la historia de
+entrenamiento, la tendencia ajustada punto a punto y los objetos del backend
+de Stan. Para predecir solo hacen falta los parámetros, los puntos de cambio,
+las especificaciones de estacionalidad y las constantes de escalado, de modo
+que el formato compacto guarda únicamente eso como JSON comprimido (con gzip
+por defecto, ver ``compresion``)::
+
+    {"formato": "prophet-compacto", "version": 1, "prophet": "...",
+     "atributos": {...}, "params": {...}, "changepoints": [...], ...}
+
+La carga no usa ``pickle``: se reconstruye un ``Prophet`` vacío y se asignan
+los atributos. De la historia se conservan las últimas ``FILAS_HISTORIA``
+filas, suficientes para ``make_future_dataframe`` y ``predict`` con fechas
+nuevas; ``predict()`` sin argumentos (sobre la historia) no está disponible.
+"""
+import io
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from prophet import __version__ as VERSION_PROPHET
+from prophet.serialize import SIMPLE_ATTRIBUTES
+
+from src.pipeline.compresion import CABECERA, codec_de, comprimir, descomprimir
+
+FORMATO = "prophet-compacto"
+VERSION_FORMATO = 1
+EXTENSION_COMPACTO = ".json.gz"
+EXTENSION_JOBLIB = ".joblib"
+FORMATOS_MODELO = ("joblib", "compacto")
+
+# Filas de la historia que se conservan (Prophet infiere la frecuencia de
+# las últimas 5 fechas)
+FILAS_HISTORIA = 5
+
+# Parámetros que solo describen el ajuste sobre la historia
+PARAMETROS_EXCLUIDOS = ("trend",)
+
+
+def _fechas_a_ns(fechas) -> List[int]:
+    return pd.to_datetime(pd.Series(fechas)).astype("int64").tolist()
+
+
+def _ns_a_fechas(valores: List[int]) -> pd.Series:
+    return pd.Series(pd.to_datetime(np.asarray(valores, dtype="int64")), name="ds")
+
+
+def _frame_a_dict(df: pd.DataFrame) -> Dict[str, Any]:
+    """Columnas de un DataFrame como listas; las fechas en nanosegundos."""
+    columnas = {}
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            columnas[col] = {"ns": _fechas_a_ns(df[col])}
+        else:
+            columnas[col] = df[col].tolist()
+    return columnas
+
+
+def _dict_a_frame(columnas: Dict[str, Any]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            col: _ns_a_fechas(v["ns"]) if isinstance(v, dict) else v
+            for col, v in columnas.items()
+        }
+    )
+
+
+def modelo_a_dict(modelo: Prophet) -> Dict[str, Any]:
+    """Extrae de un modelo ajustado lo necesario para predecir.
+
+    Raises
+    ------
+    ValueError
+        Si el modelo no está ajustado.
+    """
+    if modelo.history is None:
+        raise ValueError("Solo se pueden serializar modelos ajustados")
+    regresores = []
+    for nombre, props in modelo.extra_regressors.items():
+        props = dict(props)
+        props.pop("predictor", None)
+        regresores.append([nombre, props])
+    componentes = modelo.train_component_cols
+    return {
+        "formato": FORMATO,
+        "version": VERSION_FORMATO,
+        "prophet": VERSION_PROPHET,
+        "atributos": {a: getattr(modelo, a) for a in SIMPLE_ATTRIBUTES},
+        "params": {
+            k: np.asarray(v).tolist()
+            for k, v in modelo.params.items()
+            if k not in PARAMETROS_EXCLUIDOS
+        },
+        "start": int(modelo.start.value),
+        "t_scale": int(modelo.t_scale.value),
+        "changepoints": (
+            None if modelo.changepoints is None else _fechas_a_ns(modelo.changepoints)
+        ),
+        "changepoints_t": np.asarray(modelo.changepoints_t).tolist(),
+        "seasonalities": [[k, v] for k, v in modelo.seasonalities.items()],
+        "extra_regressors": regresores,
+        "holidays": (
+            None if modelo.holidays is None else _frame_a_dict(modelo.holidays)
+        ),
+        "train_holiday_names": (
+            None
+            if modelo.train_holiday_names is None
+            else modelo.train_holiday_names.tolist()
+        ),
+        "train_component_cols": {
+            "columnas": componentes.columns.tolist(),
+            "valores": componentes.to_numpy().tolist(),
+        },
+        "history": _frame_a_dict(modelo.history.tail(FILAS_HISTORIA)),
+        "history_dates": _fechas_a_ns(modelo.history_dates.tail(FILAS_HISTORIA)),
+    }
+
+
+def modelo_desde_dict(datos: Dict[str, Any]) -> Prophet:
+    """Reconstruye un modelo a partir de ``modelo_a_dict``.
+
+    Raises
+    ------
+    ValueError
+        Si los datos no son del formato compacto o su versión no se conoce.
+    """
+    if datos.get("formato") != FORMATO or datos.get("version") != VERSION_FORMATO:
+        raise ValueError(
+            f"Formato de modelo no soportado: {datos.get('formato')} "
+            f"v{datos.get('version')}"
+        )
+    modelo = Prophet()
+    for atributo, valor in datos["atributos"].items():
+        setattr(modelo, atributo, valor)
+    modelo.params = {k: np.asarray(v, dtype=float) for k, v in datos["params"].items()}
+    modelo.start = pd.Timestamp(datos["start"])
+    modelo.t_scale = pd.Timedelta(datos["t_scale"])
+    if datos["changepoints"] is not None:
+        modelo.changepoints = _ns_a_fechas(datos["changepoints"])
+    modelo.changepoints_t = np.asarray(datos["changepoints_t"], dtype=float)
+    modelo.seasonalities.update(datos["seasonalities"])
+    modelo.extra_regressors.update(datos["extra_regressors"])
+    if datos["holidays"] is not None:
+        modelo.holidays = _dict_a_frame(datos["holidays"])
+    if datos["train_holiday_names"] is not None:
+        modelo.train_holiday_names = pd.Series(datos["train_holiday_names"])
+    componentes = datos["train_component_cols"]
+    modelo.train_component_cols = pd.DataFrame(
+        componentes["valores"],
+        columns=pd.Index(componentes["columnas"], name="component"),
+    ).rename_axis("col")
+    modelo.history = _dict_a_frame(datos["history"])
+    modelo.history_dates = _ns_a_fechas(datos["history_dates"])
+    modelo.stan_fit = None
+    return modelo
+
+
+def serializar_modelo(
+    modelo: Prophet, codec: str = "gzip", nivel: Optional[int] = None
+) -> bytes:
+    """Serializa un modelo en el formato compacto (JSON comprimido).
+
+    Parameters
+    ----------
+    modelo : Prophet
+        Modelo ajustado.
+    codec : str, optional
+        Códec de compresión (ver ``compresion.CODECS``), por defecto gzip.
+    nivel : int, optional
+        Nivel de compresión; por defecto, el del códec.
+    """
+    texto = json.dumps(modelo_a_dict(modelo), separators=(",", ":"))
+    return comprimir(texto.encode("utf-8"), codec, nivel)
+
+
+def deserializar_modelo(datos: bytes) -> Prophet:
+    """Reconstruye un modelo serializado con ``serializar_modelo``."""
+    return modelo_desde_dict(json.loads(descomprimir(datos)))
+
+
+def ruta_modelo(
+    tick: str, directorio: str, formato: str = "compacto", existente: bool = False
+) -> str:
+    """Ruta del archivo de modelo de un ticker.
+
+    Parameters
+    ----------
+    tick : str
+        Símbolo de la acción.
+    directorio : str
+        Carpeta de modelos.
+    formato : str, optional
+        ``'compacto'`` o ``'joblib'``, por defecto ``'compacto'``.
+    existente : bool, optional
+        Si es True, devuelve el archivo existente (el más reciente si hay de
+        ambos formatos) y lanza FileNotFoundError si no hay ninguno.
+    """
+    if existente:
+        rutas = [
+            ruta
+            for ruta in (ruta_modelo(tick, directorio, f) for f in FORMATOS_MODELO)
+            if os.path.exists(ruta)
+        ]
+        if not rutas:
+            raise FileNotFoundError(
+                f"No se encontró el modelo para {tick} en {directorio}"
+            )
+        return max(rutas, key=os.path.getmtime)
+    if formato not in FORMATOS_MODELO:
+        raise ValueError(f"Formato {formato} no soportado. Opciones: {FORMATOS_MODELO}")
+    extension = EXTENSION_COMPACTO if formato == "compacto" else EXTENSION_JOBLIB
+    return os.path.join(directorio, f"prophet_{tick}{extension}")
+
+
+def guardar_modelo_archivo(
+    modelo: Prophet, ruta: str, codec: Optional[str] = None, nivel: Optional[int] = None
+) -> None:
+    """Guarda un modelo en el formato indicado por la extensión de ``ruta``.
+
+    Parameters
+    ----------
+    modelo : Prophet
+        Modelo ajustado.
+    ruta : str
+        Archivo destino (``.json.gz`` o ``.joblib``).
+    codec : str, optional
+        Códec de compresión (ver ``compresion.CODECS``). Por defecto, gzip
+        para el formato compacto y ninguno para joblib, que entonces se
+        escribe como un ``joblib.dump`` normal.
+    nivel : int, optional
+        Nivel de compresión; por defecto, el del códec.
+    """
+    if ruta.endswith(EXTENSION_COMPACTO):
+        datos = serializar_modelo(modelo, codec or "gzip", nivel)
+    elif codec is None or codec == "none":
+        joblib.dump(modelo, ruta)
+        return
+    else:
+        buffer = io.BytesIO()
+        joblib.dump(modelo, buffer)
+        datos = comprimir(buffer.getvalue(), codec, nivel)
+    with open(ruta, "wb") as f:
+        f.write(datos)
+
+
+def cargar_modelo_archivo(ruta: str) -> Prophet:
+    """Carga un modelo en el formato indicado por la extensión de ``ruta``.
+
+    El códec se lee de la cabecera del archivo (ver ``compresion``).
+    """
+    if ruta.endswith(EXTENSION_COMPACTO):
+        with open(ruta, "rb") as f:
+            return deserializar_modelo(f.read())
+    with open(ruta, "rb") as f:
+        if codec_de(f.read(CABECERA.size)) is None:
+            return joblib.load(ruta)
+        f.seek(0)
+        return joblib.load(io.BytesIO(descomprimir(f.read())))
+
+
+def cargar_modelo_ticker(tick: str, directorio: str) -> Optional[Prophet]:
+    """Carga el modelo guardado de un ticker, o ``None`` si no existe."""
+    try:
+        return cargar_modelo_archivo(ruta_modelo(tick, directorio, existente=True))
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,215 @@
+"""Sincronización incremental de series del BCRP con un almacén local.
+
+Por cada serie se guarda la marca del último período ingerido y las filas
+limpias en particiones Parquet de solo-anexado::
+
+    RUTA_BCRP/
+    ├── marcas.json                 # {"PN01178MM": "2025-03-01", ...}
+    └── PN01178MM/
+        ├── parte-00000.parquet     # carga inicial
+        └── parte-00001.parquet     # filas nuevas de cada sincronización
+
+Cada sincronización pide a la API solo los períodos posteriores a la marca
+usando la forma con rango de fechas de la URL.
+"""
+import argparse
+import json
+import logging
+import os
+from datetime import date
+from typing import Dict, Optional
+
+import pandas as pd
+import requests
+
+from src.pipeline.config import RUTA_BCRP, SERIE_AFP, SERIE_ORO, SERIE_TC, URL_BCRP
+from src.pipeline.preprocesamiento import (
+    crear_sesion_bcrp,
+    limpiar_datos_bcrp,
+    obtener_datos_bcrp,
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_MARCAS = "marcas.json"
+
+# Frecuencia y unidades de las series que usa el proyecto
+SERIES_BCRP = {
+    SERIE_AFP: {"diaria": False, "porcentual": True},
+    SERIE_TC: {"diaria": True, "porcentual": False},
+    SERIE_ORO: {"diaria": False, "porcentual": False},
+}
+
+
+def _codigo_serie(serie: str) -> str:
+    """Devuelve el código de la serie sin el formato (``'PN01178MM'``)."""
+    return serie.split("/")[0]
+
+
+def _periodo_bcrp(fecha: pd.Timestamp, diaria: bool) -> str:
+    """Da formato de período de la API a una fecha."""
+    if diaria:
+        return fecha.strftime("%Y-%m-%d")
+    return f"{fecha.year}-{fecha.month}"
+
+
+def leer_marcas(directorio: str = RUTA_BCRP) -> Dict[str, str]:
+    """Lee el último período ingerido de cada serie.
+
+    Parameters
+    ----------
+    directorio : str, optional
+        Directorio del almacén, por defecto RUTA_BCRP.
+
+    Returns
+    -------
+    Dict[str, str]
+        Código de serie → fecha ``'YYYY-MM-DD'`` del último período.
+    """
+    ruta = os.path.join(directorio, ARCHIVO_MARCAS)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta) as f:
+        return json.load(f)
+
+
+def _guardar_marca(codigo: str, fecha: pd.Timestamp, directorio: str) -> None:
+    """Actualiza la marca de una serie de forma atómica."""
+    marcas = leer_marcas(directorio)
+    marcas[codigo] = fecha.strftime("%Y-%m-%d")
+    ruta = os.path.join(directorio, ARCHIVO_MARCAS)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w") as f:
+        json.dump(marcas, f, indent=2)
+    os.replace(temporal, ruta)
+
+
+def _anexar_parte(df: pd.DataFrame, codigo: str, directorio: str) -> str:
+    """Escribe una nueva partición de solo-anexado para la serie."""
+    carpeta = os.path.join(directorio, codigo)
+    os.makedirs(carpeta, exist_ok=True)
+    numero = sum(nombre.startswith("parte-") for nombre in os.listdir(carpeta))
+    ruta = os.path.join(carpeta, f"parte-{numero:05d}.parquet")
+    df.to_parquet(ruta, index=False)
+    return ruta
+
+
+def sincronizar_serie_bcrp(
+    serie: str,
+    diaria: bool = False,
+    porcentual: bool = True,
+    directorio: str = RUTA_BCRP,
+    fecha_fin: Optional[str] = None,
+    url_base: str = URL_BCRP,
+    sesion: Optional[requests.Session] = None,
+) -> pd.DataFrame:
+    """Descarga solo los períodos nuevos de una serie y los anexa al almacén.
+
+    Parameters
+    ----------
+    serie : str
+        Código de la serie y formato (por ejemplo, ``SERIE_AFP``).
+    diaria : bool, optional
+        `True` si la serie es diaria, por defecto False.
+    porcentual : bool, optional
+        Si los valores vienen en porcentaje, por defecto True.
+    directorio : str, optional
+        Directorio del almacén, por defecto RUTA_BCRP.
+    fecha_fin : str, optional
+        Último período a pedir ('YYYY-MM-DD'), por defecto hoy.
+    url_base : str, optional
+        URL base de la API, por defecto URL_BCRP.
+    sesion : requests.Session, optional
+        Sesión HTTP compartida (ver ``crear_sesion_bcrp``).
+
+    Returns
+    -------
+    pd.DataFrame
+        Filas nuevas con las columnas ``periodo_limpio`` y ``valor_limpio``.
+    """
+    codigo = _codigo_serie(serie)
+    marca = leer_marcas(directorio).get(codigo)
+    fin = pd.Timestamp(fecha_fin or date.today())
+    columnas = ["periodo_limpio", "valor_limpio"]
+
+    if marca is None:
+        logger.info(f"Serie {codigo} sin marca: descargando historia completa")
+        df = obtener_datos_bcrp(serie, url_base=url_base, sesion=sesion)
+    else:
+        marca = pd.Timestamp(marca)
+        siguiente = marca + (
+            pd.DateOffset(days=1) if diaria else pd.DateOffset(months=1)
+        )
+        if siguiente > fin:
+            logger.info(f"Serie {codigo} al día (marca {marca.date()})")
+            return pd.DataFrame(columns=columnas)
+        desde = _periodo_bcrp(siguiente, diaria)
+        hasta = _periodo_bcrp(fin, diaria)
+        logger.info(f"Serie {codigo}: descargando {desde} a {hasta}")
+        df = obtener_datos_bcrp(serie, desde, hasta, url_base, sesion=sesion)
+
+    df = df[df["valor"] != "n.d."]
+    if df.empty:
+        return pd.DataFrame(columns=columnas)
+    df = limpiar_datos_bcrp(df, porcentual, diaria)[columnas]
+    if marca is not None:
+        df = df[df["periodo_limpio"] > marca]
+    if df.empty:
+        return df.reset_index(drop=True)
+
+    # Primero los datos y luego la marca: si el proceso se interrumpe entre
+    # ambos pasos la siguiente lectura descarta los duplicados
+    _anexar_parte(df, codigo, directorio)
+    _guardar_marca(codigo, df["periodo_limpio"].max(), directorio)
+    logger.info(f"Serie {codigo}: {len(df)} filas nuevas")
+    return df.reset_index(drop=True)
+
+
+def leer_serie_bcrp(serie: str, directorio: str = RUTA_BCRP) -> pd.DataFrame:
+    """Lee una serie completa desde el almacén local.
+
+    Parameters
+    ----------
+    serie : str
+        Código de la serie y formato (por ejemplo, ``SERIE_AFP``).
+    directorio : str, optional
+        Directorio del almacén, por defecto RUTA_BCRP.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columnas ``periodo_limpio`` y ``valor_limpio`` ordenadas por fecha.
+
+    Raises
+    ------
+    FileNotFoundError
+        Si la serie nunca fue sincronizada.
+    """
+    carpeta = os.path.join(directorio, _codigo_serie(serie))
+    if not os.path.isdir(carpeta):
+        raise FileNotFoundError(f"La serie {serie} no está en {directorio}")
+    df = pd.read_parquet(carpeta)
+    df = df.drop_duplicates("periodo_limpio", keep="last")
+    return df.sort_values("periodo_limpio").reset_index(drop=True)
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Sincronizar incrementalmente las series del BCRP."
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_BCRP, help="Directorio del almacén"
+    )
+    args = parser.parse_args()
+
+    with crear_sesion_bcrp() as sesion:
+        for serie, opciones in SERIES_BCRP.items():
+            nuevas = sincronizar_serie_bcrp(
+                serie, directorio=args.directorio, sesion=sesion, **opciones
+            )
+            print(f"{serie}: {len(nuevas)} filas nuevas")
+
+
+if __name__ == "__main__":
+    main()
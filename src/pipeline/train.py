@@ -4,24 +4,48 @@ import json
 import logging
 import os
 import sys
+import time
+import traceback
 from datetime import datetime
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-import joblib
 import numpy as np
 import pandas as pd
 from prophet import Prophet
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
+from src.pipeline.almacen_memmap import ARCHIVO_INDICE, leer_acciones_memmap
+from src.pipeline.almacenamiento import (
+    ARCHIVO_CATALOGO,
+    leer_acciones_parquet,
+    leer_varias_acciones_parquet,
+    ruta_particion,
+)
+from src.pipeline.cache import CACHE_FUENTES
 from src.pipeline.config import (
     RUTA_AFP_HABITAT,
     RUTA_AFP_INTEGRA,
     RUTA_AFP_PRIMA,
     RUTA_AFP_PROFUTURO,
+    RUTA_DATASET,
     RUTA_DATOS,
+    RUTA_MEMMAP,
     RUTA_SP500,
 )
+from src.pipeline.instrumentacion import (
+    activar_instrumentacion,
+    contexto_ticker,
+    medir_fase,
+)
+from src.pipeline.manifiesto import esta_actualizado, huella_datos
 from src.pipeline.preprocesamiento import limpiar_datos_bcrp
+from src.pipeline.pronosticos import directorio_pronosticos, materializar_pronostico
+from src.pipeline.registro_modelos import registrar_modelo
+from src.pipeline.serializacion import (
+    cargar_modelo_ticker,
+    guardar_modelo_archivo,
+    ruta_modelo,
+)
 
 # Crear directorio de logs si no existe
 os.makedirs("logs", exist_ok=True)
@@ -34,10 +58,183 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+BACKENDS_ACCIONES = ("csv", "parquet", "memmap")
+
+EQUIVALENCIAS_AFP = {
+    "INTEGRA": RUTA_AFP_INTEGRA,
+    "PRIMA": RUTA_AFP_PRIMA,
+    "HABITAT": RUTA_AFP_HABITAT,
+    "PROFUTURO": RUTA_AFP_PROFUTURO,
+}
+
+# Series que no se leen del archivo de acciones
+SERIES_ESPECIALES = ["S&P500", *EQUIVALENCIAS_AFP]
+
+FORMATOS_MULTI = ("largo", "ancho")
+
+# Hiperparámetros de entrenar_prophet usados en el entrenamiento masivo
+HIPERPARAMETROS = {
+    "estacionalidad_anual": True,
+    "estacionalidad_semanal": True,
+    "estacionalidad_diaria": False,
+    "cambio_punto": 0.05,
+}
+
+# Almacenes anteriores al CSV ya avisados, para no repetir el aviso por ticker
+_ALMACENES_VIEJOS = set()
+
+
+def _almacen_vigente(marca: str) -> bool:
+    """Indica si un almacén derivado del CSV existe y no es anterior a él.
+
+    ``marca`` es el archivo que el almacén escribe al construirse; si el CSV
+    se modificó después, el almacén tiene precios viejos.
+    """
+    if not os.path.exists(marca):
+        return False
+    if os.path.exists(RUTA_DATOS) and os.path.getmtime(marca) < os.path.getmtime(
+        RUTA_DATOS
+    ):
+        if marca not in _ALMACENES_VIEJOS:
+            _ALMACENES_VIEJOS.add(marca)
+            logger.warning(f"{marca} es anterior a {RUTA_DATOS}; se lee el CSV")
+        return False
+    return True
+
+
+def _resolver_backend(backend: Optional[str]) -> str:
+    """Elige el backend de lectura de acciones.
+
+    Con ``None`` se usa el almacén binario o el dataset Parquet si ya fueron
+    generados después de la última modificación del CSV y, si no, el CSV.
+    """
+    if backend is None:
+        if _almacen_vigente(os.path.join(RUTA_MEMMAP, ARCHIVO_INDICE)):
+            return "memmap"
+        if _almacen_vigente(os.path.join(RUTA_DATASET, ARCHIVO_CATALOGO)):
+            return "parquet"
+        return "csv"
+    if backend not in BACKENDS_ACCIONES:
+        raise ValueError(
+            f"Backend {backend} no soportado. Opciones: {BACKENDS_ACCIONES}"
+        )
+    return backend
+
+
+def _ordenar_por_fecha(df: pd.DataFrame) -> pd.DataFrame:
+    """Deja la serie con columnas ``ds``/``y`` ordenada por fecha."""
+    df = df[["ds", "y"]]
+    if not df["ds"].is_monotonic_increasing:
+        df = df.sort_values("ds", kind="stable")
+    return df.reset_index(drop=True)
+
+
+def _leer_sp500() -> pd.DataFrame:
+    """Lee el índice S&P500 como serie ``ds``/``y`` ordenada por fecha."""
+    df = pd.read_csv(RUTA_SP500)
+    df["ds"] = pd.to_datetime(df["Date"])
+    df = df.rename(columns={"S&P500": "y"})
+    return _ordenar_por_fecha(df)
+
+
+def _leer_afp(ruta_archivo: str) -> pd.DataFrame:
+    """Lee y limpia la rentabilidad de una AFP descargada del BCRP."""
+    df = pd.read_csv(
+        ruta_archivo, encoding="ISO-8859-1", skiprows=1, names=["periodo", "valor"]
+    )
+    df = df.dropna()
+    df = df[df["valor"] != "n.d."]
+    df = limpiar_datos_bcrp(df, True, False, None)
+    df = df.rename(columns={"periodo_limpio": "ds", "valor_limpio": "y"})
+    return _ordenar_por_fecha(df)
+
+
+def _leer_acciones_csv() -> pd.DataFrame:
+    """Lee el CSV de acciones ordenado por símbolo y fecha.
+
+    Con el orden por símbolo, las filas de cada acción forman un bloque
+    contiguo que se ubica con búsqueda binaria en lugar de una máscara sobre
+    todo el archivo.
+    """
+    df = pd.read_csv(RUTA_DATOS)
+    try:
+        df = df[["Symbol", "Date", "Close"]].dropna()
+    except KeyError:
+        raise ValueError(f"El archivo {RUTA_DATOS} no tiene el formato esperado")
+    df = pd.DataFrame(
+        {"Symbol": df["Symbol"], "ds": pd.to_datetime(df["Date"]), "y": df["Close"]}
+    )
+    df = df.sort_values(["Symbol", "ds"], kind="stable")
+    return df.reset_index(drop=True)
+
+
+def _bloque_simbolo(acciones: pd.DataFrame, tick: str) -> pd.DataFrame:
+    """Ubica con búsqueda binaria las filas de un símbolo en el CSV ordenado."""
+    simbolos = acciones["Symbol"]
+    inicio = simbolos.searchsorted(tick, side="left")
+    fin = simbolos.searchsorted(tick, side="right")
+    return acciones.iloc[inicio:fin, 1:]
+
+
+def _leer_especial(tick: str) -> pd.DataFrame:
+    """Lee las series que no vienen del archivo de acciones (S&P500 y AFP)."""
+    if tick == "S&P500":
+        return CACHE_FUENTES.obtener(RUTA_SP500, _leer_sp500)
+    ruta_archivo = EQUIVALENCIAS_AFP[tick]
+    return CACHE_FUENTES.obtener(ruta_archivo, lambda: _leer_afp(ruta_archivo))
+
+
+def _leer_acciones(
+    tick: str, fecha_inicio: str, fecha_corte: str, backend: Optional[str]
+) -> pd.DataFrame:
+    """Lee los precios de una acción desde el backend indicado."""
+    backend = _resolver_backend(backend)
+    if backend == "csv":
+        acciones = CACHE_FUENTES.obtener(RUTA_DATOS, _leer_acciones_csv)
+        return _bloque_simbolo(acciones, tick)
+
+    if backend == "memmap":
+        # Vista directa sobre el archivo mapeado: no pasa por la caché
+        df = leer_acciones_memmap(tick, fecha_inicio, fecha_corte, RUTA_MEMMAP)
+        df.columns = ["ds", "y"]
+        return df
+
+    # Solo se lee la partición del símbolo y los row groups del rango
+    ruta_archivo = ruta_particion(tick, RUTA_DATASET)
+    if not os.path.exists(ruta_archivo):
+        raise ValueError(f"El símbolo {tick} no existe en el archivo de datos")
+    return CACHE_FUENTES.obtener(
+        ruta_archivo,
+        lambda: leer_acciones_parquet(tick, fecha_inicio, fecha_corte, RUTA_DATASET)
+        .rename(columns={"Date": "ds", "Close": "y"})
+        .dropna(),
+        variante=(fecha_inicio, fecha_corte),
+    )
+
+
+def _recortar_por_fecha(
+    df: pd.DataFrame, fecha_inicio: str, fecha_corte: str
+) -> pd.DataFrame:
+    """Recorta una serie ordenada por ``ds`` al rango [inicio, corte].
+
+    El rango se ubica con búsqueda binaria y se devuelve una vista del
+    DataFrame, por lo que el costo no depende del largo del historial.
+    """
+    fechas = df["ds"].to_numpy()
+    inicio = fechas.searchsorted(np.datetime64(pd.Timestamp(fecha_inicio)), "left")
+    fin = fechas.searchsorted(np.datetime64(pd.Timestamp(fecha_corte)), "right")
+    return df.iloc[inicio:fin]
 
-def cargar_datos(tick: str, fecha_inicio: str, fecha_corte: str) -> pd.DataFrame:
+
+def cargar_datos(
+    tick: str, fecha_inicio: str, fecha_corte: str, backend: Optional[str] = None
+) -> pd.DataFrame:
     """Carga y prepara los datos para el modelo Prophet.
 
+    Todas las fuentes se mantienen ordenadas por fecha y el rango se extrae
+    con búsqueda binaria. El DataFrame devuelto puede ser una vista de los
+    datos en caché, por lo que no debe modificarse in-place.
+
     Parameters
     ----------
     tick : str
@@ -46,59 +243,19 @@ def cargar_datos(tick: str, fecha_inicio: str, fecha_corte: str) -> pd.DataFrame
         Fecha de inicio en formato 'YYYY-MM-DD'.
     fecha_corte : str
         Fecha de corte en formato 'YYYY-MM-DD'.
+    backend : str, optional
+        Origen de los precios de acciones: ``"csv"`` (RUTA_DATOS),
+        ``"parquet"`` (RUTA_DATASET) o ``"memmap"`` (RUTA_MEMMAP). Por
+        defecto se usa el almacén más rápido disponible que no sea anterior
+        al CSV.
 
     Returns
     -------
     pd.DataFrame
-        DataFrame con los datos preparados para Prophet.
+        DataFrame con las columnas ``ds`` e ``y`` ordenado por fecha.
     """
     logger.info(f"Cargando datos para {tick} desde {fecha_inicio} hasta {fecha_corte}")
 
-    # Cargar datos
-    if tick == "S&P500":
-        ruta_archivo = os.path.join(RUTA_SP500)
-        df = pd.read_csv(ruta_archivo)
-        df["fecha"] = pd.to_datetime(df["Date"])
-        df = df.drop(columns=["Date"])
-        df = df.rename(columns={"S&P500": "y"})
-        df = df[["fecha", "y"]]
-    elif tick in ["INTEGRA", "PRIMA", "HABITAT", "PROFUTURO"]:
-        equivalencias_afp = {
-            "INTEGRA": RUTA_AFP_INTEGRA,
-            "PRIMA": RUTA_AFP_PRIMA,
-            "HABITAT": RUTA_AFP_HABITAT,
-            "PROFUTURO": RUTA_AFP_PROFUTURO,
-        }
-        ruta_archivo = os.path.join(equivalencias_afp[tick])
-        df = pd.read_csv(
-            ruta_archivo, encoding="ISO-8859-1", skiprows=1, names=["periodo", "valor"]
-        )
-        df = df.dropna()
-        df = df[df["valor"] != "n.d."]
-        df = limpiar_datos_bcrp(df, True, False, None)
-        df = df[["periodo_limpio", "valor_limpio"]]
-        df = df.rename(columns={"periodo_limpio": "fecha", "valor_limpio": "y"})
-    else:
-        ruta_archivo = os.path.join(RUTA_DATOS)
-        df = pd.read_csv(ruta_archivo)
-        try:
-            df = df[df["Symbol"] == tick][["Date", "Symbol", "Close"]]
-        except KeyError:
-            raise ValueError(f"El símbolo {tick} no existe en el archivo de datos")
-
-        # Convertir columna de fecha a datetime
-        df["fecha"] = pd.to_datetime(df["Date"])
-        df = df.dropna(inplace=False)
-        df = df.rename(columns={"Close": "y"})
-
-    # Filtrar por rango de fechas
-    fecha_min = df["fecha"].min()
-    fecha_max = df["fecha"].max()
-
-    if pd.Timestamp(fecha_inicio) < pd.Timestamp(fecha_min):
-        df = df[df["fecha"] >= pd.Timestamp(fecha_inicio)]
-    if pd.Timestamp(fecha_corte) > pd.Timestamp(fecha_max):
-        df = df[df["fecha"] <= pd.Timestamp(fecha_corte)]
     if pd.Timestamp(fecha_inicio) > pd.Timestamp(fecha_corte):
         logger.error(
             f"Fecha inicio ({fecha_inicio}) posterior a fecha corte ({fecha_corte})"
@@ -106,25 +263,210 @@ def cargar_datos(tick: str, fecha_inicio: str, fecha_corte: str) -> pd.DataFrame
         raise ValueError(
             f"fecha inicio ({fecha_inicio}) posterior a la fecha corte ({fecha_corte})"
         )
-    df = df[
-        (df["fecha"] >= pd.Timestamp(fecha_inicio))
-        & (df["fecha"] <= pd.Timestamp(fecha_corte))
-    ]
 
-    # Preparar datos para Prophet
-    df_prophet = df.rename(columns={"fecha": "ds"})
+    with medir_fase("cargar_datos", tick):
+        # Cargar datos (las fuentes ya leídas se sirven desde la caché)
+        if tick in SERIES_ESPECIALES:
+            df = _leer_especial(tick)
+        else:
+            df = _leer_acciones(tick, fecha_inicio, fecha_corte, backend)
+
+        # Filtrar por rango de fechas
+        df_prophet = _recortar_por_fecha(df, fecha_inicio, fecha_corte)
 
-    logger.info(f"Datos cargados: {len(df)} registros")
+    logger.info(f"Datos cargados: {len(df_prophet)} registros")
 
     return df_prophet
 
 
+def _leer_varias_acciones(
+    ticks: List[str], fecha_inicio: str, fecha_corte: str, backend: Optional[str]
+) -> Dict[str, pd.DataFrame]:
+    """Lee varios símbolos de acciones con una sola lectura de la fuente."""
+    backend = _resolver_backend(backend)
+    if backend == "csv":
+        acciones = CACHE_FUENTES.obtener(RUTA_DATOS, _leer_acciones_csv)
+        series = {tick: _bloque_simbolo(acciones, tick) for tick in ticks}
+    elif backend == "memmap":
+        # Todas las series salen del mismo mapeo del almacén
+        series = {
+            tick: _leer_acciones(tick, fecha_inicio, fecha_corte, backend)
+            for tick in ticks
+        }
+    else:
+        df = leer_varias_acciones_parquet(
+            ticks, fecha_inicio, fecha_corte, RUTA_DATASET
+        )
+        df = df.rename(columns={"Date": "ds", "Close": "y"}).dropna()
+        series = {
+            tick: grupo[["ds", "y"]]
+            for tick, grupo in df.groupby("Symbol", sort=False, observed=True)
+        }
+
+    faltantes = [
+        tick for tick in ticks if series.get(tick) is None or series[tick].empty
+    ]
+    if faltantes:
+        raise ValueError(f"Los símbolos {faltantes} no existen en el archivo de datos")
+    return series
+
+
+def cargar_datos_multi(
+    ticks: List[str],
+    fecha_inicio: str,
+    fecha_corte: str,
+    formato: str = "largo",
+    backend: Optional[str] = None,
+) -> pd.DataFrame:
+    """Carga varias series en una sola pasada por cada fuente.
+
+    Las acciones se leen con una única lectura del backend y las series del
+    S&P500 y de las AFP se resuelven en la misma llamada.
+
+    Parameters
+    ----------
+    ticks : List[str]
+        Símbolos a cargar (acciones, ``"S&P500"`` o nombres de AFP).
+    fecha_inicio : str
+        Fecha de inicio en formato 'YYYY-MM-DD'.
+    fecha_corte : str
+        Fecha de corte en formato 'YYYY-MM-DD'.
+    formato : str, optional
+        ``"largo"`` devuelve las columnas ``tick``, ``ds`` e ``y``;
+        ``"ancho"`` devuelve un panel fechas × ticks de tipo ``float64``.
+        Por defecto ``"largo"``.
+    backend : str, optional
+        Origen de los precios de acciones, como en ``cargar_datos``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Series de todos los símbolos en el formato pedido.
+
+    Raises
+    ------
+    ValueError
+        Si el formato o el rango de fechas no son válidos o algún símbolo no
+        existe.
+    """
+    if formato not in FORMATOS_MULTI:
+        raise ValueError(f"Formato {formato} no soportado. Opciones: {FORMATOS_MULTI}")
+    if pd.Timestamp(fecha_inicio) > pd.Timestamp(fecha_corte):
+        raise ValueError(
+            f"fecha inicio ({fecha_inicio}) posterior a la fecha corte ({fecha_corte})"
+        )
+    ticks = list(dict.fromkeys(ticks))
+    logger.info(
+        f"Cargando {len(ticks)} series desde {fecha_inicio} hasta {fecha_corte}"
+    )
+
+    series = {tick: _leer_especial(tick) for tick in ticks if tick in SERIES_ESPECIALES}
+    acciones = [tick for tick in ticks if tick not in SERIES_ESPECIALES]
+    if acciones:
+        series.update(
+            _leer_varias_acciones(acciones, fecha_inicio, fecha_corte, backend)
+        )
+
+    largo = pd.concat(
+        [
+            _recortar_por_fecha(series[tick], fecha_inicio, fecha_corte).assign(
+                tick=tick
+            )
+            for tick in ticks
+        ],
+        ignore_index=True,
+    )[["tick", "ds", "y"]]
+    logger.info(f"Datos cargados: {len(largo)} registros")
+
+    if formato == "largo":
+        return largo
+    panel = largo.pivot(index="ds", columns="tick", values="y")
+    return panel.reindex(columns=ticks).astype("float64")
+
+
+def parametros_iniciales(modelo: Prophet) -> Dict[str, object]:
+    """Extrae los parámetros ajustados de un modelo para iniciar otro ajuste.
+
+    Parameters
+    ----------
+    modelo : Prophet
+        Modelo ya entrenado.
+
+    Returns
+    -------
+    Dict[str, object]
+        Valores de ``k``, ``m``, ``sigma_obs``, ``delta`` y ``beta`` en el
+        formato que espera ``Prophet.fit(df, init=...)``. Si se ajustó con MCMC
+        se usa la media de las muestras.
+    """
+    iniciales: Dict[str, object] = {}
+    for nombre in ["k", "m", "sigma_obs"]:
+        iniciales[nombre] = float(np.mean(modelo.params[nombre]))
+    for nombre in ["delta", "beta"]:
+        iniciales[nombre] = np.mean(modelo.params[nombre], axis=0)
+    return iniciales
+
+
+def parametros_prophet(
+    estacionalidad_anual: bool = True,
+    estacionalidad_semanal: bool = True,
+    estacionalidad_diaria: bool = False,
+    cambio_punto: float = 0.05,
+) -> Dict[str, object]:
+    """Traduce los hiperparámetros de ``entrenar_prophet`` a los de ``Prophet``.
+
+    Returns
+    -------
+    Dict[str, object]
+        Argumentos para ``Prophet(**parametros)``.
+    """
+    return {
+        "yearly_seasonality": estacionalidad_anual,
+        "weekly_seasonality": estacionalidad_semanal,
+        "daily_seasonality": estacionalidad_diaria,
+        "changepoint_prior_scale": cambio_punto,
+    }
+
+
+def predecir_puntual(modelo: Prophet, df: Optional[pd.DataFrame] = None) -> np.ndarray:
+    """Calcula solo la predicción puntual ``yhat`` de un modelo ajustado.
+
+    Equivale a ``modelo.predict(df)["yhat"]`` pero sin la simulación de
+    intervalos de incertidumbre (``uncertainty_samples`` muestras por fila),
+    que domina el costo de ``predict`` en series largas.
+
+    Parameters
+    ----------
+    modelo : Prophet
+        Modelo ya entrenado.
+    df : pd.DataFrame, optional
+        Fechas a predecir (columna ``ds``). Si es ``None`` se usa la historia
+        del ajuste.
+
+    Returns
+    -------
+    np.ndarray
+        Valores de ``yhat`` ordenados por fecha, como en ``predict``.
+    """
+    if df is None:
+        df = modelo.history
+    else:
+        df = modelo.setup_dataframe(df.copy())
+    tendencia = np.asarray(modelo.predict_trend(df))
+    componentes = modelo.predict_seasonal_components(df)
+    return (
+        tendencia * (1 + componentes["multiplicative_terms"].to_numpy())
+        + componentes["additive_terms"].to_numpy()
+    )
+
+
 def entrenar_prophet(
     df: pd.DataFrame,
     estacionalidad_anual: bool = True,
     estacionalidad_semanal: bool = True,
     estacionalidad_diaria: bool = False,
     cambio_punto: float = 0.05,
+    modelo_previo: Optional[Prophet] = None,
 ) -> Tuple[Prophet, Dict[str, float]]:
     """Entrena un modelo Prophet.
 
@@ -140,6 +482,10 @@ def entrenar_prophet(
         Si se debe considerar estacionalidad diaria, por defecto False.
     cambio_punto : float, optional
         Parámetro de cambio de tendencia, por defecto 0.05.
+    modelo_previo : Prophet, optional
+        Modelo entrenado con una versión anterior de la serie. Sus parámetros
+        inician el optimizador (*warm start*); los que no tengan la forma
+        esperada se ignoran y se usa el inicio por defecto.
 
     Returns
     -------
@@ -156,34 +502,52 @@ def entrenar_prophet(
 
     # Configurar modelo
     modelo = Prophet(
-        yearly_seasonality=estacionalidad_anual,
-        weekly_seasonality=estacionalidad_semanal,
-        daily_seasonality=estacionalidad_diaria,
-        changepoint_prior_scale=cambio_punto,
+        **parametros_prophet(
+            estacionalidad_anual,
+            estacionalidad_semanal,
+            estacionalidad_diaria,
+            cambio_punto,
+        )
     )
 
     # Ajustar modelo
     logger.info("Ajustando modelo...")
-    modelo.fit(df)
+    with medir_fase("fit", filas=len(df), warm_start=modelo_previo is not None):
+        if modelo_previo is not None:
+            modelo.fit(df, init=parametros_iniciales(modelo_previo))
+        else:
+            modelo.fit(df)
 
-    # Realizar predicciones en el conjunto de entrenamiento
+    # Realizar predicciones puntuales en el conjunto de entrenamiento
     logger.info("Calculando métricas...")
-    futuro = modelo.make_future_dataframe(periods=0)
-    predicciones = modelo.predict(futuro)
-
-    # Calcular métricas
-    metricas = {
-        "mse": mean_squared_error(df["y"], predicciones["yhat"][: len(df)]),
-        "rmse": np.sqrt(mean_squared_error(df["y"], predicciones["yhat"][: len(df)])),
-        "mae": mean_absolute_error(df["y"], predicciones["yhat"][: len(df)]),
-        "r2": r2_score(df["y"], predicciones["yhat"][: len(df)]),
-    }
+    with medir_fase("metricas"):
+        real = modelo.history["y"].to_numpy()
+        yhat = predecir_puntual(modelo)
+
+        # Calcular métricas
+        metricas = {
+            "mse": mean_squared_error(real, yhat),
+            "rmse": np.sqrt(mean_squared_error(real, yhat)),
+            "mae": mean_absolute_error(real, yhat),
+            "r2": r2_score(real, yhat),
+        }
 
     logger.info(f"Métricas calculadas: {metricas}")
     return modelo, metricas
 
 
-def guardar_modelo(modelo, tick, metricas, directorio=None):
+def guardar_modelo(
+    modelo,
+    tick,
+    metricas,
+    directorio=None,
+    hiperparametros=None,
+    formato=None,
+    huella=None,
+    codec=None,
+    nivel=None,
+    wal=True,
+):
     """
     Guarda el modelo Prophet y las métricas en el directorio especificado.
 
@@ -193,17 +557,132 @@ def guardar_modelo(modelo, tick, metricas, directorio=None):
         tick: Ticker de la acción (str).
         metricas: Diccionario de métricas.
         directorio: Carpeta donde guardar los archivos. Si es None, usa RUTA_MODELOS.
+        hiperparametros: Diccionario de hiperparámetros con que se entrenó. Si
+            no es None se guarda en ``hiperparametros_{tick}.json``.
+        formato: ``"joblib"`` (``prophet_{tick}.joblib``) o ``"compacto"``
+            (``prophet_{tick}.json.gz``, ver ``serializacion``). Si es None,
+            usa FORMATO_MODELO.
+        huella: Huella de los datos de entrenamiento (ver ``huella_datos``)
+            que se anota en el registro de modelos.
+        codec: Códec de compresión del modelo (``"zstd"``, ``"lz4"``,
+            ``"gzip"`` o ``"none"``, ver ``compresion``). Si es None, usa
+            CODEC_MODELO.
+        nivel: Nivel de compresión. Si es None, usa NIVEL_MODELO.
+        wal: Abrir el registro de modelos en modo WAL (por defecto). Con
+            escritores en varias máquinas debe ser False.
+
+    El modelo se registra como nueva versión del ticker en el registro de
+    modelos del directorio (ver ``registro_modelos``).
+
+    Returns
+    -------
+        Ruta del modelo guardado (str).
     """
-    from src.pipeline.config import RUTA_MODELOS
+    from src.pipeline.config import (
+        CODEC_MODELO,
+        FORMATO_MODELO,
+        NIVEL_MODELO,
+        RUTA_MODELOS,
+    )
 
     if directorio is None:
         directorio = RUTA_MODELOS
     os.makedirs(directorio, exist_ok=True)
-    modelo_path = os.path.join(directorio, f"prophet_{tick}.joblib")
+    modelo_path = ruta_modelo(tick, directorio, formato or FORMATO_MODELO)
     metricas_path = os.path.join(directorio, f"metricas_{tick}.json")
-    joblib.dump(modelo, modelo_path)
-    with open(metricas_path, "w") as f:
-        json.dump(metricas, f)
+    with medir_fase("guardar", tick):
+        guardar_modelo_archivo(
+            modelo,
+            modelo_path,
+            codec or CODEC_MODELO,
+            NIVEL_MODELO if nivel is None else nivel,
+        )
+        with open(metricas_path, "w") as f:
+            json.dump(metricas, f)
+        if hiperparametros is not None:
+            hiperparametros_path = os.path.join(
+                directorio, f"hiperparametros_{tick}.json"
+            )
+            with open(hiperparametros_path, "w") as f:
+                json.dump(hiperparametros, f, indent=2)
+        registrar_modelo(
+            tick, modelo_path, metricas, huella, hiperparametros, directorio, wal=wal
+        )
+    return modelo_path
+
+
+def entrenar_ticker(
+    ticker: str,
+    fecha_inicio: str,
+    fecha_fin: str,
+    directorio: str,
+    entrada: Optional[Dict[str, Any]] = None,
+    warm_start: bool = False,
+    materializar: bool = False,
+    origen: str = "train_models",
+    wal: bool = True,
+) -> Dict[str, Any]:
+    """Entrena y guarda el modelo de un ticker sin propagar errores.
+
+    Es la unidad de trabajo del entrenamiento masivo (``train_models``) y de
+    la cola de trabajos (``cola_trabajos``). Si ``entrada`` (la del
+    manifiesto) coincide con la huella de los datos actuales y con
+    ``HIPERPARAMETROS`` no se reentrena. Con ``warm_start`` el ajuste parte de
+    los parámetros del modelo guardado, si existe. Con ``materializar`` se
+    guarda además la tabla de pronósticos del modelo. ``wal`` se pasa a
+    ``guardar_modelo`` para el registro de modelos. El manifiesto no se
+    modifica: lo actualiza quien llama, con ``registrar_entrenamiento``.
+
+    Returns
+    -------
+    Dict[str, Any]
+        ``ticker``, ``estado`` (``'ok'``, ``'sin_cambios'``, ``'sin_datos'`` o
+        ``'error'``), ``segundos`` y, según el estado, ``huella``, ``filas``,
+        ``metricas``, ``ruta_modelo``, ``error`` y ``traza``.
+    """
+    inicio = time.perf_counter()
+    resultado: Dict[str, Any] = {"ticker": ticker}
+    try:
+        with contexto_ticker(ticker), medir_fase("total", origen=origen):
+            df = cargar_datos(ticker, fecha_inicio, fecha_fin)
+            df = df.dropna()
+            if df.empty:
+                resultado["estado"] = "sin_datos"
+            else:
+                huella = huella_datos(df)
+                resultado.update(huella=huella, filas=len(df))
+                if esta_actualizado(entrada, huella, HIPERPARAMETROS):
+                    resultado["estado"] = "sin_cambios"
+                else:
+                    previo = (
+                        cargar_modelo_ticker(ticker, directorio) if warm_start else None
+                    )
+                    modelo, metricas = entrenar_prophet(
+                        df, modelo_previo=previo, **HIPERPARAMETROS
+                    )
+                    ruta_modelo = guardar_modelo(
+                        modelo, ticker, metricas, directorio, huella=huella, wal=wal
+                    )
+                    if materializar:
+                        with medir_fase("materializar"):
+                            materializar_pronostico(
+                                modelo,
+                                ticker,
+                                directorio=directorio_pronosticos(directorio),
+                            )
+                    resultado.update(
+                        estado="ok",
+                        metricas={k: float(v) for k, v in metricas.items()},
+                        ruta_modelo=ruta_modelo,
+                    )
+    except Exception as exc:
+        resultado.update(
+            estado="error",
+            error=f"{type(exc).__name__}: {exc}",
+            traza=traceback.format_exc(),
+        )
+    resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+    return resultado
 
 
 def main():
@@ -247,8 +726,15 @@ def main():
         help="Parámetro de cambio de tendencia",
     )
 
+    parser.add_argument(
+        "--materializar",
+        action="store_true",
+        help="Guardar la tabla de pronósticos del modelo",
+    )
+
     # Parsear argumentos
     args = parser.parse_args()
+    activar_instrumentacion()
 
     # Validar fechas
     try:
@@ -263,23 +749,29 @@ def main():
         raise ValueError("La fecha de inicio debe ser anterior a la fecha de corte")
 
     try:
-        # Cargar datos
-        logger.info(f"Cargando datos para {args.tick}...")
-        df = cargar_datos(args.tick, args.fecha_inicio, args.fecha_corte)
-
-        # Entrenar modelo
-        logger.info("Entrenando modelo Prophet...")
-        modelo, metricas = entrenar_prophet(
-            df,
-            args.estacionalidad_anual,
-            args.estacionalidad_semanal,
-            args.estacionalidad_diaria,
-            args.cambio_punto,
-        )
-
-        # Guardar modelo y métricas
-        logger.info("Guardando modelo y métricas...")
-        guardar_modelo(modelo, args.tick, metricas)
+        with contexto_ticker(args.tick), medir_fase("total"):
+            # Cargar datos
+            logger.info(f"Cargando datos para {args.tick}...")
+            df = cargar_datos(args.tick, args.fecha_inicio, args.fecha_corte)
+
+            # Entrenar modelo
+            logger.info("Entrenando modelo Prophet...")
+            modelo, metricas = entrenar_prophet(
+                df,
+                args.estacionalidad_anual,
+                args.estacionalidad_semanal,
+                args.estacionalidad_diaria,
+                args.cambio_punto,
+            )
+
+            # Guardar modelo y métricas
+            logger.info("Guardando modelo y métricas...")
+            guardar_modelo(modelo, args.tick, metricas)
+
+            if args.materializar:
+                logger.info("Materializando tabla de pronósticos...")
+                with medir_fase("materializar"):
+                    materializar_pronostico(modelo, args.tick)
 
         # Mostrar métricas
         logger.info("\nMétricas de rendimiento:")
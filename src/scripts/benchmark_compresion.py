@@ -0,0 +1,161 @@
+"""Benchmark de los códecs de compresión de modelos y predicciones.
+
+Para cada modelo ``prophet_*`` de ``--directorio`` (o, si no hay, para
+``--series`` modelos entrenados con series sintéticas) y cada códec de
+``compresion.CODECS`` se mide, en ambos formatos de modelo (joblib y
+compacto):
+
+* tamaño en disco,
+* tiempo de escritura (``guardar_modelo_archivo``) y
+* tiempo de lectura (``cargar_modelo_archivo``),
+
+como mediana de ``--repeticiones``. Lo mismo se mide para el Parquet de la
+predicción de ``--dias-prediccion`` días hábiles de cada modelo. Se informan
+los totales por formato y códec.
+
+Uso::
+
+    python src/scripts/benchmark_compresion.py --directorio src/models
+    python src/scripts/benchmark_compresion.py --codecs zstd lz4 --nivel 9
+"""
+
+import argparse
+import glob
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(project_root)
+
+from src.pipeline.compresion import CODECS, opciones_parquet  # noqa
+from src.pipeline.config import RUTA_MODELOS  # noqa
+from src.pipeline.serializacion import (  # noqa
+    EXTENSION_COMPACTO,
+    EXTENSION_JOBLIB,
+    cargar_modelo_archivo,
+    guardar_modelo_archivo,
+)
+from src.pipeline.train import entrenar_prophet  # noqa
+
+
+def _modelos_sinteticos(series: int, dias: int, directorio: str):
+    """Entrena modelos con paseos aleatorios y los guarda con joblib."""
+    for semilla in range(series):
+        rng = np.random.default_rng(semilla)
+        df = pd.DataFrame(
+            {
+                "ds": pd.bdate_range("2015-01-01", periods=dias),
+                "y": 100 + np.cumsum(rng.normal(0, 1, dias)),
+            }
+        )
+        modelo, _ = entrenar_prophet(df)
+        guardar_modelo_archivo(
+            modelo, os.path.join(directorio, f"prophet_S{semilla}.joblib")
+        )
+
+
+def _mediana_ms(funcion, repeticiones: int) -> float:
+    """Mediana en milisegundos de ejecutar ``funcion``."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def _medir(escribir, leer, ruta: str, repeticiones: int) -> np.ndarray:
+    """Tamaño (KB), escritura (ms) y lectura (ms) de un artefacto."""
+    escritura = _mediana_ms(escribir, repeticiones)
+    return np.array(
+        [os.path.getsize(ruta) / 1024, escritura, _mediana_ms(leer, repeticiones)]
+    )
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Tamaño y tiempos de escritura y lectura por códec."
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Modelos a medir"
+    )
+    parser.add_argument(
+        "--codecs", nargs="+", default=list(CODECS), help="Códecs a comparar"
+    )
+    parser.add_argument(
+        "--nivel", type=int, default=None, help="Nivel (por defecto, el del códec)"
+    )
+    parser.add_argument(
+        "--series", type=int, default=5, help="Modelos sintéticos si no hay"
+    )
+    parser.add_argument("--dias", type=int, default=1250, help="Días hábiles")
+    parser.add_argument(
+        "--dias-prediccion", type=int, default=252, help="Días de la predicción"
+    )
+    parser.add_argument("--repeticiones", type=int, default=10, help="Repeticiones")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    totales = defaultdict(lambda: np.zeros(3))
+    with tempfile.TemporaryDirectory() as tmp:
+        rutas = sorted(glob.glob(os.path.join(args.directorio, "prophet_*")))
+        if not rutas:
+            _modelos_sinteticos(args.series, args.dias, tmp)
+            rutas = sorted(glob.glob(os.path.join(tmp, "prophet_*")))
+
+        for ruta in rutas:
+            modelo = cargar_modelo_archivo(ruta)
+            futuro = modelo.make_future_dataframe(
+                args.dias_prediccion, freq="B", include_history=False
+            )
+            prediccion = modelo.predict(futuro)
+            for codec in args.codecs:
+                for formato, extension in (
+                    ("joblib", EXTENSION_JOBLIB),
+                    ("compacto", EXTENSION_COMPACTO),
+                ):
+                    destino = os.path.join(tmp, f"modelo_{codec}{extension}")
+                    totales[formato, codec] += _medir(
+                        lambda: guardar_modelo_archivo(
+                            modelo, destino, codec, args.nivel
+                        ),
+                        lambda: cargar_modelo_archivo(destino),
+                        destino,
+                        args.repeticiones,
+                    )
+                destino = os.path.join(tmp, f"prediccion_{codec}.parquet")
+                totales["prediccion", codec] += _medir(
+                    lambda: prediccion.to_parquet(
+                        destino, **opciones_parquet(codec, args.nivel)
+                    ),
+                    lambda: pd.read_parquet(destino),
+                    destino,
+                    args.repeticiones,
+                )
+
+    print(f"{len(rutas)} modelos, nivel={args.nivel or 'por defecto'}")
+    print(
+        f"{'artefacto':12s} {'códec':6s} {'tamaño':>10s} {'escritura':>11s} "
+        f"{'lectura':>10s}"
+    )
+    orden = ["joblib", "compacto", "prediccion"]
+    for (artefacto, codec), (kb, escritura, lectura) in sorted(
+        totales.items(), key=lambda item: orden.index(item[0][0])
+    ):
+        print(
+            f"{artefacto:12s} {codec:6s} {kb:8.1f}KB {escritura:9.1f}ms "
+            f"{lectura:8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark de la descarga de series del BCRP.
+
+Levanta un servidor HTTP local que imita la API con una latencia fija por
+petición y compara la descarga secuencial (``requests.get`` sin sesión) con
+``obtener_series_bcrp`` (pool de hilos sobre una sesión compartida).
+
+Uso::
+
+    python src/scripts/benchmark_descarga_bcrp.py --series 24 --latencia 0.2
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(project_root)
+
+from src.pipeline.preprocesamiento import (  # noqa
+    obtener_datos_bcrp,
+    obtener_series_bcrp,
+)
+
+
+class _ServidorLento(BaseHTTPRequestHandler):
+    """Responde cada serie con 120 meses tras esperar ``latencia`` segundos."""
+
+    protocol_version = "HTTP/1.1"
+    latencia = 0.2
+
+    def do_GET(self):  # noqa: N802
+        time.sleep(self.latencia)
+        periodos = [
+            {"name": f"Ene.{anio}", "values": [str(anio)]} for anio in range(120)
+        ]
+        cuerpo = json.dumps({"periods": periodos}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la descarga de series del BCRP."
+    )
+    parser.add_argument("--series", type=int, default=24, help="Series a pedir")
+    parser.add_argument(
+        "--latencia", type=float, default=0.2, help="Latencia por petición (s)"
+    )
+    parser.add_argument(
+        "--concurrencia", type=int, default=8, help="Peticiones simultáneas"
+    )
+    args = parser.parse_args()
+
+    _ServidorLento.latencia = args.latencia
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ServidorLento)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/"
+    series = [f"PN{i:05d}MM/json" for i in range(args.series)]
+
+    inicio = time.perf_counter()
+    secuencial = {s: obtener_datos_bcrp(s, url_base=url) for s in series}
+    t_secuencial = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    paralelo = obtener_series_bcrp(series, args.concurrencia, url_base=url)
+    t_paralelo = time.perf_counter() - inicio
+    httpd.shutdown()
+
+    assert all(secuencial[s].equals(paralelo[s]) for s in series)
+    print(
+        f"series={args.series} latencia={args.latencia}s | "
+        f"secuencial={t_secuencial:.2f}s "
+        f"paralelo(x{args.concurrencia})={t_paralelo:.2f}s "
+        f"speedup={t_secuencial / t_paralelo:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
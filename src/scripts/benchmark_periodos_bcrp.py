@@ -0,0 +1,91 @@
+"""Benchmark del parseo de períodos del BCRP en limpiar_datos_bcrp.
+
+Compara la conversión fila a fila con ``Series.apply`` (``_fecha_mensual`` /
+``_fecha_diaria``) contra el parser vectorizado ``_parsear_periodos``.
+
+Uso::
+
+    python src/scripts/benchmark_periodos_bcrp.py --filas 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(project_root)
+
+from src.pipeline.config import EQUIVALENCIAS_MESES  # noqa
+from src.pipeline.preprocesamiento import (  # noqa
+    _fecha_diaria,
+    _fecha_mensual,
+    _parsear_periodos,
+)
+
+
+def _generar_periodos(filas: int, diaria: bool) -> pd.Series:
+    """Genera períodos con el formato del BCRP repetidos hasta ``filas``."""
+    meses = [mes.capitalize() for mes in EQUIVALENCIAS_MESES]
+    if diaria:
+        fechas = pd.date_range("1995-01-01", "2025-12-31", freq="D")
+        unicos = [
+            f"{f.day:02d}.{meses[f.month - 1]}.{f.year % 100:02d}" for f in fechas
+        ]
+    else:
+        # Mezcla de «Mmm.aaaa» y «Mmmaa» (formatos que acepta _fecha_mensual)
+        unicos = [
+            f"{mes}.{anio}" if anio % 2 else f"{mes}{anio % 100:02d}"
+            for anio in range(1970, 2026)
+            for mes in meses
+        ]
+    indices = np.random.default_rng(42).integers(0, len(unicos), filas)
+    return pd.Series(np.array(unicos, dtype=object)[indices])
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    """Devuelve el mejor tiempo (segundos) de ``repeticiones`` ejecuciones."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark del parseo de períodos del BCRP."
+    )
+    parser.add_argument("--filas", type=int, default=1_000_000, help="Filas")
+    parser.add_argument(
+        "--repeticiones", type=int, default=3, help="Repeticiones por variante"
+    )
+    args = parser.parse_args()
+
+    for diaria, convertir in [(False, _fecha_mensual), (True, _fecha_diaria)]:
+        periodos = _generar_periodos(args.filas, diaria)
+        tipo = "diaria" if diaria else "mensual"
+
+        esperado = periodos.apply(convertir)
+        obtenido = _parsear_periodos(periodos, diaria)
+        assert (esperado.values == obtenido.values).all(), "Resultados distintos"
+
+        t_apply = _medir(partial(periodos.apply, convertir), 1)
+        t_vector = _medir(
+            partial(_parsear_periodos, periodos, diaria), args.repeticiones
+        )
+        print(
+            f"{tipo:>8} | filas={args.filas:,} únicos={periodos.nunique():,} | "
+            f"apply={t_apply:.3f}s vectorizado={t_vector:.3f}s "
+            f"speedup={t_apply / t_vector:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark del formato compacto de modelos frente a joblib.
+
+Para cada modelo ``prophet_*.joblib`` de ``--directorio`` (o, si no hay,
+para ``--series`` modelos entrenados con series sintéticas) se compara:
+
+* tamaño en disco del archivo joblib y del compacto (JSON + gzip),
+* latencia de carga desde disco (mediana de ``--repeticiones``), y
+* la diferencia máxima de ``yhat`` entre ambos a 30 días hábiles.
+
+Uso::
+
+    python src/scripts/benchmark_serializacion.py --directorio src/models
+"""
+
+import argparse
+import glob
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(project_root)
+
+from src.pipeline.config import RUTA_MODELOS  # noqa
+from src.pipeline.serializacion import (  # noqa
+    cargar_modelo_archivo,
+    guardar_modelo_archivo,
+)
+from src.pipeline.train import entrenar_prophet  # noqa
+
+
+def _modelos_sinteticos(series: int, dias: int, directorio: str):
+    """Entrena modelos con paseos aleatorios y los guarda con joblib."""
+    for semilla in range(series):
+        rng = np.random.default_rng(semilla)
+        df = pd.DataFrame(
+            {
+                "ds": pd.bdate_range("2015-01-01", periods=dias),
+                "y": 100 + np.cumsum(rng.normal(0, 1, dias)),
+            }
+        )
+        modelo, _ = entrenar_prophet(df)
+        joblib.dump(modelo, os.path.join(directorio, f"prophet_S{semilla}.joblib"))
+
+
+def _latencia(ruta: str, repeticiones: int) -> float:
+    """Mediana en milisegundos de cargar el modelo desde disco."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        cargar_modelo_archivo(ruta)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Tamaño y latencia de carga: formato compacto frente a joblib."
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Modelos joblib"
+    )
+    parser.add_argument(
+        "--series", type=int, default=5, help="Modelos sintéticos si no hay"
+    )
+    parser.add_argument("--dias", type=int, default=1250, help="Días hábiles")
+    parser.add_argument("--repeticiones", type=int, default=20, help="Cargas")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rutas = sorted(glob.glob(os.path.join(args.directorio, "prophet_*.joblib")))
+        if not rutas:
+            _modelos_sinteticos(args.series, args.dias, tmp)
+            rutas = sorted(glob.glob(os.path.join(tmp, "prophet_*.joblib")))
+
+        totales = np.zeros(4)
+        for ruta in rutas:
+            modelo = cargar_modelo_archivo(ruta)
+            nombre = os.path.basename(ruta)[: -len(".joblib")]
+            ruta_compacto = os.path.join(tmp, f"{nombre}.json.gz")
+            guardar_modelo_archivo(modelo, ruta_compacto)
+
+            fila = np.array(
+                [
+                    os.path.getsize(ruta) / 1024,
+                    os.path.getsize(ruta_compacto) / 1024,
+                    _latencia(ruta, args.repeticiones),
+                    _latencia(ruta_compacto, args.repeticiones),
+                ]
+            )
+            totales += fila
+            futuro = modelo.make_future_dataframe(30, freq="B", include_history=False)
+            compacto = cargar_modelo_archivo(ruta_compacto)
+            diferencia = np.max(
+                np.abs(
+                    modelo.predict(futuro)["yhat"] - compacto.predict(futuro)["yhat"]
+                )
+            )
+            print(
+                f"{nombre:20s} | joblib={fila[0]:8.1f}KB compacto={fila[1]:7.1f}KB | "
+                f"carga joblib={fila[2]:6.1f}ms compacto={fila[3]:6.1f}ms | "
+                f"Δyhat={diferencia:.1e}"
+            )
+
+    print(
+        f"total ({len(rutas)} modelos) | joblib={totales[0]:.0f}KB "
+        f"compacto={totales[1]:.0f}KB ({totales[0] / totales[1]:.1f}x) | "
+        f"carga joblib={totales[2]:.1f}ms compacto={totales[3]:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
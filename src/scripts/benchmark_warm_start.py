@@ -0,0 +1,98 @@
+"""Benchmark del reentrenamiento de Prophet con y sin warm start.
+
+Para cada serie sintética se ajusta un modelo con toda la historia menos los
+últimos ``--dias_nuevos`` días y luego se reajusta con la serie completa:
+
+* en frío (inicio por defecto de Prophet), y
+* en caliente (``entrenar_prophet(..., modelo_previo=...)``).
+
+Se reporta el tiempo de cada reajuste y la deriva entre ambos resultados:
+máxima diferencia absoluta de parámetros y de ``yhat`` relativa a la escala.
+
+Uso::
+
+    python src/scripts/benchmark_warm_start.py --series 10 --dias 1500
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(project_root)
+
+from src.pipeline.train import entrenar_prophet  # noqa
+
+
+def _serie_sintetica(dias: int, semilla: int) -> pd.DataFrame:
+    """Paseo aleatorio con tendencia y estacionalidad semanal/anual."""
+    rng = np.random.default_rng(semilla)
+    fechas = pd.bdate_range("2015-01-01", periods=dias)
+    t = np.arange(dias)
+    y = (
+        100
+        + 0.05 * t
+        + 5 * np.sin(2 * np.pi * t / 252)
+        + np.cumsum(rng.normal(0, 1, dias))
+    )
+    return pd.DataFrame({"ds": fechas, "y": y})
+
+
+def _deriva(frio, caliente) -> float:
+    """Máxima diferencia absoluta entre los parámetros de dos modelos."""
+    return max(
+        float(np.max(np.abs(frio.params[p] - caliente.params[p])))
+        for p in ["k", "m", "sigma_obs", "delta", "beta"]
+    )
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de warm start en entrenar_prophet."
+    )
+    parser.add_argument("--series", type=int, default=10, help="Series a probar")
+    parser.add_argument("--dias", type=int, default=1500, help="Días hábiles")
+    parser.add_argument(
+        "--dias_nuevos", type=int, default=5, help="Días añadidos en el reajuste"
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    t_frio = []
+    t_caliente = []
+    for semilla in range(args.series):
+        df = _serie_sintetica(args.dias, semilla)
+        previo, _ = entrenar_prophet(df.iloc[: -args.dias_nuevos])
+
+        inicio = time.perf_counter()
+        frio, m_frio = entrenar_prophet(df)
+        t_frio.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        caliente, m_caliente = entrenar_prophet(df, modelo_previo=previo)
+        t_caliente.append(time.perf_counter() - inicio)
+
+        yhat_frio = frio.predict(df[["ds"]])["yhat"].to_numpy()
+        yhat_caliente = caliente.predict(df[["ds"]])["yhat"].to_numpy()
+        print(
+            f"serie {semilla:2d} | frío={t_frio[-1]:.2f}s "
+            f"caliente={t_caliente[-1]:.2f}s | "
+            f"deriva parámetros={_deriva(frio, caliente):.2e} "
+            f"yhat={np.max(np.abs(yhat_frio - yhat_caliente)) / df['y'].std():.2e} "
+            f"Δrmse={m_caliente['rmse'] - m_frio['rmse']:+.2e}"
+        )
+
+    print(
+        f"total | frío={sum(t_frio):.2f}s caliente={sum(t_caliente):.2f}s "
+        f"speedup={sum(t_frio) / sum(t_caliente):.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
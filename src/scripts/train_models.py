@@ -1,49 +1,303 @@
-"""Script para entrenar los modelos."""
+"""Script para entrenar los modelos.
 
+Uso::
+
+    python src/scripts/train_models.py --workers 32 --hilos_por_worker 1
+"""
+
+import argparse
+import json
 import logging
 import os
 import sys
-
-import pandas as pd
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 sys.path.append(project_root)
 
-from src.pipeline.config import MAX_DATE, MIN_DATE, RUTA_DATOS  # noqa
-from src.pipeline.train import cargar_datos, entrenar_prophet  # noqa
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("logs/train.log"), logging.StreamHandler(sys.stdout)],
+from src.pipeline.almacenamiento import listar_simbolos  # noqa
+from src.pipeline.cache import CACHE_FUENTES  # noqa
+from src.pipeline.config import MAX_DATE, MIN_DATE, RUTA_MODELOS  # noqa
+from src.pipeline.instrumentacion import activar_instrumentacion  # noqa
+from src.pipeline.manifiesto import (  # noqa
+    leer_manifiesto,
+    registrar_entrenamiento,
 )
+from src.pipeline.train import HIPERPARAMETROS, entrenar_ticker  # noqa
+
 logger = logging.getLogger(__name__)
 
+ARCHIVO_RESUMEN = "resumen_entrenamiento.json"
+
+# Variables que fijan el número de hilos de BLAS/OpenMP al iniciar la librería
+VARIABLES_HILOS = [
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+]
+
+
+def _configurar_logging() -> None:
+    """Envía los logs a ``logs/train.log`` y a la salida estándar.
+
+    Se llama desde ``main`` para que importar el módulo no cree archivos ni
+    toque la configuración del logging.
+    """
+    os.makedirs("logs", exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("logs/train.log"),
+            logging.StreamHandler(sys.stdout),
+        ],
+    )
+
+
+def _get_all_tickers() -> List[str]:
+    """Devuelve los símbolos del S&P 500 y las series especiales."""
+    return listar_simbolos() + [
+        "S&P500",
+        "INTEGRA",
+        "PRIMA",
+        "HABITAT",
+        "PROFUTURO",
+    ]
+
+
+def _limitar_hilos(hilos: int) -> None:
+    """Limita los hilos de BLAS/OpenMP del proceso actual.
+
+    Con N workers cada uno usando todos los núcleos en BLAS se tendrían N²
+    hilos compitiendo; se fija ``hilos`` por worker. Las variables de entorno
+    cubren las librerías que aún no se cargaron y ``threadpoolctl`` las que ya
+    están en memoria.
+    """
+    for variable in VARIABLES_HILOS:
+        os.environ[variable] = str(hilos)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(hilos)
+
+
+def main_train_models(
+    workers: int = 1,
+    tickers: Optional[List[str]] = None,
+    fecha_inicio: str = MIN_DATE,
+    fecha_fin: str = MAX_DATE,
+    directorio: str = RUTA_MODELOS,
+    hilos_por_worker: int = 1,
+    forzar: bool = False,
+    warm_start: bool = False,
+    materializar: bool = False,
+) -> Dict[str, Any]:
+    """Entrenar los modelos para todos los tickers.
+
+    Con ``workers > 1`` los tickers se reparten en un ``ProcessPoolExecutor``.
+    El fallo de un ticker (o la caída de un worker) se registra en el resumen
+    y no detiene al resto.
+
+    Solo se reentrenan los tickers cuyos datos o hiperparámetros cambiaron
+    respecto del manifiesto de entrenamiento. El manifiesto se actualiza
+    desde el proceso principal tras cada modelo, de modo que una corrida
+    interrumpida se retoma donde quedó.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Procesos en paralelo, por defecto 1 (en el proceso actual).
+    tickers : List[str], optional
+        Tickers a entrenar, por defecto todos.
+    fecha_inicio : str, optional
+        Fecha de inicio de los datos, por defecto MIN_DATE.
+    fecha_fin : str, optional
+        Fecha de corte de los datos, por defecto MAX_DATE.
+    directorio : str, optional
+        Carpeta de los modelos y del resumen, por defecto RUTA_MODELOS.
+    hilos_por_worker : int, optional
+        Hilos de BLAS/OpenMP por worker, por defecto 1. No aplica con un solo
+        worker.
+    forzar : bool, optional
+        Reentrenar todos los tickers ignorando el manifiesto, por defecto
+        False.
+    warm_start : bool, optional
+        Iniciar cada ajuste desde el modelo guardado del ticker, por defecto
+        False.
+    materializar : bool, optional
+        Guardar la tabla de pronósticos de cada modelo entrenado, por
+        defecto False.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Resumen de la corrida, también guardado en ``ARCHIVO_RESUMEN``.
+    """
+    tickers = tickers or _get_all_tickers()
+    total = len(tickers)
+    logger.info(f"Entrenando {total} modelos con {workers} workers")
+    inicio = time.perf_counter()
+    resultados: List[Dict[str, Any]] = []
+    manifiesto = {} if forzar else leer_manifiesto(directorio)
+
+    def _registrar(resultado: Dict[str, Any]) -> None:
+        resultados.append(resultado)
+        if resultado["estado"] == "ok":
+            registrar_entrenamiento(
+                resultado["ticker"],
+                resultado["huella"],
+                HIPERPARAMETROS,
+                resultado["ruta_modelo"],
+                directorio,
+            )
+        mensaje = (
+            f"[{len(resultados)}/{total}] {resultado['ticker']}: "
+            f"{resultado['estado']} ({resultado['segundos']:.1f}s)"
+        )
+        if resultado["estado"] == "error":
+            logger.error(f"{mensaje} {resultado['error']}")
+        else:
+            logger.info(mensaje)
+
+    if workers <= 1:
+        for ticker in tickers:
+            _registrar(
+                entrenar_ticker(
+                    ticker,
+                    fecha_inicio,
+                    fecha_fin,
+                    directorio,
+                    manifiesto.get(ticker),
+                    warm_start,
+                    materializar,
+                )
+            )
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_limitar_hilos,
+            initargs=(hilos_por_worker,),
+        ) as pool:
+            futuros = {
+                pool.submit(
+                    entrenar_ticker,
+                    ticker,
+                    fecha_inicio,
+                    fecha_fin,
+                    directorio,
+                    manifiesto.get(ticker),
+                    warm_start,
+                    materializar,
+                ): ticker
+                for ticker in tickers
+            }
+            for futuro in as_completed(futuros):
+                try:
+                    resultado = futuro.result()
+                except Exception as exc:
+                    # El worker murió (por ejemplo, sin memoria)
+                    resultado = {
+                        "ticker": futuros[futuro],
+                        "estado": "error",
+                        "error": f"{type(exc).__name__}: {exc}",
+                        "segundos": 0.0,
+                    }
+                _registrar(resultado)
+
+    estados = [r["estado"] for r in resultados]
+    resumen = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "workers": workers,
+        "hilos_por_worker": hilos_por_worker,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "total": total,
+        "ok": estados.count("ok"),
+        "sin_cambios": estados.count("sin_cambios"),
+        "sin_datos": estados.count("sin_datos"),
+        "errores": estados.count("error"),
+        "resultados": sorted(resultados, key=lambda r: r["ticker"]),
+    }
+    os.makedirs(directorio, exist_ok=True)
+    with open(os.path.join(directorio, ARCHIVO_RESUMEN), "w") as f:
+        json.dump(resumen, f, indent=2)
 
-def main_train_models():
-    """Entrenar los modelos para todos los tickers."""
+    logger.info(
+        f"Entrenamiento terminado en {resumen['segundos']:.1f}s: "
+        f"{resumen['ok']} ok, {resumen['sin_cambios']} sin cambios, "
+        f"{resumen['sin_datos']} sin datos, "
+        f"{resumen['errores']} errores"
+    )
+    logger.info(f"Caché de fuentes: {CACHE_FUENTES.estadisticas()}")
+    return resumen
 
-    def _get_all_tickers():
-        return list(pd.read_csv(RUTA_DATOS)["Symbol"].unique()) + [
-            "S&P500",
-            "INTEGRA",
-            "PRIMA",
-            "HABITAT",
-            "PROFUTURO",
-        ]
 
-    tickers = _get_all_tickers()
-    for ticker in tickers:
-        logger.info(f"Entrenando modelo para {ticker}")
-        df = cargar_datos(ticker, MIN_DATE, MAX_DATE)
-        df = df.dropna()
-        if df.empty:
-            logger.error(f"No hay datos para {ticker}")
-            continue
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(
+        description="Entrenar los modelos Prophet de todos los tickers."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos en paralelo",
+    )
+    parser.add_argument(
+        "--hilos_por_worker",
+        type=int,
+        default=1,
+        help="Hilos de BLAS/OpenMP por worker",
+    )
+    parser.add_argument(
+        "--tickers", nargs="*", default=None, help="Tickers (por defecto, todos)"
+    )
+    parser.add_argument(
+        "--fecha_inicio", type=str, default=MIN_DATE, help="Fecha de inicio"
+    )
+    parser.add_argument(
+        "--fecha_fin", type=str, default=MAX_DATE, help="Fecha de corte"
+    )
+    parser.add_argument(
+        "--directorio", type=str, default=RUTA_MODELOS, help="Carpeta de modelos"
+    )
+    parser.add_argument(
+        "--forzar",
+        action="store_true",
+        help="Reentrenar todos los tickers aunque sus datos no hayan cambiado",
+    )
+    parser.add_argument(
+        "--warm_start",
+        action="store_true",
+        help="Iniciar cada ajuste desde el modelo guardado del ticker",
+    )
+    parser.add_argument(
+        "--materializar",
+        action="store_true",
+        help="Guardar la tabla de pronósticos de cada modelo entrenado",
+    )
+    args = parser.parse_args()
+    _configurar_logging()
+    activar_instrumentacion()
 
-        modelo, metricas = entrenar_prophet(df)
-        logger.info(f"Datos cargados para {ticker}")
+    resumen = main_train_models(
+        args.workers,
+        args.tickers,
+        args.fecha_inicio,
+        args.fecha_fin,
+        args.directorio,
+        args.hilos_por_worker,
+        args.forzar,
+        args.warm_start,
+        args.materializar,
+    )
+    sys.exit(1 if resumen["errores"] else 0)
 
 
 if __name__ == "__main__":
-    main_train_models()
+    main()
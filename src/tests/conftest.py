@@ -1,6 +1,8 @@
 """Shared pytest fixtures and configuration."""
 
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -27,3 +29,24 @@ def data_dir(project_root):
 def models_dir(project_root):
     """Return the models directory."""
     return project_root / "models"
+
+
+def pytest_configure(config):
+    """Keep per-phase timing records out of the repository for the session.
+
+    Set before any test module imports ``src.pipeline.config``, so it also
+    covers module-scoped fixtures.
+    """
+    os.environ.setdefault("INSTRUMENTACION", "0")
+    os.environ["RUTA_FASES"] = os.path.join(tempfile.mkdtemp(), "fases.jsonl")
+
+
+@pytest.fixture
+def ruta_fases(tmp_path, monkeypatch):
+    """Enable the per-phase timing records and send them to a temporary file."""
+    from src.pipeline import instrumentacion
+
+    ruta = str(tmp_path / "fases.jsonl")
+    monkeypatch.setattr(instrumentacion, "_ACTIVA", True)
+    monkeypatch.setattr(instrumentacion, "RUTA_FASES", ruta)
+    return ruta
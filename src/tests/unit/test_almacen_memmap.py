@@ -0,0 +1,104 @@
+"""Pruebas para el almacén binario de series."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline import train
+from src.pipeline.almacen_memmap import (
+    AlmacenMemmap,
+    abrir_almacen,
+    construir_almacen_memmap,
+    leer_acciones_memmap,
+)
+
+
+@pytest.fixture
+def csv_acciones(tmp_path):
+    """Fixture con un CSV de acciones con un valor faltante."""
+    fechas = pd.bdate_range("2020-01-01", "2021-12-31")
+    partes = []
+    for i, simbolo in enumerate(["TSLA", "AAPL", "MSFT"]):
+        partes.append(
+            pd.DataFrame(
+                {
+                    "Date": fechas.strftime("%Y-%m-%d"),
+                    "Symbol": simbolo,
+                    "Close": np.arange(len(fechas), dtype="float64") + 1000 * i,
+                }
+            )
+        )
+    df = pd.concat(partes)
+    df.loc[df.index[5], "Close"] = np.nan
+    ruta = tmp_path / "sp500_stocks.csv"
+    df.to_csv(ruta, index=False)
+    return str(ruta)
+
+
+@pytest.fixture
+def almacen(csv_acciones, tmp_path):
+    """Fixture con el almacén binario construido."""
+    directorio = str(tmp_path / "memmap")
+    construir_almacen_memmap(csv_acciones, directorio)
+    return directorio
+
+
+def test_construir_almacen_indice(almacen):
+    """El índice tiene un bloque contiguo por símbolo."""
+    datos = AlmacenMemmap(almacen)
+    assert sorted(datos.simbolos()) == ["AAPL", "MSFT", "TSLA"]
+    total = sum(largo for _, largo in datos.indice.values())
+    assert total == len(datos.fechas)
+    assert isinstance(datos.fechas, np.memmap)
+
+
+def test_serie_rango_es_vista(almacen):
+    """El rango se resuelve con búsqueda binaria y sin copias."""
+    datos = abrir_almacen(almacen)
+    fechas, cierres = datos.serie("AAPL", "2020-03-01", "2020-03-31")
+
+    assert len(fechas) == len(pd.bdate_range("2020-03-01", "2020-03-31"))
+    assert np.shares_memory(fechas, datos.fechas)
+    assert np.shares_memory(cierres, datos.cierres)
+    primera = fechas.view("datetime64[D]")[0]
+    assert primera == np.datetime64("2020-03-02")
+
+
+def test_serie_simbolo_inexistente(almacen):
+    """Un símbolo fuera del índice lanza ValueError."""
+    with pytest.raises(ValueError):
+        abrir_almacen(almacen).serie("NOEXISTE")
+
+
+def test_leer_acciones_memmap_descarta_nulos(almacen):
+    """Las filas sin precio no se guardan en el almacén."""
+    df = leer_acciones_memmap("TSLA", directorio=almacen)
+    assert df["Close"].notna().all()
+    assert len(df) == len(pd.bdate_range("2020-01-01", "2021-12-31")) - 1
+
+
+def test_backend_por_defecto_ignora_almacen_viejo(
+    almacen, csv_acciones, tmp_path, monkeypatch
+):
+    """Si el CSV cambió después de construir el almacén, no se usa."""
+    monkeypatch.setattr(train, "RUTA_MEMMAP", almacen)
+    monkeypatch.setattr(train, "RUTA_DATOS", csv_acciones)
+    monkeypatch.setattr(train, "RUTA_DATASET", str(tmp_path / "sin_dataset"))
+    assert train._resolver_backend(None) == "memmap"
+
+    marca = os.path.getmtime(os.path.join(almacen, "indice.json"))
+    os.utime(csv_acciones, (marca + 10, marca + 10))
+    assert train._resolver_backend(None) == "csv"
+
+
+def test_cargar_datos_backend_memmap(almacen, csv_acciones, monkeypatch):
+    """cargar_datos devuelve lo mismo con el CSV y con el almacén binario."""
+    monkeypatch.setattr(train, "RUTA_MEMMAP", almacen)
+    monkeypatch.setattr(train, "RUTA_DATOS", csv_acciones)
+
+    df_memmap = train.cargar_datos("MSFT", "2020-06-01", "2021-06-30", "memmap")
+    df_csv = train.cargar_datos("MSFT", "2020-06-01", "2021-06-30", "csv")
+
+    np.testing.assert_array_equal(df_memmap["y"].values, df_csv["y"].values)
+    np.testing.assert_array_equal(df_memmap["ds"].values, df_csv["ds"].values)
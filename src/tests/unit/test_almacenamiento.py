@@ -0,0 +1,138 @@
+"""Pruebas para el almacenamiento columnar de acciones."""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.pipeline import train
+from src.pipeline.almacenamiento import (
+    crear_dataset_parquet,
+    dividir_csv_por_simbolo,
+    leer_acciones_parquet,
+    leer_catalogo,
+    listar_simbolos,
+    ruta_particion,
+)
+
+
+@pytest.fixture
+def csv_acciones(tmp_path):
+    """Fixture con un CSV de acciones desordenado con dos símbolos."""
+    fechas = pd.bdate_range("2020-01-01", "2021-12-31")
+    np.random.seed(42)
+    partes = []
+    for simbolo in ["AAPL", "TSLA"]:
+        partes.append(
+            pd.DataFrame(
+                {
+                    "Date": fechas.strftime("%Y-%m-%d"),
+                    "Symbol": simbolo,
+                    "Adj Close": 1.0,
+                    "Close": np.random.normal(100, 10, len(fechas)).cumsum(),
+                    "Volume": 10,
+                }
+            )
+        )
+    df = pd.concat(partes).sample(frac=1, random_state=0)
+    ruta = tmp_path / "sp500_stocks.csv"
+    df.to_csv(ruta, index=False)
+    return str(ruta)
+
+
+@pytest.fixture
+def dataset(csv_acciones, tmp_path):
+    """Fixture con el dataset Parquet generado."""
+    directorio = str(tmp_path / "dataset")
+    crear_dataset_parquet(csv_acciones, directorio, filas_por_grupo=50)
+    return directorio
+
+
+def test_crear_dataset_particiones(dataset):
+    """Cada símbolo tiene su partición ordenada por fecha y con estadísticas."""
+    assert sorted(os.listdir(dataset)) == [
+        "Symbol=AAPL",
+        "Symbol=TSLA",
+        "catalogo.json",
+    ]
+
+    archivo = pq.ParquetFile(ruta_particion("AAPL", dataset))
+    assert archivo.metadata.num_row_groups > 1
+    assert archivo.schema_arrow.names == ["Date", "Close"]
+    estadisticas = archivo.metadata.row_group(0).column(0).statistics
+    assert estadisticas.has_min_max
+
+    fechas = archivo.read().column("Date").to_pandas()
+    assert fechas.is_monotonic_increasing
+
+
+def test_leer_acciones_parquet_rango(dataset):
+    """La lectura devuelve solo el rango de fechas solicitado."""
+    df = leer_acciones_parquet("TSLA", "2020-03-01", "2020-03-31", dataset)
+    assert list(df.columns) == ["Date", "Close"]
+    assert df["Date"].min() >= pd.Timestamp("2020-03-01")
+    assert df["Date"].max() <= pd.Timestamp("2020-03-31")
+    assert len(df) == len(pd.bdate_range("2020-03-01", "2020-03-31"))
+
+
+def test_leer_acciones_parquet_simbolo_inexistente(dataset):
+    """Un símbolo sin partición lanza ValueError."""
+    with pytest.raises(ValueError):
+        leer_acciones_parquet("NOEXISTE", directorio=dataset)
+
+
+def test_cargar_datos_backend_parquet(dataset, csv_acciones, monkeypatch):
+    """cargar_datos devuelve lo mismo con el CSV y con el dataset Parquet."""
+    monkeypatch.setattr(train, "RUTA_DATASET", dataset)
+    monkeypatch.setattr(train, "RUTA_DATOS", csv_acciones)
+
+    df_parquet = train.cargar_datos("AAPL", "2020-06-01", "2021-06-30", "parquet")
+    df_csv = train.cargar_datos("AAPL", "2020-06-01", "2021-06-30", "csv")
+    df_csv = df_csv.sort_values("ds")
+
+    assert len(df_parquet) == len(df_csv)
+    np.testing.assert_allclose(df_parquet["y"].values, df_csv["y"].values)
+    assert (df_parquet["ds"].values == df_csv["ds"].values).all()
+
+
+def test_backend_por_defecto_ignora_dataset_viejo(
+    dataset, csv_acciones, tmp_path, monkeypatch
+):
+    """Si el CSV cambió después de crear el dataset, se lee el CSV."""
+    monkeypatch.setattr(train, "RUTA_DATASET", dataset)
+    monkeypatch.setattr(train, "RUTA_DATOS", csv_acciones)
+    monkeypatch.setattr(train, "RUTA_MEMMAP", str(tmp_path / "sin_memmap"))
+    assert train._resolver_backend(None) == "parquet"
+
+    marca = os.path.getmtime(os.path.join(dataset, "catalogo.json"))
+    os.utime(csv_acciones, (marca + 10, marca + 10))
+    assert train._resolver_backend(None) == "csv"
+    assert train._resolver_backend("parquet") == "parquet"
+
+
+def test_dividir_csv_por_simbolo_en_bloques(csv_acciones, tmp_path):
+    """Con bloques pequeños el resultado es igual y el catálogo es correcto."""
+    directorio = str(tmp_path / "dataset_bloques")
+    catalogo = dividir_csv_por_simbolo(csv_acciones, directorio, tamano_bloque=4096)
+
+    assert catalogo == leer_catalogo(directorio)
+    filas = len(pd.bdate_range("2020-01-01", "2021-12-31"))
+    assert catalogo["AAPL"] == {
+        "filas": filas,
+        "fecha_min": "2020-01-01",
+        "fecha_max": "2021-12-31",
+    }
+    carpeta = os.path.dirname(ruta_particion("AAPL", directorio))
+    assert os.listdir(carpeta) == ["part-0.parquet"]
+
+    fechas = pq.read_table(ruta_particion("TSLA", directorio))["Date"].to_pandas()
+    assert len(fechas) == filas
+    assert fechas.is_monotonic_increasing
+
+
+def test_listar_simbolos(csv_acciones, dataset, tmp_path):
+    """Los símbolos se obtienen del catálogo o recorriendo el CSV."""
+    assert listar_simbolos(csv_acciones, dataset) == ["AAPL", "TSLA"]
+    sin_dataset = listar_simbolos(csv_acciones, str(tmp_path / "no_existe"))
+    assert sorted(sin_dataset) == ["AAPL", "TSLA"]
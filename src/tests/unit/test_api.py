@@ -10,6 +10,18 @@ from prophet import Prophet
 
 from pipeline.api import app
 from pipeline.train import guardar_modelo
+from src.pipeline import config, inference
+
+
+@pytest.fixture(autouse=True)
+def directorio_modelos(tmp_path, monkeypatch):
+    """Guarda y busca los modelos y su registro en una carpeta temporal."""
+    monkeypatch.setattr(config, "RUTA_MODELOS", str(tmp_path))
+    monkeypatch.setattr(inference, "RUTA_MODELOS", str(tmp_path))
+    monkeypatch.setattr(
+        inference, "RUTA_PAQUETE_MODELOS", str(tmp_path / "modelos.paquete")
+    )
+    return str(tmp_path)
 
 
 @pytest.fixture
@@ -140,3 +152,12 @@ def test_predict_endpoint_modelo_no_existe(client):
     )
 
     assert response.status_code == 404
+
+
+def test_cache_endpoint(client):
+    """Prueba el endpoint con las estadísticas de la caché."""
+    response = client.get("/cache")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {"aciertos", "fallos", "bytes", "max_bytes"} <= set(data)
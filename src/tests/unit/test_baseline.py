@@ -0,0 +1,128 @@
+"""Pruebas para los modelos de referencia."""
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.pipeline import pronosticos
+from src.pipeline.baseline import (
+    ajustar_baseline,
+    cargar_baseline,
+    cargar_modelo_baseline,
+    guardar_baseline,
+)
+from src.pipeline.inference import realizar_prediccion
+
+
+@pytest.fixture
+def panel():
+    """Panel de días hábiles con una serie lineal y otra con huecos."""
+    fechas = pd.bdate_range("2024-01-01", periods=10)
+    return pd.DataFrame(
+        {
+            "LIN": 10.0 + 2.0 * np.arange(10),
+            "HUE": [np.nan, np.nan, 1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0, np.nan],
+        },
+        index=fechas,
+    )
+
+
+def test_metodos_por_ticker(panel):
+    """Cada método reproduce su definición para cada ticker."""
+    futuras = pd.bdate_range("2024-01-15", periods=3)
+
+    naive = ajustar_baseline(panel, "naive").predecir(futuras)
+    assert naive["LIN"].tolist() == [28.0] * 3
+    # HUE termina el 2024-01-11: el 15 es el segundo día hábil siguiente
+    assert naive["HUE"].tolist() == [7.0] * 3
+
+    drift = ajustar_baseline(panel, "drift").predecir(futuras)
+    assert drift["LIN"].tolist() == pytest.approx([30.0, 32.0, 34.0])
+    assert drift["HUE"].tolist() == pytest.approx([9.0, 10.0, 11.0])
+
+    lineal = ajustar_baseline(panel, "lineal").predecir(futuras)
+    assert lineal["LIN"].tolist() == pytest.approx([30.0, 32.0, 34.0])
+    assert lineal["HUE"].tolist() == pytest.approx([9.0, 10.0, 11.0])
+
+    estacional = ajustar_baseline(panel, "estacional", temporada=5).predecir(
+        pd.bdate_range("2024-01-15", periods=6)
+    )
+    assert estacional["LIN"].tolist() == [20.0, 22.0, 24.0, 26.0, 28.0, 20.0]
+
+
+def test_sin_datos_o_metodo_invalido(panel):
+    """Un ticker vacío o un método desconocido lanzan ValueError."""
+    with pytest.raises(ValueError, match="VACIO"):
+        ajustar_baseline(panel.assign(VACIO=np.nan))
+    with pytest.raises(ValueError, match="inválido"):
+        ajustar_baseline(panel, "arima")
+
+
+def test_guardar_cargar_y_realizar_prediccion(panel, tmp_path):
+    """El baseline guardado sirve en realizar_prediccion como un Prophet."""
+    guardar_baseline(ajustar_baseline(panel, "drift"), str(tmp_path))
+    assert cargar_baseline("drift", str(tmp_path)).simbolos == ["LIN", "HUE"]
+
+    modelo = cargar_modelo_baseline("LIN", "drift", str(tmp_path))
+    predicciones = realizar_prediccion(modelo, "2024-01-15", "2024-01-19")
+
+    # realizar_prediccion pide tantos días hábiles como días calendario hay
+    # en el rango, contados desde la última fecha del modelo (2024-01-12)
+    assert predicciones["ds"].tolist() == list(
+        pd.bdate_range("2024-01-15", "2024-01-18")
+    )
+    assert predicciones["yhat"].tolist() == pytest.approx([30, 32, 34, 36])
+    assert (predicciones["yhat_lower"] <= predicciones["yhat"]).all()
+    assert (predicciones["yhat_upper"] >= predicciones["yhat"]).all()
+    with pytest.raises(ValueError):
+        cargar_modelo_baseline("NO", "drift", str(tmp_path))
+
+
+def test_feriados_se_cuentan_en_dias_habiles():
+    """Un día hábil sin fila no desplaza la temporada ni infla los residuos."""
+    fechas = pd.bdate_range("2024-01-08", "2024-01-19").drop(pd.Timestamp("2024-01-17"))
+    dias = np.busday_count("2024-01-08", fechas.values.astype("datetime64[D]"))
+    panel = pd.DataFrame({"LIN": 10.0 + 2.0 * dias}, index=fechas)
+
+    estacional = ajustar_baseline(panel, "estacional", temporada=5)
+    futuras = pd.bdate_range("2024-01-22", periods=5)
+    # El 17 no tiene fila: su posición toma el último valor vigente (el 16)
+    assert estacional.predecir(futuras)["LIN"].tolist() == [20, 22, 22, 26, 28]
+    assert estacional.sigma == pytest.approx([0.0])
+
+    drift = ajustar_baseline(panel, "drift")
+    assert drift.predecir(futuras[:1])["LIN"].tolist() == pytest.approx([30.0])
+    assert drift.sigma == pytest.approx([0.0])
+
+
+def test_realizar_prediccion_con_tick(panel, tmp_path, monkeypatch):
+    """Con ``tick`` el baseline no usa la tabla de pronósticos de Prophet."""
+    monkeypatch.setattr(pronosticos, "RUTA_PRONOSTICOS", str(tmp_path))
+    tabla = pa.Table.from_pandas(
+        pd.DataFrame({"ds": pd.bdate_range("2024-01-15", periods=5), "yhat": 0.0})
+    )
+    pq.write_table(
+        tabla.replace_schema_metadata({pronosticos.CLAVE_HUELLA: b"prophet"}),
+        pronosticos.ruta_pronostico("LIN"),
+    )
+
+    modelo = ajustar_baseline(panel, "drift").modelo("LIN")
+    predicciones = realizar_prediccion(modelo, "2024-01-15", "2024-01-19", "LIN")
+    assert predicciones["yhat"].tolist() == pytest.approx([30, 32, 34, 36])
+
+
+def test_ajuste_de_500_tickers_en_menos_de_un_segundo():
+    """Todos los métodos ajustan 500 tickers × 10 años en menos de un segundo."""
+    rng = np.random.default_rng(0)
+    fechas = pd.bdate_range("2015-01-01", periods=2520)
+    valores = 100 + rng.normal(0, 1, (len(fechas), 500)).cumsum(axis=0)
+    valores[rng.random(valores.shape) < 0.02] = np.nan
+    panel = pd.DataFrame(valores, index=fechas, columns=[f"T{i}" for i in range(500)])
+
+    for metodo in ["naive", "drift", "estacional", "lineal"]:
+        inicio = time.perf_counter()
+        ajustar_baseline(panel, metodo)
+        assert time.perf_counter() - inicio < 1.0
@@ -0,0 +1,89 @@
+"""Pruebas para la búsqueda de hiperparámetros."""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline import busqueda_hiperparametros as busqueda
+
+
+@pytest.fixture
+def serie():
+    """Serie diaria con tendencia y estacionalidad semanal."""
+    fechas = pd.date_range("2022-01-01", periods=400, freq="D")
+    t = np.arange(len(fechas))
+    y = 100 + 0.1 * t + 3 * np.sin(2 * np.pi * t / 7)
+    y += np.random.default_rng(0).normal(0, 0.5, len(t))
+    return pd.DataFrame({"ds": fechas, "y": y})
+
+
+def test_generar_candidatos():
+    """La grilla es el producto cartesiano y el modo aleatorio no repite."""
+    espacio = {"cambio_punto": [0.01, 0.1], "estacionalidad_anual": [True, False]}
+    assert len(busqueda.generar_candidatos(espacio)) == 4
+
+    aleatorios = busqueda.generar_candidatos(
+        {"cambio_punto": (0.001, 0.5), "estacionalidad_anual": [True, False]},
+        modo="aleatorio",
+        n_candidatos=5,
+    )
+    assert len(aleatorios) == 5
+    assert all(0.001 <= c["cambio_punto"] <= 0.5 for c in aleatorios)
+
+    with pytest.raises(ValueError):
+        busqueda.generar_candidatos({"cambio_punto": (0.001, 0.5)})
+
+
+def test_cortes_rolling_origin(serie):
+    """Los cortes cubren el final de la serie."""
+    cortes = busqueda.cortes_rolling_origin(serie, n_cortes=3, horizonte=20)
+
+    assert cortes == [(340, 360), (360, 380), (380, 400)]
+    with pytest.raises(ValueError, match="muy corta"):
+        busqueda.cortes_rolling_origin(serie.iloc[:300], 3, 20)
+
+
+def test_buscar_hiperparametros_con_poda(serie):
+    """Se podan candidatos tras el primer corte y gana el de menor RMSE."""
+    espacio = {
+        "cambio_punto": [0.05],
+        "estacionalidad_semanal": [True, False],
+        "estacionalidad_anual": [False],
+    }
+
+    resultado = busqueda.buscar_hiperparametros(
+        serie, espacio, n_cortes=2, horizonte=14, fraccion_supervivientes=0.5
+    )
+
+    assert resultado["mejores"]["estacionalidad_semanal"] is True
+    podados = [r for r in resultado["resultados"] if r["podado"]]
+    assert len(podados) == 1
+    assert len(podados[0]["errores"]) == 1
+    assert len(resultado["resultados"][0]["errores"]) == 2
+    assert resultado["rmse"] == pytest.approx(
+        np.mean(resultado["resultados"][0]["errores"])
+    )
+
+
+def test_entrenar_con_busqueda_guarda_hiperparametros(serie, tmp_path, monkeypatch):
+    """Los hiperparámetros ganadores se guardan junto al modelo."""
+    monkeypatch.setattr(busqueda, "cargar_datos", lambda *args: serie)
+
+    busqueda.entrenar_con_busqueda(
+        "AAA",
+        "2022-01-01",
+        "2023-02-04",
+        str(tmp_path),
+        espacio={"cambio_punto": [0.01, 0.1]},
+        n_cortes=1,
+        horizonte=14,
+        workers=2,
+    )
+
+    assert os.path.exists(tmp_path / "prophet_AAA.joblib")
+    with open(tmp_path / "hiperparametros_AAA.json") as f:
+        guardados = json.load(f)
+    assert guardados["cambio_punto"] in [0.01, 0.1]
+    assert "rmse_validacion" in guardados
@@ -0,0 +1,108 @@
+"""Pruebas para la caché de fuentes de datos."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline import train
+from src.pipeline.cache import CACHE_FUENTES, CacheFuentes
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    """Fixture con un archivo de origen."""
+    ruta = tmp_path / "fuente.csv"
+    ruta.write_text("a\n1\n")
+    return str(ruta)
+
+
+def _frame(n):
+    return pd.DataFrame({"y": np.arange(n, dtype="float64")})
+
+
+def test_cache_aciertos_y_fallos(archivo):
+    """La segunda lectura del mismo archivo es un acierto."""
+    cache = CacheFuentes(max_bytes=10**6)
+    llamadas = []
+
+    def cargar():
+        llamadas.append(1)
+        return _frame(10)
+
+    primero = cache.obtener(archivo, cargar)
+    segundo = cache.obtener(archivo, cargar)
+
+    assert primero is segundo
+    assert len(llamadas) == 1
+    estadisticas = cache.estadisticas()
+    assert estadisticas["aciertos"] == 1
+    assert estadisticas["fallos"] == 1
+    assert estadisticas["entradas"] == 1
+
+
+def test_cache_invalida_por_mtime(archivo):
+    """Si el archivo cambia en disco la entrada se vuelve a cargar."""
+    cache = CacheFuentes(max_bytes=10**6)
+    cache.obtener(archivo, lambda: _frame(10))
+
+    estado = os.stat(archivo)
+    os.utime(archivo, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9))
+    valor = cache.obtener(archivo, lambda: _frame(20))
+
+    assert len(valor) == 20
+    assert cache.estadisticas()["invalidaciones"] == 1
+
+
+def test_cache_desalojo_lru(tmp_path):
+    """Al superar el presupuesto se desaloja la entrada menos usada."""
+    rutas = []
+    for nombre in ["a", "b", "c"]:
+        ruta = tmp_path / nombre
+        ruta.write_text(nombre)
+        rutas.append(str(ruta))
+    tamano = int(_frame(1000).memory_usage(deep=True).sum())
+    cache = CacheFuentes(max_bytes=2 * tamano)
+
+    cache.obtener(rutas[0], lambda: _frame(1000))
+    cache.obtener(rutas[1], lambda: _frame(1000))
+    cache.obtener(rutas[0], lambda: _frame(1000))
+    cache.obtener(rutas[2], lambda: _frame(1000))
+
+    estadisticas = cache.estadisticas()
+    assert estadisticas["desalojos"] == 1
+    assert estadisticas["bytes"] <= 2 * tamano
+    # rutas[1] fue la menos usada y debe volver a cargarse
+    cache.obtener(rutas[1], lambda: _frame(1000))
+    assert cache.estadisticas()["fallos"] == 4
+
+
+def test_cache_no_guarda_valores_mayores_al_presupuesto(archivo):
+    """Un valor que no cabe en el presupuesto no se almacena."""
+    cache = CacheFuentes(max_bytes=10)
+    cache.obtener(archivo, lambda: _frame(1000))
+    assert cache.estadisticas()["entradas"] == 0
+
+
+def test_cargar_datos_usa_cache(tmp_path, monkeypatch):
+    """cargar_datos lee el CSV de acciones una sola vez."""
+    fechas = pd.bdate_range("2020-01-01", "2020-12-31")
+    df = pd.concat(
+        [
+            pd.DataFrame({"Date": fechas, "Symbol": s, "Close": 1.0})
+            for s in ["AAPL", "TSLA"]
+        ]
+    )
+    ruta = tmp_path / "sp500_stocks.csv"
+    df.to_csv(ruta, index=False)
+    monkeypatch.setattr(train, "RUTA_DATOS", str(ruta))
+    CACHE_FUENTES.limpiar()
+
+    train.cargar_datos("AAPL", "2020-01-01", "2020-06-30", "csv")
+    df_tsla = train.cargar_datos("TSLA", "2020-01-01", "2020-06-30", "csv")
+
+    assert len(df_tsla) == len(pd.bdate_range("2020-01-01", "2020-06-30"))
+    estadisticas = CACHE_FUENTES.estadisticas()
+    assert estadisticas["fallos"] == 1
+    assert estadisticas["aciertos"] == 1
+    CACHE_FUENTES.limpiar()
@@ -0,0 +1,153 @@
+"""Pruebas para la caché en disco de yfinance."""
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from src.pipeline.cache_yfinance import (
+    _huecos,
+    actualizar_cache_yfinance,
+    leer_cache_yfinance,
+    leer_cobertura,
+)
+
+
+class _DescargadorFalso:
+    """Imita ``yf.download``: un cierre por día hábil igual al ordinal del día."""
+
+    def __init__(self):
+        self.llamadas = []
+
+    def __call__(self, ticks, inicio, fin):
+        self.llamadas.append((list(ticks), inicio, fin))
+        fechas = pd.bdate_range(inicio, pd.Timestamp(fin) - pd.Timedelta(days=1))
+        return pd.DataFrame(
+            {tick: [float(f.toordinal()) for f in fechas] for tick in ticks},
+            index=fechas,
+        )
+
+
+@pytest.fixture
+def descargador():
+    """Fixture con un descargador falso que registra las llamadas."""
+    return _DescargadorFalso()
+
+
+def test_huecos():
+    """Se devuelven solo los rangos no cubiertos."""
+    t = pd.Timestamp
+    cubiertos = [(t("2024-01-05"), t("2024-01-10")), (t("2024-01-15"), t("2024-01-20"))]
+
+    assert _huecos(cubiertos, t("2024-01-01"), t("2024-01-25")) == [
+        (t("2024-01-01"), t("2024-01-05")),
+        (t("2024-01-10"), t("2024-01-15")),
+        (t("2024-01-20"), t("2024-01-25")),
+    ]
+    assert _huecos(cubiertos, t("2024-01-06"), t("2024-01-09")) == []
+
+
+def test_actualizacion_incremental_en_lotes(descargador, tmp_path):
+    """La segunda consulta solo descarga el hueco nuevo, en lotes acotados."""
+    directorio = str(tmp_path)
+    ticks = ["A", "B", "C", "D", "E"]
+
+    llamadas = actualizar_cache_yfinance(
+        ticks, "2024-01-01", "2024-02-01", directorio, 2, descargador
+    )
+    assert llamadas == 3
+    assert [len(lote) for lote, _, _ in descargador.llamadas] == [2, 2, 1]
+
+    descargador.llamadas.clear()
+    actualizar_cache_yfinance(
+        ticks, "2024-01-01", "2024-02-15", directorio, 10, descargador
+    )
+    assert descargador.llamadas == [(ticks, "2024-02-01", "2024-02-15")]
+
+    t = pd.Timestamp
+    assert leer_cobertura(directorio)["A"] == [(t("2024-01-01"), t("2024-02-15"))]
+
+    # Una consulta ya cubierta no descarga nada
+    descargador.llamadas.clear()
+    assert (
+        actualizar_cache_yfinance(
+            ticks, "2024-01-10", "2024-02-10", directorio, descargador=descargador
+        )
+        == 0
+    )
+
+
+def test_leer_cache_coincide_con_descarga_completa(descargador, tmp_path):
+    """Leer de la caché equivale a descargar el rango completo."""
+    directorio = str(tmp_path)
+    actualizar_cache_yfinance(
+        ["A", "B"], "2024-01-01", "2024-01-20", directorio, descargador=descargador
+    )
+    actualizar_cache_yfinance(
+        ["B"], "2024-01-10", "2024-02-01", directorio, descargador=descargador
+    )
+    actualizar_cache_yfinance(
+        ["A", "B"], "2024-01-01", "2024-02-01", directorio, descargador=descargador
+    )
+
+    resultado = leer_cache_yfinance(["B", "A"], "2024-01-01", "2024-02-01", directorio)
+    esperado = descargador(["B", "A"], "2024-01-01", "2024-02-01")
+
+    assert list(resultado.columns) == ["B", "A"]
+    assert resultado.index.is_unique
+    pd.testing.assert_frame_equal(
+        resultado, esperado, check_names=False, check_freq=False
+    )
+
+
+def test_no_cubre_fechas_futuras(descargador, tmp_path):
+    """La cobertura nunca pasa de hoy, para volver a pedir los días nuevos."""
+    directorio = str(tmp_path)
+    manana = (pd.Timestamp.today().normalize() + pd.Timedelta(days=2)).strftime(
+        "%Y-%m-%d"
+    )
+    inicio = (pd.Timestamp.today() - pd.Timedelta(days=10)).strftime("%Y-%m-%d")
+
+    actualizar_cache_yfinance(
+        ["A"], inicio, manana, directorio, descargador=descargador
+    )
+
+    assert leer_cobertura(directorio)["A"][0][1] <= pd.Timestamp.today().normalize()
+
+
+def test_tickers_sin_datos_no_se_cubren(descargador, tmp_path):
+    """Un ticker que yfinance devuelve vacío se vuelve a pedir después."""
+    directorio = str(tmp_path)
+
+    def con_fallo(ticks, inicio, fin):
+        cierres = descargador(ticks, inicio, fin)
+        cierres["B"] = float("nan")
+        return cierres.drop(columns="C")
+
+    actualizar_cache_yfinance(
+        ["A", "B", "C"], "2024-01-01", "2024-01-22", directorio, descargador=con_fallo
+    )
+    assert set(leer_cobertura(directorio)) == {"A"}
+    # La cobertura llega hasta el último cierre recibido (viernes 19)
+    t = pd.Timestamp
+    assert leer_cobertura(directorio)["A"] == [(t("2024-01-01"), t("2024-01-20"))]
+
+    descargador.llamadas.clear()
+    actualizar_cache_yfinance(
+        ["A", "B", "C"], "2024-01-01", "2024-01-22", directorio, descargador=descargador
+    )
+    assert descargador.llamadas == [
+        (["B", "C"], "2024-01-01", "2024-01-22"),
+        (["A"], "2024-01-20", "2024-01-22"),
+    ]
+
+
+def test_importable_sin_prefijo_src():
+    """Con ``src/`` en el path, preprocesamiento importa la caché sin ``src.``."""
+    raiz = os.path.join(os.path.dirname(__file__), "..", "..")
+    subprocess.run(
+        [sys.executable, "-c", "import pipeline.preprocesamiento"],
+        cwd=raiz,
+        check=True,
+    )
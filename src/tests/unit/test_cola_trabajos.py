@@ -0,0 +1,140 @@
+"""Pruebas para la cola SQLite de trabajos de entrenamiento."""
+import pandas as pd
+import pytest
+
+from src.pipeline import train
+from src.pipeline.cola_trabajos import (
+    completar_trabajo,
+    conectar,
+    encolar,
+    estado_cola,
+    renovar_lease,
+    tomar_trabajo,
+    trabajar,
+)
+from src.pipeline.manifiesto import leer_manifiesto
+
+
+@pytest.fixture
+def con(tmp_path):
+    """Conexión a una cola vacía en un directorio temporal."""
+    conexion = conectar(str(tmp_path / "cola.sqlite"))
+    yield conexion
+    conexion.close()
+
+
+def test_encolar_ignora_duplicados(con):
+    """Cada ticker se encola una vez salvo que se pida reencolar."""
+    assert encolar(con, ["AAA", "BBB", "AAA"], "2024-01-01", "2024-06-30") == 2
+    assert encolar(con, ["AAA", "CCC"]) == 1
+
+    tomar_trabajo(con, "w1")
+    assert encolar(con, ["AAA"], reencolar=True) == 1
+    assert estado_cola(con)["pendiente"] == 3
+
+
+def test_lease_exclusivo(tmp_path):
+    """Dos workers con conexiones distintas nunca toman el mismo trabajo."""
+    ruta = str(tmp_path / "cola.sqlite")
+    con1, con2 = conectar(ruta), conectar(ruta)
+    encolar(con1, ["AAA", "BBB"], "2024-01-01", "2024-06-30")
+
+    t1 = tomar_trabajo(con1, "w1")
+    t2 = tomar_trabajo(con2, "w2")
+
+    assert {t1["ticker"], t2["ticker"]} == {"AAA", "BBB"}
+    assert t1["fecha_inicio"] == "2024-01-01" and t1["intentos"] == 1
+    assert tomar_trabajo(con1, "w1") is None
+    assert estado_cola(con1)["en_curso"] == 2
+
+
+def test_lease_vencido_se_reintenta(con):
+    """Un lease vencido vuelve a tomarse y, sin intentos, queda en error."""
+    encolar(con, ["AAA"])
+    tomar_trabajo(con, "w1", duracion_lease=-1, max_intentos=2)
+
+    trabajo = tomar_trabajo(con, "w2", duracion_lease=-1, max_intentos=2)
+    assert trabajo["ticker"] == "AAA" and trabajo["intentos"] == 2
+    # El worker original ya no puede completar el trabajo
+    assert not completar_trabajo(con, "AAA", "w1", {"estado": "ok"})
+
+    assert tomar_trabajo(con, "w3", max_intentos=2) is None
+    assert estado_cola(con)["error"] == 1
+
+
+def test_completar_trabajo_reintenta_errores(con):
+    """Un error vuelve a pendiente mientras queden intentos."""
+    encolar(con, ["AAA"])
+    error = {"estado": "error", "error": "ValueError: x", "segundos": 0.1}
+
+    tomar_trabajo(con, "w1")
+    assert completar_trabajo(con, "AAA", "w1", error, max_intentos=2)
+    assert estado_cola(con)["pendiente"] == 1
+
+    tomar_trabajo(con, "w1")
+    assert completar_trabajo(con, "AAA", "w1", error, max_intentos=2)
+    assert estado_cola(con)["error"] == 1
+
+
+def test_trabajar(tmp_path, monkeypatch):
+    """El worker entrena cada ticker y registra el resultado."""
+    ruta = str(tmp_path / "cola.sqlite")
+    guardados = []
+
+    def cargar_datos(tick, fecha_inicio, fecha_corte):
+        if tick == "VACIO":
+            return pd.DataFrame({"ds": [], "y": []})
+        if tick == "MALO":
+            raise FileNotFoundError("sin archivo")
+        return pd.DataFrame({"ds": pd.date_range("2024-01-01", periods=3), "y": 1.0})
+
+    def guardar_modelo(modelo, tick, metricas, directorio, huella=None, wal=True):
+        assert not wal
+        guardados.append(tick)
+        ruta_modelo = tmp_path / f"prophet_{tick}.joblib"
+        ruta_modelo.touch()
+        return str(ruta_modelo)
+
+    monkeypatch.setattr(train, "cargar_datos", cargar_datos)
+    monkeypatch.setattr(
+        train, "entrenar_prophet", lambda df, **kw: ("modelo", {"mae": 0.5})
+    )
+    monkeypatch.setattr(train, "guardar_modelo", guardar_modelo)
+    con = conectar(ruta, wal=False)
+    encolar(con, ["AAA", "VACIO", "MALO"])
+
+    procesados = trabajar(ruta, str(tmp_path), worker="w1", max_intentos=2, wal=False)
+
+    assert procesados == 4
+    assert guardados == ["AAA"]
+    assert estado_cola(con) == {
+        "pendiente": 0,
+        "en_curso": 0,
+        "ok": 1,
+        "sin_cambios": 0,
+        "sin_datos": 1,
+        "error": 1,
+    }
+    fila = con.execute("SELECT metricas FROM trabajos WHERE ticker = 'AAA'")
+    assert fila.fetchone()[0] == '{"mae": 0.5}'
+    assert set(leer_manifiesto(str(tmp_path))) == {"AAA"}
+
+    # Con el manifiesto al día, reencolar no vuelve a entrenar
+    encolar(con, ["AAA"], reencolar=True)
+    assert trabajar(ruta, str(tmp_path), worker="w1", wal=False) == 1
+    assert guardados == ["AAA"]
+    assert estado_cola(con)["sin_cambios"] == 1
+
+
+def test_renovar_lease(con):
+    """Solo el worker que tiene el trabajo puede extender su lease."""
+    encolar(con, ["AAA"])
+    tomar_trabajo(con, "w1", duracion_lease=1)
+    antes = con.execute("SELECT lease_hasta FROM trabajos").fetchone()[0]
+
+    assert renovar_lease(con, "AAA", "w1", duracion_lease=60)
+    assert con.execute("SELECT lease_hasta FROM trabajos").fetchone()[0] > antes + 30
+    assert not renovar_lease(con, "AAA", "w2")
+
+    completar_trabajo(con, "AAA", "w1", {"estado": "ok", "segundos": 0.1})
+    assert not renovar_lease(con, "AAA", "w1")
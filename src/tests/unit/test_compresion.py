@@ -0,0 +1,53 @@
+"""Pruebas para los códecs de compresión de artefactos."""
+import gzip
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.pipeline.compresion import (
+    CODECS,
+    codec_de,
+    comprimir,
+    descomprimir,
+    opciones_parquet,
+)
+
+DATOS = b'{"params": [0.1, 0.2, 0.3]}' * 200
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_ida_y_vuelta(codec):
+    """Cada códec queda en la cabecera y se descomprime sin indicarlo."""
+    comprimido = comprimir(DATOS, codec)
+    assert codec_de(comprimido) == codec
+    assert descomprimir(comprimido) == DATOS
+    if codec != "none":
+        assert len(comprimido) < len(DATOS)
+
+
+def test_niveles_y_gzip_estandar():
+    """El nivel se respeta y gzip sigue siendo un gzip estándar."""
+    assert len(comprimir(DATOS, "zstd", 19)) <= len(comprimir(DATOS, "zstd", 1))
+    assert gzip.decompress(comprimir(DATOS, "gzip", 9)) == DATOS
+    assert descomprimir(gzip.compress(DATOS)) == DATOS
+
+
+def test_errores():
+    """Códecs desconocidos y datos sin cabecera se rechazan."""
+    with pytest.raises(ValueError):
+        comprimir(DATOS, "bz2")
+    assert codec_de(DATOS) is None
+    with pytest.raises(ValueError):
+        descomprimir(DATOS)
+
+
+def test_opciones_parquet(tmp_path):
+    """El códec de Parquet queda en los metadatos del archivo."""
+    ruta = tmp_path / "p.parquet"
+    df = pd.DataFrame({"yhat": range(100)})
+    df.to_parquet(ruta, **opciones_parquet("ZSTD", 5))
+    assert pq.ParquetFile(ruta).metadata.row_group(0).column(0).compression == "ZSTD"
+    pd.testing.assert_frame_equal(pd.read_parquet(ruta), df)
+    with pytest.raises(ValueError):
+        opciones_parquet("bz2")
@@ -75,3 +75,25 @@ def test_get_rolling_mean(sample_data):
     expected_df = pd.DataFrame(expected_rolling_mean)
 
     pd.testing.assert_frame_equal(result, expected_df)
+
+
+def test_get_lags_and_rolling_mean_by_group():
+    """Lags and rolling means never cross from one group into another."""
+    df = pd.DataFrame(
+        {
+            "symbol": ["B", "A", "B", "A", "A"],
+            "date": pd.to_datetime(
+                ["2023-01-02", "2023-01-03", "2023-01-01", "2023-01-01", "2023-01-02"]
+            ),
+            "value": [20.0, 3.0, 10.0, 1.0, 2.0],
+        }
+    )
+
+    result = get_lags(df, "value", "date", 1, group_col="symbol")
+    result = get_rolling_mean(result, "value", "date", 2, group_col="symbol")
+
+    assert result["symbol"].tolist() == ["A", "A", "A", "B", "B"]
+    assert result["lag_value_1"].tolist()[1:3] == [1.0, 2.0]
+    assert result["lag_value_1"].isna().tolist() == [True, False, False, True, False]
+    assert result["rolling_mean_value"].tolist()[1:3] == [1.5, 2.5]
+    assert result["rolling_mean_value"].tolist()[4] == 15.0
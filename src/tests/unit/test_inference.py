@@ -4,13 +4,16 @@ import shutil
 
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 from prophet import Prophet
 
+from src.pipeline import inference
 from src.pipeline.inference import (
     cargar_modelo,
     guardar_prediccion,
     realizar_prediccion,
+    realizar_prediccion_lote,
     visualizar_prediccion,
 )
 from src.pipeline.train import guardar_modelo
@@ -40,10 +43,12 @@ def modelo_prueba():
     return modelo
 
 
-def test_cargar_modelo(modelo_prueba):
+def test_cargar_modelo(modelo_prueba, monkeypatch):
     """Prueba para cargar un modelo."""
     metricas = {"mse": 0.0, "rmse": 0.0, "mae": 0.0, "r2": 1.0}
     guardar_modelo(modelo_prueba, "TSLA", metricas, TEMP_DIR)
+    monkeypatch.setattr(inference, "RUTA_MODELOS", TEMP_DIR)
+    monkeypatch.setattr(inference, "RUTA_PAQUETE_MODELOS", os.path.join(TEMP_DIR, "x"))
     modelo = cargar_modelo("TSLA")
     assert isinstance(modelo, Prophet)
 
@@ -87,3 +92,72 @@ def test_guardar_prediccion(modelo_prueba):
     assert any(
         f.startswith("prediccion_TSLA_") and f.endswith(".parquet") for f in archivos
     )
+
+
+def test_guardar_prediccion_codec(modelo_prueba, tmp_path):
+    """El códec elegido se usa al escribir el Parquet de la predicción."""
+    predicciones = realizar_prediccion(modelo_prueba, "2021-01-01", "2021-01-31")
+    guardar_prediccion(
+        predicciones, "TSLA", "2021-01-01", "2021-01-31", str(tmp_path), "zstd", 9
+    )
+    ruta = tmp_path / "prediccion_TSLA_2021-01-01_2021-01-31.parquet"
+    metadatos = pq.ParquetFile(ruta).metadata
+    assert metadatos.row_group(0).column(0).compression == "ZSTD"
+    pd.testing.assert_frame_equal(pd.read_parquet(ruta), predicciones)
+
+
+@pytest.fixture(scope="module")
+def modelos_lote():
+    """Modelos pequeños; el último termina en otra fecha."""
+    modelos = {}
+    for i, fin in enumerate(["2020-06-30", "2020-06-30", "2020-07-15"]):
+        fechas = pd.bdate_range(end=fin, periods=120)
+        rng = np.random.default_rng(i)
+        df = pd.DataFrame({"ds": fechas, "y": 100 + rng.normal(0, 1, 120).cumsum()})
+        modelos[f"LOTE{i}"] = Prophet(uncertainty_samples=0).fit(df)
+    return modelos
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_realizar_prediccion_lote(modelos_lote, workers, monkeypatch):
+    """El lote da lo mismo que predecir cada modelo por separado."""
+    monkeypatch.setattr(inference, "MIN_MODELOS_POR_WORKER", 1)
+    largo = realizar_prediccion_lote(
+        modelos_lote, "2020-07-01", "2020-08-15", workers=workers
+    )
+    assert list(largo.columns) == ["tick", "ds", "yhat", "yhat_lower", "yhat_upper"]
+    assert list(largo["tick"].unique()) == list(modelos_lote)
+    for tick, modelo in modelos_lote.items():
+        esperado = realizar_prediccion(modelo, "2020-07-01", "2020-08-15")
+        obtenido = largo[largo["tick"] == tick]
+        np.testing.assert_array_equal(obtenido["ds"], esperado["ds"])
+        np.testing.assert_allclose(obtenido["yhat"], esperado["yhat"])
+
+
+def test_realizar_prediccion_lote_pocos_modelos_en_serie(modelos_lote, monkeypatch):
+    """Con pocos modelos por proceso no se crea el pool."""
+
+    def sin_pool(*args, **kwargs):
+        raise AssertionError("no se esperaba un pool de procesos")
+
+    monkeypatch.setattr(inference, "ProcessPoolExecutor", sin_pool)
+    largo = realizar_prediccion_lote(
+        modelos_lote, "2020-07-01", "2020-08-15", workers=4
+    )
+    assert list(largo["tick"].unique()) == list(modelos_lote)
+
+
+def test_realizar_prediccion_lote_ancho(modelos_lote):
+    """El formato ancho tiene una columna por ticker."""
+    ancho = realizar_prediccion_lote(
+        modelos_lote, "2020-07-01", "2020-08-15", formato="ancho"
+    )
+    assert list(ancho.columns) == list(modelos_lote)
+    assert ancho.index.is_monotonic_increasing
+    # LOTE2 empieza después de su última fecha de entrenamiento
+    assert ancho["LOTE2"].first_valid_index() == pd.Timestamp("2020-07-16")
+    assert ancho["LOTE0"].notna().all()
+
+    with pytest.raises(ValueError):
+        realizar_prediccion_lote(modelos_lote, "2020-07-01", "2020-08-15", "otro")
+    assert realizar_prediccion_lote({}, "2020-07-01", "2020-08-15").empty
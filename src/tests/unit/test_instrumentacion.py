@@ -0,0 +1,91 @@
+"""Pruebas para la instrumentación por fase del entrenamiento."""
+import json
+
+import pandas as pd
+import pytest
+
+from src.pipeline.instrumentacion import (
+    contexto_ticker,
+    leer_registros,
+    medir_fase,
+    reporte_fases,
+)
+
+
+def _registros(ruta):
+    with open(ruta) as f:
+        return [json.loads(linea) for linea in f]
+
+
+def test_medir_fase_registra_tiempos_y_ticker(ruta_fases):
+    """Cada fase escribe una línea con tiempos, RSS y el ticker del contexto."""
+    with contexto_ticker("AAA"):
+        with medir_fase("fit", filas=10):
+            sum(range(10000))
+    with medir_fase("guardar", "BBB"):
+        pass
+
+    fit, guardar = _registros(ruta_fases)
+    assert fit["ticker"] == "AAA" and fit["fase"] == "fit" and fit["filas"] == 10
+    assert fit["ok"] and fit["segundos"] >= 0 and fit["cpu_segundos"] >= 0
+    assert fit["rss_pico_proceso_mb"] > 0 and fit["rss_pico_delta_mb"] >= 0
+    assert guardar["ticker"] == "BBB"
+
+
+def test_medir_fase_registra_errores(ruta_fases):
+    """Una excepción se propaga y la fase queda marcada como fallida."""
+    with pytest.raises(ValueError):
+        with medir_fase("cargar_datos", "AAA"):
+            raise ValueError("sin datos")
+
+    assert _registros(ruta_fases)[0]["ok"] is False
+
+
+def test_reporte_fases(ruta_fases):
+    """El reporte agrega percentiles por fase y ordena los tickers más lentos."""
+    filas = [
+        {"ticker": t, "fase": f, "segundos": s, "cpu_segundos": s, "ok": True}
+        for t, f, s in [
+            ("AAA", "fit", 3.0),
+            ("AAA", "guardar", 1.0),
+            ("AAA", "total", 4.0),
+            ("BBB", "fit", 1.0),
+            ("BBB", "guardar", 2.0),
+            ("BBB", "total", 3.0),
+            ("CCC", "total", 0.5),
+        ]
+    ]
+    pd.DataFrame(filas).assign(
+        rss_pico_proceso_mb=100.0, rss_pico_delta_mb=1.0
+    ).to_json(ruta_fases, orient="records", lines=True)
+
+    reporte = reporte_fases(ruta_fases, top=2)
+
+    fases = reporte["fases"]
+    assert fases.loc["total", "n"] == 3
+    assert fases.loc["fit", "segundos_p50"] == pytest.approx(2.0)
+    assert fases.loc["fit", "segundos_max"] == 3.0
+    assert fases.loc["fit", "rss_pico_proceso_mb_max"] == 100.0
+    lentos = reporte["lentos"]
+    assert list(lentos.index) == ["AAA", "BBB"]
+    assert lentos.loc["AAA", "fase_mas_lenta"] == "fit"
+    assert lentos.loc["BBB", "fase_mas_lenta"] == "guardar"
+
+
+def test_error_de_escritura_no_afecta_la_fase(tmp_path, monkeypatch):
+    """Si no se puede escribir el registro, la fase termina igual."""
+    from src.pipeline import instrumentacion
+
+    monkeypatch.setattr(instrumentacion, "_ACTIVA", True)
+    monkeypatch.setattr(instrumentacion, "RUTA_FASES", str(tmp_path))
+    with medir_fase("fit", "AAA"):
+        pass
+    with pytest.raises(KeyError):
+        with medir_fase("fit", "AAA"):
+            raise KeyError("original")
+
+
+def test_leer_registros_sin_archivo(tmp_path):
+    """Sin registros se informa con FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        leer_registros(str(tmp_path / "no_existe.jsonl"))
@@ -0,0 +1,45 @@
+"""Pruebas para el manifiesto de entrenamiento."""
+import pandas as pd
+
+from src.pipeline.manifiesto import (
+    esta_actualizado,
+    huella_datos,
+    leer_manifiesto,
+    registrar_entrenamiento,
+)
+
+HIPERPARAMETROS = {"cambio_punto": 0.05}
+
+
+def _serie(valores):
+    return pd.DataFrame(
+        {"ds": pd.date_range("2024-01-01", periods=len(valores)), "y": valores}
+    )
+
+
+def test_huella_datos():
+    """La huella depende del contenido y no del índice."""
+    df = _serie([1.0, 2.0, 3.0])
+
+    assert huella_datos(df) == huella_datos(df.set_axis([10, 11, 12]))
+    assert huella_datos(df) != huella_datos(_serie([1.0, 2.0, 3.5]))
+    assert huella_datos(df) != huella_datos(_serie([1.0, 2.0, 3.0, 4.0]))
+
+
+def test_esta_actualizado(tmp_path):
+    """Solo es válido si coinciden huella, hiperparámetros y existe el modelo."""
+    directorio = str(tmp_path)
+    ruta_modelo = str(tmp_path / "prophet_AAA.joblib")
+    open(ruta_modelo, "w").close()
+    huella = huella_datos(_serie([1.0, 2.0]))
+
+    registrar_entrenamiento("AAA", huella, HIPERPARAMETROS, ruta_modelo, directorio)
+    entrada = leer_manifiesto(directorio)["AAA"]
+
+    assert esta_actualizado(entrada, huella, HIPERPARAMETROS)
+    assert not esta_actualizado(None, huella, HIPERPARAMETROS)
+    assert not esta_actualizado(entrada, "otra", HIPERPARAMETROS)
+    assert not esta_actualizado(entrada, huella, {"cambio_punto": 0.1})
+
+    (tmp_path / "prophet_AAA.joblib").unlink()
+    assert not esta_actualizado(entrada, huella, HIPERPARAMETROS)
@@ -0,0 +1,75 @@
+"""Pruebas para el modelo global de LightGBM."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline.modelo_global import (
+    cargar_modelo_global,
+    entrenar_modelo_global,
+    guardar_modelo_global,
+)
+
+
+@pytest.fixture
+def largo():
+    """Tickers de distinta escala con el mismo patrón semanal."""
+    fechas = pd.bdate_range("2022-01-03", periods=300)
+    patron = np.tile([0.0, 1.0, 2.0, 1.0, -1.0], 60)
+    ruido = np.random.default_rng(0).normal(0, 0.05, (3, len(fechas)))
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {"tick": tick, "ds": fechas, "y": escala * (10 + patron + ruido[i])}
+            )
+            for i, (tick, escala) in enumerate([("AAA", 1), ("BBB", 10), ("CCC", 100)])
+        ],
+        ignore_index=True,
+    )
+
+
+def test_prediccion_recursiva_en_lote(largo):
+    """El modelo aprende el patrón compartido y predice todos los tickers."""
+    modelo = entrenar_modelo_global(largo, n_lags=10, ventana=5, num_rondas=200)
+    assert modelo.simbolos == ["AAA", "BBB", "CCC"]
+
+    predicciones = modelo.predecir(10)
+    assert len(predicciones) == 30
+    assert predicciones["ds"].min() == pd.Timestamp("2023-02-27")
+    assert predicciones.groupby("tick")["ds"].apply(list).map(len).eq(10).all()
+
+    # El patrón semanal continúa: mejor que repetir el último valor
+    real = np.tile([10.0, 11.0, 12.0, 11.0, 9.0], 2)
+    for tick, escala in [("AAA", 1), ("BBB", 10), ("CCC", 100)]:
+        yhat = predicciones.loc[predicciones["tick"] == tick, "yhat"].to_numpy()
+        ultimo = largo.loc[largo["tick"] == tick, "y"].iloc[-1]
+        assert (
+            np.abs(yhat - escala * real).mean() < np.abs(ultimo - escala * real).mean()
+        )
+
+    panel = modelo.predecir(10, formato="ancho")
+    assert list(panel.columns) == ["AAA", "BBB", "CCC"]
+    assert panel.shape == (10, 3)
+
+
+def test_guardar_y_cargar(largo, tmp_path):
+    """El modelo cargado predice lo mismo que el original."""
+    modelo = entrenar_modelo_global(largo, num_rondas=20)
+    guardar_modelo_global(modelo, str(tmp_path))
+
+    cargado = cargar_modelo_global(str(tmp_path))
+
+    pd.testing.assert_frame_equal(cargado.predecir(5), modelo.predecir(5))
+    with pytest.raises(FileNotFoundError):
+        cargar_modelo_global(str(tmp_path / "vacio"))
+
+
+def test_tickers_sin_datos_suficientes(largo):
+    """Los tickers con menos filas que rezagos se descartan."""
+    corto = pd.DataFrame(
+        {"tick": "ZZZ", "ds": pd.bdate_range("2022-01-03", periods=5), "y": 1.0}
+    )
+    modelo = entrenar_modelo_global(pd.concat([largo, corto]), num_rondas=5)
+    assert "ZZZ" not in modelo.simbolos
+
+    with pytest.raises(ValueError):
+        entrenar_modelo_global(largo, n_lags=3, ventana=5)
@@ -0,0 +1,99 @@
+"""Pruebas para el paquete único de modelos."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline import inference
+from src.pipeline.paquete_modelos import (
+    PaqueteModelos,
+    abrir_paquete,
+    empaquetar_modelos,
+    escribir_paquete,
+)
+from src.pipeline.serializacion import serializar_modelo
+from src.pipeline.train import entrenar_prophet, guardar_modelo
+
+
+@pytest.fixture(scope="module")
+def modelo():
+    """Modelo Prophet entrenado con un paseo aleatorio."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "ds": pd.bdate_range("2022-01-03", periods=200),
+            "y": 100 + np.cumsum(rng.normal(0, 1, 200)),
+        }
+    )
+    return entrenar_prophet(df)[0]
+
+
+def test_escribir_y_leer(tmp_path):
+    """El índice ordenado permite encontrar cada modelo por ticker."""
+    modelos = {t: f"datos de {t}".encode() for t in ["MSFT", "AAPL", "S&P500", "A"]}
+    ruta = escribir_paquete(modelos, str(tmp_path / "modelos.paquete"))
+
+    with PaqueteModelos(ruta) as paquete:
+        assert len(paquete) == 4
+        assert list(paquete.tickers()) == ["A", "AAPL", "MSFT", "S&P500"]
+        for tick, datos in modelos.items():
+            assert tick in paquete
+            assert paquete.bytes_modelo(tick) == datos
+        assert "AMZN" not in paquete
+        with pytest.raises(KeyError):
+            paquete.bytes_modelo("AMZN")
+
+
+def test_archivo_invalido(tmp_path):
+    """Un archivo que no es un paquete se rechaza al abrirlo."""
+    ruta = tmp_path / "otro.bin"
+    ruta.write_bytes(b"no es un paquete de modelos")
+    with pytest.raises(ValueError):
+        PaqueteModelos(str(ruta))
+    with pytest.raises(ValueError):
+        escribir_paquete({"X" * 33: b""}, str(tmp_path / "largo.paquete"))
+
+
+def test_empaquetar_modelos(modelo, tmp_path):
+    """Se empaquetan los modelos joblib y compactos del directorio."""
+    directorio = str(tmp_path / "modelos")
+    guardar_modelo(modelo, "AAA", {"mae": 1.0}, directorio, formato="joblib")
+    guardar_modelo(modelo, "BBB", {"mae": 1.0}, directorio, formato="compacto")
+
+    ruta = empaquetar_modelos(directorio, str(tmp_path / "modelos.paquete"))
+
+    with PaqueteModelos(ruta) as paquete:
+        assert list(paquete.tickers()) == ["AAA", "BBB"]
+        assert paquete.bytes_modelo("AAA") == serializar_modelo(modelo)
+        futuro = modelo.make_future_dataframe(10, freq="B", include_history=False)
+        np.testing.assert_array_equal(
+            paquete.cargar("BBB").predict(futuro)["yhat"],
+            modelo.predict(futuro)["yhat"],
+        )
+
+
+def test_cargar_modelo_desde_paquete(modelo, tmp_path, monkeypatch):
+    """Sin archivo individual, cargar_modelo lee el modelo del paquete."""
+    ruta = escribir_paquete(
+        {"ZZZ": serializar_modelo(modelo)}, str(tmp_path / "modelos.paquete")
+    )
+    monkeypatch.setattr(inference, "RUTA_MODELOS", str(tmp_path))
+    monkeypatch.setattr(inference, "RUTA_PAQUETE_MODELOS", ruta)
+
+    assert abrir_paquete(ruta) is abrir_paquete(ruta)
+    assert abrir_paquete(str(tmp_path / "no_existe")) is None
+
+    # Al reemplazar el archivo se reabre y la proyección vieja se cierra
+    viejo = abrir_paquete(ruta)
+    os.utime(ruta, (viejo.mtime + 10, viejo.mtime + 10))
+    assert abrir_paquete(ruta) is not viejo
+    assert viejo._mm.closed
+    assert len(inference.cargar_modelo("ZZZ").history) == 5
+    with pytest.raises(FileNotFoundError):
+        inference.cargar_modelo("OTRO")
+
+    # Un modelo reentrenado después de empaquetar tiene prioridad
+    guardar_modelo(modelo, "ZZZ", {"mae": 1.0}, str(tmp_path), formato="joblib")
+    os.utime(ruta, (0, 0))
+    assert len(inference.cargar_modelo("ZZZ").history) == len(modelo.history)
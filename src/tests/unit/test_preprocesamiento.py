@@ -4,12 +4,17 @@ from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
+import requests
 
 from pipeline.config import RUTA_AFP, RUTA_ORO, RUTA_TC, SERIE_AFP, SERIE_ORO, SERIE_TC
 from pipeline.preprocesamiento import (
+    _fecha_diaria,
+    _fecha_mensual,
+    _parsear_periodos,
     limpiar_datos_bcrp,
     obtener_datos_bcrp,
     obtener_datos_yfinance,
+    obtener_series_bcrp,
 )
 
 
@@ -348,3 +353,106 @@ def test_obtener_datos_yfinance_success():
 
     assert df.shape[0] >= 0
     # assert df.shape[1] == 2
+
+
+def test_parsear_periodos_equivale_a_fecha_mensual():
+    """El parser vectorizado coincide con _fecha_mensual."""
+    periodos = pd.Series(["Mar.2023", "Abr23", "Dic99", "ene.2024", "Mar.2023"])
+
+    resultado = _parsear_periodos(periodos, diaria=False)
+
+    assert resultado.dtype == "datetime64[ns]"
+    assert resultado.tolist() == [_fecha_mensual(p) for p in periodos]
+
+
+def test_parsear_periodos_mensual_anio_corto():
+    """Los períodos «Mmm.aa» se interpretan con el año de dos dígitos."""
+    resultado = _parsear_periodos(pd.Series(["Abr.23", "Ene.98"]), diaria=False)
+    assert resultado.tolist() == [datetime(2023, 4, 1), datetime(1998, 1, 1)]
+
+
+def test_parsear_periodos_equivale_a_fecha_diaria():
+    """El parser vectorizado coincide con _fecha_diaria."""
+    periodos = pd.Series(["05.Mar.25", "31.Dic.24", "05.Mar.25"], index=[7, 8, 9])
+
+    resultado = _parsear_periodos(periodos, diaria=True)
+
+    assert resultado.index.tolist() == [7, 8, 9]
+    assert resultado.tolist() == [_fecha_diaria(p) for p in periodos]
+
+
+def test_parsear_periodos_fecha_inexistente():
+    """Un día fuera de rango lanza ValueError."""
+    with pytest.raises(ValueError, match="31.Feb.24"):
+        _parsear_periodos(pd.Series(["31.Feb.24"]), diaria=True)
+
+
+def _respuesta(status_code, datos=None):
+    """Crea una respuesta HTTP simulada."""
+    respuesta = MagicMock(status_code=status_code)
+    respuesta.json.return_value = datos
+    if status_code >= 400:
+        respuesta.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    return respuesta
+
+
+def test_obtener_datos_bcrp_reintenta_errores_transitorios(mock_response_data_afp):
+    """Los 503 y errores de conexión se reintentan con el timeout indicado."""
+    sesion = MagicMock()
+    sesion.get.side_effect = [
+        _respuesta(503),
+        requests.ConnectionError("caída"),
+        _respuesta(200, mock_response_data_afp),
+    ]
+
+    with patch("pipeline.preprocesamiento.time.sleep") as dormir:
+        df = obtener_datos_bcrp(SERIE_AFP, sesion=sesion, timeout=5, reintentos=3)
+
+    assert len(df) == 3
+    assert sesion.get.call_count == 3
+    assert dormir.call_count == 2
+    assert all(c.kwargs["timeout"] == 5 for c in sesion.get.call_args_list)
+
+
+def test_obtener_datos_bcrp_agota_reintentos():
+    """Tras agotar los reintentos se propaga el último error."""
+    sesion = MagicMock()
+    sesion.get.return_value = _respuesta(503)
+
+    with patch("pipeline.preprocesamiento.time.sleep"):
+        with pytest.raises(requests.HTTPError, match="503"):
+            obtener_datos_bcrp(SERIE_AFP, sesion=sesion, reintentos=2)
+    assert sesion.get.call_count == 3
+
+
+def test_obtener_datos_bcrp_no_reintenta_404():
+    """Los errores del cliente no se reintentan."""
+    sesion = MagicMock()
+    sesion.get.return_value = _respuesta(404)
+
+    with pytest.raises(requests.HTTPError, match="404"):
+        obtener_datos_bcrp(SERIE_AFP, sesion=sesion)
+    assert sesion.get.call_count == 1
+
+
+def test_obtener_series_bcrp(mock_response_data_afp, mock_response_data_oro):
+    """Las series se descargan en paralelo y se devuelven en orden."""
+    respuestas = {
+        SERIE_AFP: mock_response_data_afp,
+        SERIE_ORO: mock_response_data_oro,
+    }
+
+    def _get(self, url, timeout):
+        serie = next(s for s in respuestas if url.endswith(s))
+        return _respuesta(200, respuestas[serie])
+
+    with patch("requests.Session.get", _get):
+        resultado = obtener_series_bcrp([SERIE_ORO, SERIE_AFP], max_concurrencia=2)
+
+    assert list(resultado) == [SERIE_ORO, SERIE_AFP]
+    assert resultado[SERIE_AFP]["periodo"].tolist() == [
+        "Mar.2023",
+        "Abr.2023",
+        "May.2023",
+    ]
+    assert len(resultado[SERIE_ORO]) == 3
@@ -0,0 +1,102 @@
+"""Pruebas para las tablas de pronósticos materializadas."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline import pronosticos
+from src.pipeline.inference import realizar_prediccion
+from src.pipeline.pronosticos import (
+    consultar_pronostico,
+    huella_modelo,
+    materializar_pronostico,
+)
+from src.pipeline.train import entrenar_prophet
+
+
+def _serie(dias, semilla=0):
+    """Paseo aleatorio en días hábiles."""
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame(
+        {
+            "ds": pd.bdate_range("2022-01-03", periods=dias),
+            "y": 100 + np.cumsum(rng.normal(0, 1, dias)),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def modelo():
+    """Modelo ajustado con 300 días hábiles."""
+    return entrenar_prophet(_serie(300))[0]
+
+
+@pytest.fixture
+def directorio(tmp_path, monkeypatch):
+    """RUTA_PRONOSTICOS temporal."""
+    monkeypatch.setattr(pronosticos, "RUTA_PRONOSTICOS", str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "fecha_inicio, fecha_fin",
+    [
+        ("2023-02-20", "2023-03-20"),
+        ("2023-02-27", "2023-03-03"),
+        ("2023-03-04", "2023-03-19"),
+    ],
+)
+def test_consulta_igual_a_prediccion_en_vivo(modelo, tmp_path, fecha_inicio, fecha_fin):
+    """La tabla devuelve las mismas fechas y valores que la predicción en vivo."""
+    materializar_pronostico(modelo, "AAA", horizonte=60, directorio=str(tmp_path))
+
+    tabla = consultar_pronostico("AAA", modelo, fecha_inicio, fecha_fin, str(tmp_path))
+    vivo = realizar_prediccion(modelo, fecha_inicio, fecha_fin)
+
+    assert list(tabla.columns) == ["ds", "yhat", "yhat_lower", "yhat_upper"]
+    pd.testing.assert_series_equal(
+        tabla["ds"], vivo["ds"].reset_index(drop=True), check_freq=False
+    )
+    np.testing.assert_allclose(tabla["yhat"], vivo["yhat"])
+
+
+def test_fuera_de_rango_o_desactualizada(modelo, tmp_path):
+    """Sin tabla, fuera del horizonte o con otro modelo no se usa la tabla."""
+    directorio = str(tmp_path)
+    assert (
+        consultar_pronostico("AAA", modelo, "2023-03-01", "2023-03-10", directorio)
+        is None
+    )
+
+    materializar_pronostico(modelo, "AAA", horizonte=20, directorio=directorio)
+    assert (
+        consultar_pronostico("AAA", modelo, "2023-03-01", "2023-03-10", directorio)
+        is not None
+    )
+    assert (
+        consultar_pronostico("AAA", modelo, "2023-03-01", "2023-06-30", directorio)
+        is None
+    )
+
+    otro = entrenar_prophet(_serie(300, semilla=1))[0]
+    assert huella_modelo(otro) != huella_modelo(modelo)
+    assert (
+        consultar_pronostico("AAA", otro, "2023-03-01", "2023-03-10", directorio)
+        is None
+    )
+
+
+def test_realizar_prediccion_usa_la_tabla(modelo, directorio):
+    """Con el ticker, realizar_prediccion responde desde la tabla si la cubre."""
+    materializar_pronostico(modelo, "AAA", horizonte=20)
+
+    desde_tabla = realizar_prediccion(modelo, "2023-03-01", "2023-03-10", tick="AAA")
+    en_vivo = realizar_prediccion(modelo, "2023-03-01", "2023-06-30", tick="AAA")
+
+    assert os.path.exists(os.path.join(directorio, "pronostico_AAA.parquet"))
+    assert desde_tabla.attrs["huella_modelo"] == huella_modelo(modelo)
+    assert "huella_modelo" not in en_vivo.attrs
+    assert list(desde_tabla.columns) == ["ds", "yhat", "yhat_lower", "yhat_upper"]
+    assert list(en_vivo.columns) == list(desde_tabla.columns)
+    assert "trend" in realizar_prediccion(modelo, "2023-03-01", "2023-06-30")
@@ -0,0 +1,98 @@
+"""Pruebas para el registro SQLite de modelos."""
+import json
+import os
+import sqlite3
+
+import pytest
+
+from src.pipeline.registro_modelos import (
+    buscar_modelo,
+    indexar_directorio,
+    listar_modelos,
+    registrar_modelo,
+    ruta_vigente,
+)
+
+
+def _artefacto(directorio, nombre, contenido=b"modelo"):
+    """Crea un archivo de modelo falso."""
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, "wb") as f:
+        f.write(contenido)
+    return ruta
+
+
+def test_versiones_por_ticker(tmp_path):
+    """Cada registro es una nueva versión y la última es la vigente."""
+    directorio = str(tmp_path)
+    ruta = _artefacto(directorio, "prophet_AAA.joblib")
+
+    assert buscar_modelo("AAA", directorio) is None
+    assert listar_modelos(directorio).empty
+    # Las consultas no crean el registro
+    assert not os.path.exists(os.path.join(directorio, "registro_modelos.sqlite"))
+    assert (
+        registrar_modelo("AAA", ruta, {"rmse": 2.0}, "h1", directorio=directorio) == 1
+    )
+    assert (
+        registrar_modelo("AAA", ruta, {"rmse": 1.0}, "h2", directorio=directorio) == 2
+    )
+    assert registrar_modelo("BBB", ruta, directorio=directorio) == 1
+
+    ultimo = buscar_modelo("AAA", directorio)
+    assert ultimo["version"] == 2 and ultimo["huella"] == "h2"
+    assert ultimo["metricas"] == {"rmse": 1.0}
+    assert ultimo["archivo"] == "prophet_AAA.joblib" and ultimo["ruta"] == ruta
+    assert ultimo["formato"] == "joblib" and ultimo["bytes"] == 6
+
+    assert list(
+        listar_modelos(directorio)[["ticker", "version"]].itertuples(
+            index=False, name=None
+        )
+    ) == [("AAA", 2), ("BBB", 1)]
+    historia = listar_modelos(directorio, todas_las_versiones=True)
+    assert list(historia["huella"]) == ["h1", "h2", None]
+    # Solo la última versión de cada ticker tiene artefacto
+    assert list(historia["ruta"].notna()) == [False, True, True]
+
+
+def test_registro_sin_wal(tmp_path):
+    """Con ``wal=False`` el registro usa el journal clásico."""
+    directorio = str(tmp_path)
+    ruta = _artefacto(directorio, "prophet_AAA.joblib")
+
+    registrar_modelo("AAA", ruta, directorio=directorio, wal=False)
+    con = sqlite3.connect(os.path.join(directorio, "registro_modelos.sqlite"))
+    try:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        con.close()
+    assert buscar_modelo("AAA", directorio)["version"] == 1
+
+
+def test_ruta_vigente(tmp_path):
+    """Sin registro se busca el archivo en el directorio."""
+    directorio = str(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        ruta_vigente("AAA", directorio)
+
+    ruta = _artefacto(directorio, "prophet_AAA.json.gz")
+    assert ruta_vigente("AAA", directorio) == ruta
+
+    registrar_modelo("AAA", ruta, directorio=directorio)
+    assert ruta_vigente("AAA", directorio) == ruta
+
+
+def test_indexar_directorio(tmp_path):
+    """Los modelos existentes se registran una sola vez con sus métricas."""
+    directorio = str(tmp_path)
+    _artefacto(directorio, "prophet_AAA.joblib")
+    _artefacto(directorio, "prophet_S&P500.json.gz")
+    _artefacto(directorio, "prophet_notas.txt")
+    with open(os.path.join(directorio, "metricas_AAA.json"), "w") as f:
+        json.dump({"mae": 0.5}, f)
+
+    assert indexar_directorio(directorio) == 2
+    assert indexar_directorio(directorio) == 0
+    assert buscar_modelo("AAA", directorio)["metricas"] == {"mae": 0.5}
+    assert buscar_modelo("S&P500", directorio)["formato"] == "compacto"
@@ -0,0 +1,95 @@
+"""Pruebas para el formato compacto de modelos Prophet."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipeline.serializacion import (
+    cargar_modelo_archivo,
+    cargar_modelo_ticker,
+    deserializar_modelo,
+    guardar_modelo_archivo,
+    modelo_desde_dict,
+    ruta_modelo,
+    serializar_modelo,
+)
+from src.pipeline.train import entrenar_prophet
+
+
+@pytest.fixture(scope="module")
+def modelo():
+    """Modelo Prophet entrenado con un paseo aleatorio."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "ds": pd.bdate_range("2022-01-03", periods=400),
+            "y": 100 + np.cumsum(rng.normal(0, 1, 400)),
+        }
+    )
+    return entrenar_prophet(df)[0]
+
+
+def test_prediccion_identica(modelo):
+    """El modelo compacto predice exactamente lo mismo que el original."""
+    compacto = deserializar_modelo(serializar_modelo(modelo))
+    futuro = modelo.make_future_dataframe(30, freq="B", include_history=False)
+
+    pd.testing.assert_frame_equal(
+        compacto.make_future_dataframe(30, freq="B", include_history=False), futuro
+    )
+    np.random.seed(0)
+    esperado = modelo.predict(futuro)
+    np.random.seed(0)
+    obtenido = compacto.predict(futuro)
+    pd.testing.assert_frame_equal(obtenido, esperado)
+
+
+def test_sin_historia(modelo):
+    """El artefacto no incluye la historia ni la tendencia ajustada."""
+    compacto = deserializar_modelo(serializar_modelo(modelo))
+
+    assert len(compacto.history) == 5
+    assert "trend" not in compacto.params
+    assert compacto.stan_fit is None
+    assert len(serializar_modelo(modelo)) < 20_000
+
+
+def test_formato_desconocido():
+    """Los datos de otro formato se rechazan."""
+    with pytest.raises(ValueError):
+        modelo_desde_dict({"formato": "otro", "version": 1})
+
+
+def test_ruta_y_carga_por_formato(modelo, tmp_path):
+    """Se carga el archivo más reciente de cualquiera de los formatos."""
+    directorio = str(tmp_path)
+    assert cargar_modelo_ticker("AAA", directorio) is None
+    with pytest.raises(FileNotFoundError):
+        ruta_modelo("AAA", directorio, existente=True)
+    with pytest.raises(ValueError):
+        ruta_modelo("AAA", directorio, "pickle")
+
+    ruta_joblib = ruta_modelo("AAA", directorio, "joblib")
+    ruta_compacto = ruta_modelo("AAA", directorio)
+    guardar_modelo_archivo(modelo, ruta_joblib)
+    guardar_modelo_archivo(modelo, ruta_compacto)
+    os.utime(ruta_joblib, (0, 0))
+
+    assert ruta_compacto.endswith("prophet_AAA.json.gz")
+    assert ruta_modelo("AAA", directorio, existente=True) == ruta_compacto
+    assert cargar_modelo_archivo(ruta_joblib).history is not None
+    assert len(cargar_modelo_ticker("AAA", directorio).history) == 5
+
+
+@pytest.mark.parametrize("codec", ["zstd", "lz4", "none"])
+def test_codec_de_modelo(modelo, tmp_path, codec):
+    """El códec queda en el archivo y la carga no necesita conocerlo."""
+    futuro = modelo.make_future_dataframe(10, freq="B", include_history=False)
+    for formato in ("joblib", "compacto"):
+        ruta = ruta_modelo("AAA", str(tmp_path), formato)
+        guardar_modelo_archivo(modelo, ruta, codec, 3 if codec == "zstd" else None)
+        cargado = cargar_modelo_archivo(ruta)
+        np.testing.assert_array_equal(
+            cargado.predict(futuro)["yhat"], modelo.predict(futuro)["yhat"]
+        )
@@ -0,0 +1,113 @@
+"""Pruebas para la sincronización incremental del BCRP."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.pipeline.config import SERIE_AFP
+from src.pipeline.sincronizacion import (
+    leer_marcas,
+    leer_serie_bcrp,
+    sincronizar_serie_bcrp,
+)
+
+MESES = ["Ene", "Feb", "Mar", "Abr", "May", "Jun"]
+
+
+class _ServidorBCRP(BaseHTTPRequestHandler):
+    """Imita la API del BCRP para una serie mensual de enero a junio 2024."""
+
+    rutas: list = []
+    disponibles = 3
+
+    def do_GET(self):  # noqa: N802
+        self.rutas.append(self.path)
+        partes = self.path.strip("/").split("/")
+        periodos = [
+            {"name": f"{mes}.2024", "values": [str(i + 1)]}
+            for i, mes in enumerate(MESES[: self.disponibles])
+        ]
+        if len(partes) == 4:
+            # /<serie>/json/<inicio>/<fin>: solo meses dentro del rango
+            inicio = int(partes[2].split("-")[1])
+            fin = int(partes[3].split("-")[1])
+            periodos = periodos[inicio - 1 : fin]
+        cuerpo = json.dumps({"periods": periodos} if periodos else {}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    """Fixture con un servidor HTTP local que imita la API del BCRP."""
+    _ServidorBCRP.rutas = []
+    _ServidorBCRP.disponibles = 3
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ServidorBCRP)
+    hilo = threading.Thread(target=httpd.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/", _ServidorBCRP
+    httpd.shutdown()
+
+
+def test_sincronizacion_incremental(servidor, tmp_path):
+    """La segunda sincronización solo pide y anexa los períodos nuevos."""
+    url, estado = servidor
+    directorio = str(tmp_path / "bcrp")
+
+    iniciales = sincronizar_serie_bcrp(
+        SERIE_AFP, directorio=directorio, fecha_fin="2024-06-30", url_base=url
+    )
+    assert len(iniciales) == 3
+    assert estado.rutas[-1] == "/PN01178MM/json"
+    assert leer_marcas(directorio) == {"PN01178MM": "2024-03-01"}
+
+    estado.disponibles = 5
+    nuevas = sincronizar_serie_bcrp(
+        SERIE_AFP, directorio=directorio, fecha_fin="2024-06-30", url_base=url
+    )
+    assert estado.rutas[-1] == "/PN01178MM/json/2024-4/2024-6"
+    assert nuevas["periodo_limpio"].tolist() == [
+        pd.Timestamp("2024-04-01"),
+        pd.Timestamp("2024-05-01"),
+    ]
+    assert nuevas["valor_limpio"].tolist() == [0.04, 0.05]
+
+    serie = leer_serie_bcrp(SERIE_AFP, directorio)
+    assert len(serie) == 5
+    assert serie["periodo_limpio"].is_monotonic_increasing
+    assert leer_marcas(directorio) == {"PN01178MM": "2024-05-01"}
+
+
+def test_sincronizacion_sin_datos_nuevos(servidor, tmp_path):
+    """Sin períodos nuevos no se escribe nada ni se mueve la marca."""
+    url, estado = servidor
+    directorio = str(tmp_path / "bcrp")
+    sincronizar_serie_bcrp(
+        SERIE_AFP, directorio=directorio, fecha_fin="2024-06-30", url_base=url
+    )
+
+    nuevas = sincronizar_serie_bcrp(
+        SERIE_AFP, directorio=directorio, fecha_fin="2024-06-30", url_base=url
+    )
+    assert nuevas.empty
+    assert len(leer_serie_bcrp(SERIE_AFP, directorio)) == 3
+
+    # Con la marca en la fecha fin ni siquiera se consulta la API
+    llamadas = len(estado.rutas)
+    sincronizar_serie_bcrp(
+        SERIE_AFP, directorio=directorio, fecha_fin="2024-03-15", url_base=url
+    )
+    assert len(estado.rutas) == llamadas
+
+
+def test_leer_serie_no_sincronizada(tmp_path):
+    """Leer una serie nunca sincronizada lanza FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        leer_serie_bcrp(SERIE_AFP, str(tmp_path))
@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from src.pipeline import train
 from src.pipeline.train import cargar_datos, entrenar_prophet, guardar_modelo
 
 TEMP_DIR = "temp_test_models"
@@ -58,6 +59,36 @@ def test_entrenar_prophet(datos_prueba):
     assert "r2" in metricas
 
 
+def test_predecir_puntual_equivale_a_predict(datos_prueba):
+    """La predicción puntual coincide con el yhat de predict."""
+    df = datos_prueba.rename(columns={"fecha": "ds", "precio_cierre": "y"})
+    modelo, metricas = entrenar_prophet(df)
+
+    esperado = modelo.predict(modelo.make_future_dataframe(periods=0))["yhat"]
+    np.testing.assert_allclose(train.predecir_puntual(modelo), esperado)
+
+    futuro = modelo.make_future_dataframe(periods=10)
+    np.testing.assert_allclose(
+        train.predecir_puntual(modelo, futuro), modelo.predict(futuro)["yhat"]
+    )
+    assert metricas["mae"] == pytest.approx(np.mean(np.abs(df["y"] - esperado)))
+
+
+def test_entrenar_prophet_warm_start(datos_prueba):
+    """El reajuste en caliente parte del modelo previo y da un ajuste similar."""
+    df = datos_prueba.rename(columns={"fecha": "ds", "precio_cierre": "y"})
+    previo, _ = entrenar_prophet(df.iloc[:-5])
+
+    iniciales = train.parametros_iniciales(previo)
+    assert isinstance(iniciales["k"], float)
+    assert iniciales["delta"].shape == (previo.n_changepoints,)
+    assert iniciales["beta"].ndim == 1
+
+    frio, metricas_frio = entrenar_prophet(df)
+    caliente, metricas_caliente = entrenar_prophet(df, modelo_previo=previo)
+    assert metricas_caliente["rmse"] == pytest.approx(metricas_frio["rmse"], rel=0.05)
+
+
 def test_guardar_modelo(datos_prueba):
     """Prueba para guardar un modelo Prophet."""
     df = datos_prueba.rename(columns={"fecha": "ds", "precio_cierre": "y"})
@@ -65,3 +96,98 @@ def test_guardar_modelo(datos_prueba):
     guardar_modelo(modelo, "TSLA", metricas, TEMP_DIR)
     assert os.path.exists(os.path.join(TEMP_DIR, "prophet_TSLA.joblib"))
     assert os.path.exists(os.path.join(TEMP_DIR, "metricas_TSLA.json"))
+
+    ruta = guardar_modelo(modelo, "TSLA", metricas, TEMP_DIR, formato="compacto")
+    assert ruta == os.path.join(TEMP_DIR, "prophet_TSLA.json.gz")
+    assert os.path.getsize(ruta) < os.path.getsize(
+        os.path.join(TEMP_DIR, "prophet_TSLA.joblib")
+    )
+
+
+def test_cargar_datos_rango_ordenado(tmp_path, monkeypatch):
+    """El rango se extrae ordenado por fecha e incluye ambos extremos."""
+    fechas = pd.bdate_range("2020-01-01", "2020-12-31")
+    df = pd.concat(
+        [
+            pd.DataFrame({"Date": fechas, "Symbol": s, "Close": np.arange(len(fechas))})
+            for s in ["TSLA", "AAPL", "MSFT"]
+        ]
+    ).sample(frac=1, random_state=0)
+    ruta = tmp_path / "sp500_stocks.csv"
+    df.to_csv(ruta, index=False)
+    monkeypatch.setattr(train, "RUTA_DATOS", str(ruta))
+
+    resultado = cargar_datos("AAPL", "2020-03-02", "2020-03-31", backend="csv")
+
+    assert list(resultado.columns) == ["ds", "y"]
+    assert resultado["ds"].is_monotonic_increasing
+    assert resultado["ds"].iloc[0] == pd.Timestamp("2020-03-02")
+    assert resultado["ds"].iloc[-1] == pd.Timestamp("2020-03-31")
+    assert len(resultado) == len(pd.bdate_range("2020-03-02", "2020-03-31"))
+    assert cargar_datos("NOEXISTE", "2020-01-01", "2020-12-31", "csv").empty
+
+
+@pytest.fixture
+def fuentes_multi(tmp_path, monkeypatch):
+    """Fixture con un CSV de acciones y un índice S&P500 temporales."""
+    fechas = pd.bdate_range("2020-01-01", "2020-12-31")
+    acciones = pd.concat(
+        [
+            pd.DataFrame({"Date": fechas, "Symbol": s, "Close": np.arange(len(fechas))})
+            for s in ["TSLA", "AAPL", "MSFT"]
+        ]
+    )
+    ruta_acciones = tmp_path / "sp500_stocks.csv"
+    acciones.to_csv(ruta_acciones, index=False)
+    ruta_sp500 = tmp_path / "sp500_index.csv"
+    pd.DataFrame({"Date": fechas[::2], "S&P500": 3000.0}).to_csv(
+        ruta_sp500, index=False
+    )
+    monkeypatch.setattr(train, "RUTA_DATOS", str(ruta_acciones))
+    monkeypatch.setattr(train, "RUTA_SP500", str(ruta_sp500))
+    return str(ruta_acciones)
+
+
+def test_cargar_datos_multi_largo(fuentes_multi):
+    """El formato largo coincide con cargar_datos para cada símbolo."""
+    ticks = ["MSFT", "S&P500", "AAPL"]
+    largo = train.cargar_datos_multi(ticks, "2020-02-01", "2020-05-31", backend="csv")
+
+    assert list(largo.columns) == ["tick", "ds", "y"]
+    assert list(largo["tick"].unique()) == ticks
+    for tick in ticks:
+        esperado = cargar_datos(tick, "2020-02-01", "2020-05-31", backend="csv")
+        obtenido = largo[largo["tick"] == tick]
+        np.testing.assert_array_equal(obtenido["y"].values, esperado["y"].values)
+
+
+def test_cargar_datos_multi_ancho(fuentes_multi):
+    """El formato ancho es un panel fechas × ticks float64 alineado."""
+    panel = train.cargar_datos_multi(
+        ["AAPL", "S&P500"], "2020-01-01", "2020-01-31", "ancho", backend="csv"
+    )
+
+    assert list(panel.columns) == ["AAPL", "S&P500"]
+    assert (panel.dtypes == "float64").all()
+    assert len(panel) == len(pd.bdate_range("2020-01-01", "2020-01-31"))
+    assert panel["S&P500"].isna().sum() == len(panel) // 2
+
+
+def test_cargar_datos_multi_parquet(fuentes_multi, tmp_path, monkeypatch):
+    """Con el dataset Parquet se obtiene lo mismo que con el CSV."""
+    from src.pipeline.almacenamiento import crear_dataset_parquet
+
+    directorio = str(tmp_path / "dataset")
+    crear_dataset_parquet(fuentes_multi, directorio)
+    monkeypatch.setattr(train, "RUTA_DATASET", directorio)
+
+    ticks = ["TSLA", "MSFT"]
+    parquet = train.cargar_datos_multi(ticks, "2020-03-01", "2020-06-30", "ancho")
+    csv = train.cargar_datos_multi(ticks, "2020-03-01", "2020-06-30", "ancho", "csv")
+    pd.testing.assert_frame_equal(parquet, csv)
+
+
+def test_cargar_datos_multi_simbolo_inexistente(fuentes_multi):
+    """Un símbolo que no existe lanza ValueError."""
+    with pytest.raises(ValueError, match="NOEXISTE"):
+        train.cargar_datos_multi(["AAPL", "NOEXISTE"], "2020-01-01", "2020-12-31")
@@ -0,0 +1,104 @@
+"""Pruebas para el entrenamiento masivo de modelos."""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from scripts import train_models
+from src.pipeline import train
+
+
+@pytest.fixture
+def entrenamiento_simulado(monkeypatch):
+    """Sustituye la carga y el ajuste por versiones rápidas."""
+
+    def _cargar(ticker, fecha_inicio, fecha_fin):
+        if ticker == "ROTO":
+            raise ValueError("datos corruptos")
+        if ticker == "VACIO":
+            return pd.DataFrame({"ds": [], "y": []})
+        return pd.DataFrame(
+            {"ds": pd.date_range("2024-01-01", periods=3), "y": [1.0, 2.0, 3.0]}
+        )
+
+    guardados = []
+
+    def _guardar(modelo, tick, metricas, directorio, huella=None, wal=True):
+        guardados.append(tick)
+        ruta = os.path.join(directorio, f"prophet_{tick}.joblib")
+        open(ruta, "w").close()
+        return ruta
+
+    monkeypatch.setattr(train, "cargar_datos", _cargar)
+    monkeypatch.setattr(
+        train, "entrenar_prophet", lambda df, **kw: ("modelo", {"mae": 0.5})
+    )
+    monkeypatch.setattr(train, "guardar_modelo", _guardar)
+    return guardados
+
+
+def test_fallo_aislado_por_ticker(entrenamiento_simulado, tmp_path):
+    """Un ticker que falla no detiene el resto y queda en el resumen."""
+    resumen = train_models.main_train_models(
+        tickers=["AAA", "ROTO", "VACIO", "BBB"], directorio=str(tmp_path)
+    )
+
+    assert entrenamiento_simulado == ["AAA", "BBB"]
+    assert (resumen["ok"], resumen["sin_datos"], resumen["errores"]) == (2, 1, 1)
+    estados = {r["ticker"]: r for r in resumen["resultados"]}
+    assert estados["ROTO"]["error"] == "ValueError: datos corruptos"
+    assert estados["AAA"]["metricas"] == {"mae": 0.5}
+
+    with open(tmp_path / train_models.ARCHIVO_RESUMEN) as f:
+        assert json.load(f)["total"] == 4
+
+
+def test_reentrena_solo_tickers_con_cambios(
+    entrenamiento_simulado, tmp_path, monkeypatch
+):
+    """Una segunda corrida omite los tickers cuyos datos no cambiaron."""
+    directorio = str(tmp_path)
+    train_models.main_train_models(tickers=["AAA", "BBB"], directorio=directorio)
+    entrenamiento_simulado.clear()
+
+    resumen = train_models.main_train_models(
+        tickers=["AAA", "BBB"], directorio=directorio
+    )
+    assert resumen["sin_cambios"] == 2
+    assert entrenamiento_simulado == []
+
+    # Cambian los datos de BBB: solo ese ticker se reentrena
+    cargar = train.cargar_datos
+
+    def _cargar(ticker, fecha_inicio, fecha_fin):
+        df = cargar(ticker, fecha_inicio, fecha_fin)
+        if ticker == "BBB":
+            df.loc[2, "y"] = 4.0
+        return df
+
+    monkeypatch.setattr(train, "cargar_datos", _cargar)
+    resumen = train_models.main_train_models(
+        tickers=["AAA", "BBB"], directorio=directorio
+    )
+    assert entrenamiento_simulado == ["BBB"]
+
+    # Con forzar se reentrena todo
+    train_models.main_train_models(
+        tickers=["AAA", "BBB"], directorio=directorio, forzar=True
+    )
+    assert entrenamiento_simulado == ["BBB", "AAA", "BBB"]
+
+
+def test_entrenamiento_en_paralelo_captura_errores(tmp_path):
+    """Con varios workers los errores de cada ticker se devuelven al padre."""
+    resumen = train_models.main_train_models(
+        workers=2, tickers=["NO_EXISTE_1", "NO_EXISTE_2"], directorio=str(tmp_path)
+    )
+
+    assert resumen["total"] == 2
+    assert resumen["errores"] == 2
+    assert [r["ticker"] for r in resumen["resultados"]] == [
+        "NO_EXISTE_1",
+        "NO_EXISTE_2",
+    ]